@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from hashlib import sha1
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from teardown_box.findings import Finding
+from teardown_box.severity import SEVERITIES
+
+# Each line of a findings NDJSON file starts {"fp":"<16 hex>","severity":"<key>",... so the diff can
+# read the join key and severity with one anchored match, without decoding JSON for millions of lines.
+FP_LEN = 16
+_HEAD = re.compile(r'\{"fp":"([0-9a-f]{%d})","severity":"([^"]*)"' % FP_LEN)
+_NUMBERS = re.compile(r"\d+(?:[.,]\d+)*")
+_UNKNOWN_RANK = 99
+_RANKS = {key: sev.sort for key, sev in SEVERITIES.items()}
+
+
+def fingerprint(category: str, title: str, subject: Optional[str] = None) -> str:
+    # A check-supplied subject ("<check>:<kind>", "<check>:<port>/tcp") is the finding's identity on its
+    # own: titles carry ranked names and counts (top route, first resource, "on 2 endpoints") that move
+    # between runs of an unchanged issue. Without one, the title is used with its numbers normalized away.
+    # Evidence paths are never part of it: dated log names, a file that becomes its directory once a second
+    # log appears, and sampled fleet hosts all move between runs.
+    key = "\x1f".join([category, "", subject]) if subject else "\x1f".join([category, _NUMBERS.sub("#", title.lower())])
+    return sha1(key.encode("utf-8")).hexdigest()[:FP_LEN]
+
+
+def to_line(f: Finding) -> str:
+    paths = [ev.path for ev in f.evidence]
+    doc = {
+        "fp": fingerprint(f.category, f.title, f.subject),
+        "severity": f.severity,
+        "category": f.category,
+        "title": f.title,
+        "subject": f.subject,
+        "evidence": paths,
+    }
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+def _open(path: Path, mode: str, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return path.open(mode, encoding="utf-8")
+
+
+def write_ndjson(findings: Iterable[Finding], path: Path) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    n = 0
+    with _open(tmp, "w", path.name.endswith(".gz")) as out:
+        for f in findings:
+            out.write(to_line(f) + "\n")
+            n += 1
+    os.replace(tmp, path)
+    return n
+
+
+def _key(line: str) -> Tuple[str, int]:
+    # (fingerprint, severity rank); files not written by write_ndjson fall back to a full decode.
+    m = _HEAD.match(line)
+    if m is not None:
+        return m.group(1), _RANKS.get(m.group(2), _UNKNOWN_RANK)
+    doc = json.loads(line)
+    fp = doc.get("fp") or fingerprint(doc.get("category", ""), doc.get("title", ""), doc.get("subject"))
+    return fp, _RANKS.get(doc.get("severity", ""), _UNKNOWN_RANK)
+
+
+def read_lines(path: Path) -> Iterator[str]:
+    with _open(path, "r", path.name.endswith(".gz")) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line:
+                yield line
+
+
+@dataclass
+class Delta:
+    # Entries are (severity rank, NDJSON line); lines are decoded only for the rows a report shows.
+    new: List[Tuple[int, str]] = field(default_factory=list)
+    worsened: List[Tuple[int, int, str]] = field(default_factory=list)  # (rank, baseline rank, line)
+    resolved: List[Tuple[int, str]] = field(default_factory=list)
+    unchanged: int = 0
+    baseline_total: int = 0
+    current_total: int = 0
+
+
+def diff(current: Iterable[str], baseline: Iterable[str]) -> Delta:
+    # Hash join: index the current run by fingerprint, then stream the baseline through it once.
+    # Repeated fingerprints on either side collapse to their most severe occurrence.
+    delta = Delta()
+    index: Dict[str, Tuple[int, str]] = {}
+    for line in current:
+        delta.current_total += 1
+        fp, rank = _key(line)
+        prev = index.get(fp)
+        if prev is None or rank < prev[0]:
+            index[fp] = (rank, line)
+
+    matched: Dict[str, int] = {}
+    resolved: Dict[str, Tuple[int, str]] = {}
+    for line in baseline:
+        delta.baseline_total += 1
+        fp, rank = _key(line)
+        if fp in index:
+            if rank < matched.get(fp, _UNKNOWN_RANK + 1):
+                matched[fp] = rank
+        else:
+            prev = resolved.get(fp)
+            if prev is None or rank < prev[0]:
+                resolved[fp] = (rank, line)
+
+    for fp, (rank, line) in index.items():
+        base = matched.get(fp)
+        if base is None:
+            delta.new.append((rank, line))
+        elif rank < base:
+            delta.worsened.append((rank, base, line))
+        else:
+            delta.unchanged += 1
+    delta.resolved = list(resolved.values())
+    return delta
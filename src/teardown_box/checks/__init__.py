@@ -1,27 +1,186 @@
 from __future__ import annotations
 
-from teardown_box.checks.linux_disk import LinuxDiskCheck
-from teardown_box.checks.linux_ports import LinuxPortsCheck
-from teardown_box.checks.linux_systemd import LinuxSystemdFlapCheck
-from teardown_box.checks.nginx_proxy_timeouts import NginxProxyTimeoutsCheck
-from teardown_box.checks.pg_autovacuum import PostgresAutovacuumCheck
-from teardown_box.checks.pg_pool_saturation import PostgresPoolSaturationCheck
-from teardown_box.checks.pg_seq_scans import PostgresSeqScansCheck
-from teardown_box.checks.pg_slow_queries import PostgresSlowQueriesCheck
-from teardown_box.checks.tls_policy import TlsPolicyCheck
-from teardown_box.checks.cost_signals import CostSignalsCheck
+import fnmatch
+import importlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from teardown_box.fixtures import Fixtures
+
+# Third-party checks register under this group, pointing at a CheckSpec (or a list of them) in a
+# lightweight module, or directly at a check class:
+#   [project.entry-points."teardown_box.checks"]
+#   acme = "acme_checks.manifest:SPECS"
+ENTRY_POINT_GROUP = "teardown_box.checks"
+
+
+@dataclass(frozen=True)
+class CheckSpec:
+    # Enough to select a check and decide whether it can apply, without importing its module.
+    name: str
+    category: str  # primary category of its findings
+    inputs: Tuple[str, ...]  # fixture paths/globs the check reads; empty means "always load"
+    target: str  # "package.module:ClassName"
+
+    def has_inputs(self, fx: Fixtures) -> bool:
+        if not self.inputs:
+            return True
+        for pattern in self.inputs:
+            if any(c in pattern for c in "*?["):
+                if fx.glob(pattern):
+                    return True
+            elif fx.exists(pattern):
+                return True
+        return False
+
+    def load(self) -> Any:
+        module, _, attr = self.target.partition(":")
+        chk = getattr(importlib.import_module(module), attr)()
+        if getattr(chk, "inputs", None) is None:
+            chk.inputs = self.inputs
+        return chk
+
+
+BUILTIN_CHECKS: Tuple[CheckSpec, ...] = (
+    CheckSpec(
+        "linux.disk", "Reliability", ("linux/df_h.txt",),
+        "teardown_box.checks.linux_disk:LinuxDiskCheck",
+    ),
+    CheckSpec(
+        "linux.systemd.flap", "Reliability", ("linux/systemctl_status.txt", "linux/journal.json"),
+        "teardown_box.checks.linux_systemd:LinuxSystemdFlapCheck",
+    ),
+    CheckSpec(
+        "linux.ports", "Security", ("linux/ss_lntp.txt", "linux/ss/*.txt"),
+        "teardown_box.checks.linux_ports:LinuxPortsCheck",
+    ),
+    CheckSpec(
+        "postgres.slow_queries", "Performance",
+        ("postgres/pg_stat_statements.csv", "postgres/explain/*.json", "postgres/log/*.csv"),
+        "teardown_box.checks.pg_slow_queries:PostgresSlowQueriesCheck",
+    ),
+    CheckSpec(
+        "postgres.seq_scans", "Performance", ("postgres/pg_stat_user_tables.csv", "postgres/pg_stat_statements.csv"),
+        "teardown_box.checks.pg_seq_scans:PostgresSeqScansCheck",
+    ),
+    CheckSpec(
+        "postgres.autovacuum", "Reliability",
+        ("postgres/pg_stat_user_tables.csv", "postgres/pg_stat_statements.csv", "postgres/log/*.csv"),
+        "teardown_box.checks.pg_autovacuum:PostgresAutovacuumCheck",
+    ),
+    CheckSpec(
+        "postgres.pool_saturation", "Reliability", ("postgres/pg_pool_stats.json", "postgres/pgbouncer/*/show_*.txt"),
+        "teardown_box.checks.pg_pool_saturation:PostgresPoolSaturationCheck",
+    ),
+    CheckSpec(
+        "postgres.server_log", "Reliability", ("postgres/log/*.csv",),
+        "teardown_box.checks.pg_server_log:PostgresServerLogCheck",
+    ),
+    CheckSpec(
+        "edge.nginx.proxy_timeouts", "Reliability", ("edge/*.conf",),
+        "teardown_box.checks.nginx_proxy_timeouts:NginxProxyTimeoutsCheck",
+    ),
+    CheckSpec(
+        "edge.nginx.upstream_latency", "Performance", ("edge/access*.log", "edge/*.conf"),
+        "teardown_box.checks.nginx_upstream_latency:NginxUpstreamLatencyCheck",
+    ),
+    CheckSpec(
+        "edge.tls_policy", "Security", ("edge/tls_scan.txt", "edge/tls/*.txt"),
+        "teardown_box.checks.tls_policy:TlsPolicyCheck",
+    ),
+    CheckSpec(
+        "infra.terraform_plan", "Security", ("infra/terraform_plan.json",),
+        "teardown_box.checks.infra_terraform_plan:TerraformPlanRiskCheck",
+    ),
+    CheckSpec(
+        "cost.signals", "Cost", ("cost/utilization_summary.json", "cost/ebs_volumes.csv"),
+        "teardown_box.checks.cost_signals:CostSignalsCheck",
+    ),
+)
+
+
+class _Unloadable:
+    # Stands in for a check whose module failed to import, so the runner reports it like any failing check.
+
+    def __init__(self, spec: CheckSpec, error: Exception) -> None:
+        self.name = spec.name
+        self.inputs = spec.inputs
+        self.target = spec.target
+        self.error = error
+
+    def applies(self, fx: Fixtures) -> bool:
+        return True
+
+    def run(self, fx: Fixtures) -> list:
+        raise RuntimeError(f"could not load {self.target}: {self.error}")
+
+
+def _as_specs(obj: Any, ep_name: str) -> List[CheckSpec]:
+    items = obj if isinstance(obj, (list, tuple)) else [obj]
+    out: List[CheckSpec] = []
+    for item in items:
+        if isinstance(item, CheckSpec):
+            out.append(item)
+        elif isinstance(item, type):
+            # A bare class works too, but it has already been imported by the time we see it.
+            out.append(
+                CheckSpec(
+                    name=str(getattr(item, "name", ep_name)),
+                    category=str(getattr(item, "category", "")),
+                    inputs=tuple(getattr(item, "inputs", ()) or ()),
+                    target=f"{item.__module__}:{item.__qualname__}",
+                )
+            )
+    return out
+
+
+def _entry_point_specs() -> List[CheckSpec]:
+    from importlib.metadata import entry_points
+
+    specs: List[CheckSpec] = []
+    for ep in sorted(entry_points(group=ENTRY_POINT_GROUP), key=lambda e: e.name):
+        try:
+            specs.extend(_as_specs(ep.load(), ep.name))
+        except Exception as e:
+            specs.append(CheckSpec(name=ep.name, category="", inputs=(), target=f"{ep.value} (error: {e})"))
+    return specs
+
+
+@lru_cache(maxsize=1)
+def discover() -> Tuple[CheckSpec, ...]:
+    # Built-ins first, in report order; plugins after, sorted by entry point name. A plugin may
+    # replace a built-in by registering the same check name.
+    by_name = {spec.name: spec for spec in BUILTIN_CHECKS}
+    for spec in _entry_point_specs():
+        by_name[spec.name] = spec
+    return tuple(by_name.values())
+
+
+def select(specs: Iterable[CheckSpec], only: Optional[Sequence[str]] = None, skip: Optional[Sequence[str]] = None) -> List[CheckSpec]:
+    # --only/--skip take check names or fnmatch patterns ("postgres.*").
+    def matches(spec: CheckSpec, patterns: Sequence[str]) -> bool:
+        return any(fnmatch.fnmatchcase(spec.name, p) for p in patterns)
+
+    return [s for s in specs if (not only or matches(s, only)) and not (skip and matches(s, skip))]
+
+
+def load_checks(
+    fx: Optional[Fixtures] = None,
+    only: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+) -> list:
+    # With a fixture bundle, modules whose inputs are absent are never imported.
+    out = []
+    for spec in select(discover(), only, skip):
+        if fx is not None and not spec.has_inputs(fx):
+            continue
+        try:
+            out.append(spec.load())
+        except Exception as e:
+            out.append(_Unloadable(spec, e))
+    return out
 
 
 def all_checks() -> list:
-    return [
-        LinuxDiskCheck(),
-        LinuxSystemdFlapCheck(),
-        LinuxPortsCheck(),
-        PostgresSlowQueriesCheck(),
-        PostgresSeqScansCheck(),
-        PostgresAutovacuumCheck(),
-        PostgresPoolSaturationCheck(),
-        NginxProxyTimeoutsCheck(),
-        TlsPolicyCheck(),
-        CostSignalsCheck(),
-    ]
+    return load_checks()
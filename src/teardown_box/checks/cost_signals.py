@@ -28,6 +28,7 @@ class CostSignalsCheck:
                         category="Cost",
                         severity="medium",
                         title=f"Possible overprovisioning signal: {itype} at low p95 utilization",
+                        subject=f"{self.name}:rightsizing:{iid}",
                         impact=(
                             "If sustained utilization is low, you may be paying for capacity you don't need. "
                             "Rightsizing can reduce spend without reducing reliability (when validated carefully)."
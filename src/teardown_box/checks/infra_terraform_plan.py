@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from teardown_box.findings import EvidenceRef, Finding, FixNow
+from teardown_box.fixtures import Fixtures
+from teardown_box.parsers import tf_plan
+from teardown_box.parsers.tf_plan import Risk
+
+
+class TerraformPlanRiskCheck:
+    name = "infra.terraform_plan"
+
+    plan_path = "infra/terraform_plan.json"
+    sensitive_ports = {22, 3306, 3389, 5432, 6379, 9200, 11211, 27017}
+
+    def applies(self, fx: Fixtures) -> bool:
+        return fx.exists(self.plan_path)
+
+    def run(self, fx: Fixtures) -> List[Finding]:
+        with fx.open_binary(self.plan_path) as f:
+            index = tf_plan.index_plan(f)
+
+        findings: List[Finding] = []
+        by_kind: Dict[str, List[Risk]] = {}
+        for r in index.risks:
+            by_kind.setdefault(r.kind, []).append(r)
+
+        ingress = by_kind.get("open_ingress", [])
+        if ingress:
+            ports = sorted({r.port for r in ingress if r.port is not None})
+            sensitive = [p for p in ports if p in self.sensitive_ports]
+            findings.append(
+                Finding(
+                    category="Security",
+                    severity="critical" if sensitive else "high",
+                    title=(
+                        f"Terraform plan opens ingress from the internet on port(s) {', '.join(str(p) for p in ports) or 'all'} "
+                        f"({ingress[0].address})"
+                    ),
+                    subject=f"{self.name}:open-ingress",
+                    impact=(
+                        "Applying this plan exposes the listed ports to the whole internet. Rules open to 0.0.0.0/0 (or ::/0) "
+                        "on databases and admin ports are a direct path to credential brute-forcing and data exfiltration."
+                    ),
+                    confidence="High",
+                    effort="Low",
+                    blast_radius="Medium",
+                    validate_safely="Confirm which clients actually need the port and from which networks before narrowing the rule.",
+                    success_metric="No security group/firewall rule allows 0.0.0.0/0 to non-public ports in plans or live state.",
+                    rollback="Re-apply the previous CIDR list from version control.",
+                    evidence=self._evidence(ingress),
+                    fix_now=FixNow(
+                        title="Block the apply and restrict the rule to private CIDRs or security group references",
+                        commands=[
+                            "terraform show -json plan.out | jq '.resource_changes[] | select(.type | test(\"security_group|firewall\")) | .address'",
+                            "# Replace 0.0.0.0/0 with the VPC/app-tier CIDR or a source security group.",
+                            "# Add a policy check (OPA/conftest, tfsec, checkov) to fail plans with open ingress.",
+                        ],
+                    ),
+                    plan_7d=[
+                        "Stop the pending apply and restrict the ingress rule.",
+                        "Audit live security groups for the same pattern (drift from earlier applies).",
+                    ],
+                    plan_30d=[
+                        "Gate terraform apply on policy-as-code checks in CI.",
+                        "Use security group references instead of CIDRs between tiers.",
+                    ],
+                    questions=[
+                        "Who requested this change, and what client needs access?",
+                        "Is there a bastion/VPN path that should be used instead?",
+                    ],
+                )
+            )
+
+        stateful = by_kind.get("stateful_replace", []) + by_kind.get("stateful_destroy", [])
+        if stateful:
+            findings.append(
+                Finding(
+                    category="Reliability",
+                    severity="critical" if by_kind.get("stateful_destroy") else "high",
+                    title=f"Terraform plan replaces or destroys {len(stateful)} stateful resource(s) ({stateful[0].address})",
+                    subject=f"{self.name}:stateful-replace",
+                    impact=(
+                        "Replacing databases, volumes, buckets or caches destroys the existing data unless it is restored from "
+                        "a snapshot. This is a common cause of unplanned data loss from an innocent-looking attribute change."
+                    ),
+                    confidence="High",
+                    effort="Medium",
+                    blast_radius="High",
+                    validate_safely="Inspect replace_paths in the plan and confirm a tested, recent backup before any apply.",
+                    success_metric="Stateful resources are only replaced through an explicit, reviewed migration.",
+                    rollback="Restore from the latest snapshot; revert the attribute that forced replacement.",
+                    evidence=self._evidence(stateful),
+                    fix_now=FixNow(
+                        title="Block the apply and find the attribute forcing replacement",
+                        commands=[
+                            "terraform show -json plan.out | jq '.resource_changes[] | select(.change.actions | index(\"delete\")) | {address, replace_paths}'",
+                            "# Add lifecycle { prevent_destroy = true } to stateful resources.",
+                        ],
+                    ),
+                    plan_7d=[
+                        "Revert or rework the change so the resource is updated in place.",
+                        "Add prevent_destroy to databases, volumes and buckets.",
+                    ],
+                    plan_30d=[
+                        "Require manual approval in CI for plans containing delete actions on stateful types.",
+                        "Test restores from snapshots on a schedule.",
+                    ],
+                    questions=[
+                        "Is this replacement intentional (e.g., engine upgrade, encryption change)?",
+                        "When was the last successful restore test?",
+                    ],
+                )
+            )
+
+        gp2 = by_kind.get("gp2_create", [])
+        if gp2:
+            findings.append(
+                Finding(
+                    category="Cost",
+                    severity="low",
+                    title=f"Terraform plan creates {len(gp2)} new gp2 volume(s)",
+                    subject=f"{self.name}:gp2-create",
+                    impact=(
+                        "New gp2 volumes lock in a storage type that is usually more expensive than gp3 for the same baseline "
+                        "performance, and they will need migrating later."
+                    ),
+                    confidence="High",
+                    effort="Low",
+                    blast_radius="Low",
+                    evidence=self._evidence(gp2),
+                    fix_now=FixNow(
+                        title="Default new volumes to gp3 in the module",
+                        snippet='volume_type = "gp3"\niops        = 3000\nthroughput  = 125',
+                    ),
+                    plan_7d=["Change module defaults to gp3 before this plan is applied."],
+                    plan_30d=["Add a policy check that rejects new gp2 volumes."],
+                    questions=["Do any of these volumes need more than gp3 baseline IOPS/throughput?"],
+                )
+            )
+
+        return findings
+
+    def _evidence(self, risks: List[Risk]) -> List[EvidenceRef]:
+        refs = [
+            EvidenceRef(path=f"fixtures/{self.plan_path}", note=f"{r.address}: {r.detail}")
+            for r in risks[:5]
+        ]
+        if len(risks) > len(refs):
+            refs.append(EvidenceRef(path=f"fixtures/{self.plan_path}", note=f"{len(risks) - len(refs)} more"))
+        return refs
@@ -3,30 +3,36 @@ from __future__ import annotations
 import re
 from typing import List
 
-from teardown_box.findings import EvidenceRef, Finding, FixNow
+from teardown_box import scan
+from teardown_box.findings import EvidenceRef, Finding, FixNow, Metric
 from teardown_box.fixtures import Fixtures
 
+DF = "linux/df_h.txt"
+
+# "... 87% /" -> use%, mount point (the header's "Use%" has no digits and never matches).
+scan.rule(DF, "linux.disk.use", re.compile(r"\s(\d+)%\s+(.*)$"), needle="%")
+
 
 class LinuxDiskCheck:
     name = "linux.disk"
 
     def applies(self, fx: Fixtures) -> bool:
-        return fx.exists("linux/df_h.txt")
+        return fx.exists(DF)
 
-    def run(self, fx: Fixtures) -> List[Finding]:
-        txt = fx.read_text("linux/df_h.txt")
-        if txt is None:
-            return []
+    def metrics(self, fx: Fixtures) -> List[Metric]:
+        out: List[Metric] = []
+        for hit in scan.hits(fx, DF, "linux.disk.use") or []:
+            pct, mount = hit.groups
+            if mount.strip():
+                out.append(Metric(name="disk.used_pct", subject=mount.strip(), value=float(pct)))
+        return out
 
+    def run(self, fx: Fixtures) -> List[Finding]:
         hot = []
-        lines = txt.strip().splitlines()
-        for idx, line in enumerate(lines[1:], start=2):
-            m = re.search(r"\s(\d+)%\s", line)
-            if m is None:
-                continue
-            pct = int(m.group(1))
+        for hit in scan.hits(fx, DF, "linux.disk.use") or []:
+            pct = int(hit.groups[0])
             if pct >= 80:
-                hot.append((idx, line, pct))
+                hot.append((hit.line_no, hit.line, pct))
 
         if not hot:
             return []
@@ -1,54 +1,85 @@
 from __future__ import annotations
 
 import re
-from typing import List, Set
+from typing import Dict, List, Mapping, Set, Tuple
 
-from teardown_box.findings import EvidenceRef, Finding, FixNow
+from teardown_box import scan
+from teardown_box.findings import EvidenceRef, Finding, FixNow, Metric
 from teardown_box.fixtures import Fixtures
+from teardown_box.parsers import ss
+from teardown_box.parsers.ss import PortIndex
+
+SS = "linux/ss_lntp.txt"
+
+# Local Address:Port of each listener, IPv4 or IPv6 ("0.0.0.0:22", "[::]:22", "*:80").
+scan.rule(SS, "linux.ports.listen", re.compile(r"LISTEN\s+\d+\s+\d+\s+(\S+)"), needle="LISTEN")
+
+SENSITIVE_PORTS = {5432, 6379, 9200, 27017}
 
 
 class LinuxPortsCheck:
     name = "linux.ports"
 
+    # Extra ports allowed on hosts matching a name pattern in fleet bundles, e.g. {"lb-*": {8443}}.
+    allowed_by_host: Mapping[str, Set[int]] = {}
+    # Ports listed per fleet finding; the rest are summarized in one line.
+    fleet_ports_shown = 20
+
     def __init__(self) -> None:
         self.allowed_public_ports: Set[int] = {22, 80, 443}
 
     def applies(self, fx: Fixtures) -> bool:
-        return fx.exists("linux/ss_lntp.txt")
+        return fx.exists(SS) or bool(fx.glob(ss.FLEET_GLOB))
+
+    def _exposed(self, fx: Fixtures) -> Dict[int, List[Tuple[int, str]]]:
+        # Port -> (line, local address) of each public bind; IPv4 and IPv6 binds of one port are one port.
+        out: Dict[int, List[Tuple[int, str]]] = {}
+        for hit in scan.hits(fx, SS, "linux.ports.listen") or []:
+            local = hit.groups[0]
+            found = ss.split_local(local)
+            if found is not None and ss.is_exposed(found[0]):
+                out.setdefault(found[1], []).append((hit.line_no, local))
+        return out
+
+    def metrics(self, fx: Fixtures) -> List[Metric]:
+        # Every port bound on a public address, allowed or not, so history can tell when one first appeared.
+        out: List[Metric] = []
+        if fx.exists(SS):
+            out.extend(Metric(name="linux.public_port", subject=str(port), value=1.0) for port in sorted(self._exposed(fx)))
+        if fx.glob(ss.FLEET_GLOB):
+            index = ss.load_fleet(fx)
+            out.append(Metric(name="linux.fleet_hosts", subject="ss", value=float(len(index.hosts))))
+            for port, mask in sorted(index.exposed.items()):
+                out.append(Metric(name="linux.public_port_hosts", subject=str(port), value=float(mask.bit_count())))
+        return out
 
     def run(self, fx: Fixtures) -> List[Finding]:
-        txt = fx.read_text("linux/ss_lntp.txt")
-        if txt is None:
-            return []
+        findings: List[Finding] = []
+        if fx.exists(SS):
+            findings.extend(self._host_findings(fx))
+        if fx.glob(ss.FLEET_GLOB):
+            findings.extend(self._fleet_findings(ss.load_fleet(fx)))
+        return findings
 
-        lines = txt.strip().splitlines()
+    def _host_findings(self, fx: Fixtures) -> List[Finding]:
         findings: List[Finding] = []
 
-        for idx, line in enumerate(lines[1:], start=2):
-            m = re.search(r"LISTEN\s+\d+\s+\d+\s+([0-9\.]+):(\d+)", line)
-            if m is None:
-                continue
-            addr = m.group(1).strip()
-            port = int(m.group(2))
-            is_public_bind = addr == "0.0.0.0"
-            if is_public_bind and port not in self.allowed_public_ports:
+        for port, binds in sorted(self._exposed(fx).items(), key=lambda kv: kv[1][0][0]):
+            if port not in self.allowed_public_ports:
                 findings.append(
                     Finding(
                         category="Security",
-                        severity="high" if port in {5432, 6379, 9200, 27017} else "medium",
+                        severity="high" if port in SENSITIVE_PORTS else "medium",
                         title=f"Unexpected public listener detected on port {port}",
+                        subject=f"{self.name}:{port}/tcp",
                         impact=(
                             "Public listeners expand the attack surface. Databases and caches should not be exposed to the internet "
                             "without strong justification, network controls, and monitoring."
                         ),
                         confidence="High",
                         evidence=[
-                            EvidenceRef(
-                                path="fixtures/linux/ss_lntp.txt",
-                                note=f"Bound to 0.0.0.0:{port}",
-                                line_start=idx,
-                                line_end=idx,
-                            )
+                            EvidenceRef(path=f"fixtures/{SS}", note=f"Bound to {local}", line_start=idx, line_end=idx)
+                            for idx, local in binds
                         ],
                         fix_now=FixNow(
                             title="Restrict bind address and enforce network controls",
@@ -78,3 +109,90 @@ class LinuxPortsCheck:
                 )
 
         return findings
+
+    def _fleet_findings(self, index: PortIndex) -> List[Finding]:
+        # One finding per class of port with host counts, not one per host and port.
+        violations = index.violations(self.allowed_public_ports, self.allowed_by_host)
+        findings: List[Finding] = []
+        for sensitive in (True, False):
+            ports = {port: mask for port, mask in violations.items() if (port in SENSITIVE_PORTS) == sensitive}
+            if ports:
+                findings.append(self._fleet_finding(index, ports, sensitive))
+        return findings
+
+    def _fleet_finding(self, index: PortIndex, ports: Dict[int, int], sensitive: bool) -> Finding:
+        ranked = sorted(ports.items(), key=lambda kv: (-kv[1].bit_count(), kv[0]))
+        affected = 0
+        for mask in ports.values():
+            affected |= mask
+        total = len(index.hosts)
+        summary = ", ".join(f"{port} on {mask.bit_count():,}" for port, mask in ranked[:5])
+        if len(ranked) > 5:
+            summary += f", +{len(ranked) - 5} more ports"
+
+        evidence: List[EvidenceRef] = []
+        for port, mask in ranked[:5]:
+            samples = [(hid, line) for hid, line in index.samples.get(port, []) if mask >> hid & 1]
+            if not samples:
+                continue
+            hid, line = samples[0]
+            evidence.append(
+                EvidenceRef(
+                    path=f"fixtures/{index.paths[hid]}",
+                    note=f"{port}/tcp public on {mask.bit_count():,} of {total:,} hosts, e.g. {', '.join(index.names(mask, 3))}",
+                    line_start=line,
+                    line_end=line,
+                )
+            )
+
+        rows = [f"{'port':>6}  {'hosts':>7}  {'share':>6}  sample hosts"]
+        for port, mask in ranked[: self.fleet_ports_shown]:
+            n = mask.bit_count()
+            rows.append(f"{port:>6}  {n:>7,}  {100.0 * n / total:>5.1f}%  {', '.join(index.names(mask, 3))}")
+        if len(ranked) > self.fleet_ports_shown:
+            rest = 0
+            for _, mask in ranked[self.fleet_ports_shown :]:
+                rest |= mask
+            rows.append(f"... {len(ranked) - self.fleet_ports_shown} more ports on {rest.bit_count():,} hosts")
+
+        port_list = " ".join(str(port) for port, _ in ranked[: self.fleet_ports_shown])
+        return Finding(
+            category="Security",
+            severity="high" if sensitive else "medium",
+            subject=f"{self.name}:fleet-{'sensitive' if sensitive else 'other'}",
+            title=(
+                f"Databases/caches publicly reachable on {affected.bit_count():,} of {total:,} hosts ({summary})"
+                if sensitive
+                else f"Unexpected public listeners on {affected.bit_count():,} of {total:,} hosts ({summary})"
+            ),
+            impact=(
+                "Every host listening on a public address for a port outside the allowlist is reachable by anything "
+                "that can route to it. Across a fleet, one missed firewall rule is enough for exposure."
+            ),
+            confidence="High",
+            evidence=evidence,
+            fix_now=FixNow(
+                title="Bind these services to private addresses and deny the ports at the network edge",
+                commands=[
+                    "# Per service: listen_addresses (Postgres), bind (Redis), network.host (Elasticsearch), bindIp (MongoDB)",
+                    f"# Fleet-wide: deny inbound {port_list} from 0.0.0.0/0 and ::/0 in security groups / host firewalls",
+                    "# On an affected host, confirm the bind address:",
+                    "sudo ss -lntp | head -50",
+                ],
+                snippet="\n".join(rows),
+            ),
+            plan_7d=[
+                "Close the ports with the most hosts first; they usually come from one image or config template.",
+                "Add the intended public ports per host role to the allowlist so the report only shows drift.",
+                "Re-run against fresh ss dumps to confirm the host counts drop to zero.",
+            ],
+            plan_30d=[
+                "Fix the base image or config management role that binds services to all interfaces.",
+                "Collect ss -lntp fleet-wide on a schedule and alert when a port's host count grows.",
+                "Enforce default-deny ingress with explicit per-role exceptions.",
+            ],
+            questions=[
+                "Which host roles are meant to expose which ports?",
+                "Are these hosts reachable from the internet, or only from a flat internal network?",
+            ],
+        )
@@ -1,86 +1,159 @@
 from __future__ import annotations
 
-import re
-from typing import List
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 
+from teardown_box import scan
+from teardown_box.correlate import Event
 from teardown_box.findings import EvidenceRef, Finding, FixNow
 from teardown_box.fixtures import Fixtures
+from teardown_box.parsers import journal
+from teardown_box.parsers.journal import UnitRestarts
+
+STATUS = "linux/systemctl_status.txt"
+
+scan.visitor(STATUS, "linux.systemd.status_units", journal.StatusUnitsVisitor)
 
 
 class LinuxSystemdFlapCheck:
     name = "linux.systemd.flap"
 
+    # Journal thresholds: restarts inside journal.FLAP_WINDOW_S, or the unit's own restart counter.
+    min_restarts_in_window = 5
+    high_restart_counter = 10
+
     def applies(self, fx: Fixtures) -> bool:
-        return fx.exists("linux/systemctl_status.txt")
+        return fx.exists(STATUS) or fx.exists("linux/journal.json")
 
     def run(self, fx: Fixtures) -> List[Finding]:
-        txt = fx.read_text("linux/systemctl_status.txt")
-        if txt is None:
-            return []
-
-        lines = txt.splitlines()
-        restart_counter = None
-        counter_line_no = None
+        findings: List[Finding] = []
+        seen: set = set()
 
-        for idx, line in enumerate(lines, start=1):
-            m = re.search(r"restart counter is at (\d+)", line, re.IGNORECASE)
-            if m is not None:
-                restart_counter = int(m.group(1))
-                counter_line_no = idx
-                break
+        if fx.exists("linux/journal.json"):
+            units = self._journal_units(fx)
+            flapping = [
+                u
+                for u in units.values()
+                if u.peak_in_window >= self.min_restarts_in_window
+                or u.max_counter >= self.high_restart_counter
+                or u.start_limit_hit
+            ]
+            flapping.sort(key=lambda u: (u.peak_in_window, u.restarts), reverse=True)
+            for u in flapping:
+                seen.add(u.unit)
+                sev = "high" if (u.peak_in_window >= 10 or u.max_counter >= self.high_restart_counter) else "medium"
+                findings.append(self._finding(u.unit, sev, [self._journal_evidence(u)]))
 
-        auto_restart = any("auto-restart" in l.lower() for l in lines)
-        if not auto_restart and restart_counter is None:
-            return []
-
-        sev = "high" if (restart_counter is not None and restart_counter >= 10) else "medium"
-        counter_note = "Service is in auto-restart state" if restart_counter is None else f"Restart counter is {restart_counter}"
-
-        return [
-            Finding(
-                category="Reliability",
-                severity=sev,
-                title="systemd service appears to be flapping (restart loop)",
-                impact=(
-                    "Restart loops create intermittent downtime, amplify load (retry storms), and usually mask a real dependency "
-                    "issue (DB, DNS, config, or secrets). They also consume CPU and can trigger cascading failures."
-                ),
-                confidence="High",
-                evidence=[
-                    EvidenceRef(
+        units = scan.result(fx, STATUS, "linux.systemd.status_units")
+        if units is not None:
+            for st in units.values():
+                if st.unit in seen or (not st.auto_restart and st.counter is None):
+                    continue
+                sev = "high" if (st.counter is not None and st.counter >= self.high_restart_counter) else "medium"
+                if st.counter_line is not None:
+                    ev = EvidenceRef(
                         path="fixtures/linux/systemctl_status.txt",
-                        note=counter_note,
-                        line_start=counter_line_no,
-                        line_end=counter_line_no,
+                        note=f"{st.unit}: restart counter is {st.counter}",
+                        line_start=st.counter_line,
+                        line_end=st.counter_line,
                     )
-                ] if counter_line_no is not None else [
-                    EvidenceRef(
+                else:
+                    ev = EvidenceRef(
                         path="fixtures/linux/systemctl_status.txt",
-                        note="Detected auto-restart state in service status output",
+                        note=f"{st.unit}: detected auto-restart state in service status output",
                     )
-                ],
-                fix_now=FixNow(
-                    title="Pull recent logs and verify dependencies; add backoff while fixing root cause",
-                    commands=[
-                        "sudo journalctl -u api.service --since '2 hours ago' | tail -200",
-                        "sudo systemctl show api.service -p Restart -p RestartUSec -p StartLimitBurst -p StartLimitIntervalUSec",
-                        "sudo systemctl status api.service",
-                    ],
-                ),
-                plan_7d=[
-                    "Identify the failing dependency (DB connectivity, DNS, secrets, config) and fix root cause.",
-                    "Add health checks and a reasonable restart policy (backoff + limits) to avoid retry storms.",
-                    "Add alerting on restart rate and error budget burn.",
-                ],
-                plan_30d=[
-                    "Add graceful degradation (circuit breaker/backoff) in the app for dependency failures.",
-                    "Add dependency SLOs (DB latency, DNS) and correlate with deploy events.",
-                    "Standardize systemd unit templates and logging across services.",
-                ],
-                questions=[
-                    "Is this happening constantly or only during deploy windows?",
-                    "What database/network path does the service use (VPC, SG, local socket)?",
-                    "Do you have an incident timeline for when this started?",
-                ],
-            )
+                findings.append(self._finding(st.unit, sev, [ev]))
+
+        return findings
+
+    def events(self, fx: Fixtures) -> List[Event]:
+        if not fx.exists("linux/journal.json"):
+            return []
+        out: List[Event] = []
+        for u in self._journal_units(fx).values():
+            for w in u.top_windows:
+                out.append(
+                    Event(
+                        source="systemd",
+                        stream=f"{u.unit} restarts",
+                        start=w.start,
+                        end=w.end,
+                        weight=w.restarts,
+                        evidence=EvidenceRef(
+                            path="fixtures/linux/journal.json",
+                            note=f"{u.unit}: {w.restarts} restart(s) {self._fmt_ts(w.start)} to {self._fmt_ts(w.end)}",
+                        ),
+                    )
+                )
+        return out
+
+    @staticmethod
+    def _journal_units(fx: Fixtures) -> Dict[str, UnitRestarts]:
+        def build() -> Dict[str, UnitRestarts]:
+            with fx.open_binary("linux/journal.json") as f:
+                return journal.analyze(f)
+
+        return fx.memo("linux.journal_units", build)
+
+    @staticmethod
+    def _fmt_ts(ts: Optional[float]) -> str:
+        if ts is None:
+            return "?"
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%SZ")
+
+    def _journal_evidence(self, u: UnitRestarts) -> EvidenceRef:
+        window_min = int(journal.FLAP_WINDOW_S // 60)
+        parts = [
+            f"{u.unit}: {u.restarts} restarts between {self._fmt_ts(u.first_ts)} and {self._fmt_ts(u.last_ts)}",
+            f"peak {u.peak_in_window} in {window_min} min from {self._fmt_ts(u.peak_window_start)}",
+            f"{u.windows} flap window(s)",
         ]
+        if u.max_counter:
+            parts.append(f"restart counter reached {u.max_counter}")
+        if u.start_limit_hit:
+            parts.append("start limit hit")
+        if u.last_failure:
+            parts.append(f"last failure: {u.last_failure}")
+        return EvidenceRef(
+            path="fixtures/linux/journal.json",
+            note="; ".join(parts),
+            line_start=u.last_line,
+            line_end=u.last_line,
+        )
+
+    def _finding(self, unit: str, sev: str, evidence: List[EvidenceRef]) -> Finding:
+        return Finding(
+            category="Reliability",
+            severity=sev,
+            title=f"systemd service {unit} appears to be flapping (restart loop)",
+            subject=f"{self.name}:{unit}",
+            impact=(
+                "Restart loops create intermittent downtime, amplify load (retry storms), and usually mask a real dependency "
+                "issue (DB, DNS, config, or secrets). They also consume CPU and can trigger cascading failures."
+            ),
+            confidence="High",
+            evidence=evidence,
+            fix_now=FixNow(
+                title="Pull recent logs and verify dependencies; add backoff while fixing root cause",
+                commands=[
+                    f"sudo journalctl -u {unit} --since '2 hours ago' | tail -200",
+                    f"sudo systemctl show {unit} -p Restart -p RestartUSec -p StartLimitBurst -p StartLimitIntervalUSec",
+                    f"sudo systemctl status {unit}",
+                ],
+            ),
+            plan_7d=[
+                "Identify the failing dependency (DB connectivity, DNS, secrets, config) and fix root cause.",
+                "Add health checks and a reasonable restart policy (backoff + limits) to avoid retry storms.",
+                "Add alerting on restart rate and error budget burn.",
+            ],
+            plan_30d=[
+                "Add graceful degradation (circuit breaker/backoff) in the app for dependency failures.",
+                "Add dependency SLOs (DB latency, DNS) and correlate with deploy events.",
+                "Standardize systemd unit templates and logging across services.",
+            ],
+            questions=[
+                "Is this happening constantly or only during deploy windows?",
+                "What database/network path does the service use (VPC, SG, local socket)?",
+                "Do you have an incident timeline for when this started?",
+            ],
+        )
@@ -4,6 +4,7 @@ from typing import List
 
 from teardown_box.findings import EvidenceRef, Finding, FixNow
 from teardown_box.fixtures import Fixtures
+from teardown_box.parsers import nginx_conf
 
 
 class NginxProxyTimeoutsCheck:
@@ -13,15 +14,42 @@ class NginxProxyTimeoutsCheck:
         return fx.exists("edge/nginx.conf")
 
     def run(self, fx: Fixtures) -> List[Finding]:
-        txt = fx.read_text("edge/nginx.conf")
-        if txt is None:
+        ast = nginx_conf.load(fx, "edge/nginx.conf")
+        if ast is None:
             return []
 
-        has_proxy_pass = "proxy_pass" in txt
-        has_read_timeout = "proxy_read_timeout" in txt
-        if not has_proxy_pass or has_read_timeout:
+        # Only locations that fall back to the nginx default (nothing set at location/server/http level).
+        missing = [
+            loc
+            for loc in nginx_conf.proxy_locations(ast)
+            if loc.settings["proxy_read_timeout"].source == "default"
+        ]
+        if not missing:
             return []
 
+        evidence: List[EvidenceRef] = []
+        for loc in missing[:5]:
+            connect = loc.settings["proxy_connect_timeout"]
+            evidence.append(
+                EvidenceRef(
+                    path=f"fixtures/{loc.path}",
+                    note=(
+                        f"server {loc.server_name}, location {loc.location} -> {loc.proxy_pass}: "
+                        f"effective proxy_read_timeout={nginx_conf.DEFAULT_PROXY_TIMEOUT} (default), "
+                        f"proxy_connect_timeout={connect.value} ({connect.source})"
+                    ),
+                    line_start=loc.line,
+                    line_end=loc.end_line,
+                )
+            )
+        if len(missing) > len(evidence):
+            evidence.append(
+                EvidenceRef(
+                    path="fixtures/edge/nginx.conf",
+                    note=f"{len(missing) - len(evidence)} more proxied locations without proxy_read_timeout",
+                )
+            )
+
         return [
             Finding(
                 category="Reliability",
@@ -32,12 +60,7 @@ class NginxProxyTimeoutsCheck:
                     "This inflates load and worsens tail latency."
                 ),
                 confidence="High",
-                evidence=[
-                    EvidenceRef(
-                        path="fixtures/edge/nginx.conf",
-                        note="proxy_pass present but proxy_read_timeout not found",
-                    )
-                ],
+                evidence=evidence,
                 fix_now=FixNow(
                     title="Set baseline proxy timeouts for upstream behavior",
                     commands=[
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+from teardown_box.correlate import Event
+from teardown_box.findings import EvidenceRef, Finding, FixNow
+from teardown_box.fixtures import Fixtures
+from teardown_box.parsers import access_log, nginx_conf
+from teardown_box.parsers.access_log import AccessLogSummary, RouteStats
+from teardown_box.sampling import count_bounds, quantile_bounds, wilson_interval
+
+
+class NginxUpstreamLatencyCheck:
+    name = "edge.nginx.upstream_latency"
+
+    log_glob = "edge/access*.log"
+    min_requests = 10
+    # A minute counts as a 5xx spike for correlation at this error rate, and at least this multiple of the log-wide rate.
+    spike_min_rate = 0.01
+    spike_factor = 2.0
+
+    def applies(self, fx: Fixtures) -> bool:
+        return bool(fx.glob(self.log_glob))
+
+    def _read_timeouts(self, fx: Fixtures) -> List[nginx_conf.ProxyLocation]:
+        if not fx.exists("edge/nginx.conf"):
+            return []
+        ast = nginx_conf.load(fx, "edge/nginx.conf")
+        return nginx_conf.proxy_locations(ast) if ast is not None else []
+
+    def _timeout_s(self, locations: List[nginx_conf.ProxyLocation], route: str) -> Tuple[float, str]:
+        loc = nginx_conf.match_location(locations, route)
+        if loc is None:
+            return 60.0, f"{nginx_conf.DEFAULT_PROXY_TIMEOUT} (default)"
+        setting = loc.settings["proxy_read_timeout"]
+        secs = nginx_conf.parse_duration(setting.value)
+        return (secs if secs is not None else 60.0), f"{setting.value} ({setting.source}, location {loc.location})"
+
+    @staticmethod
+    def _evidence_path(logs: List[str]) -> str:
+        # Counts are merged across every matching log, so with several of them cite their directory.
+        return f"fixtures/{logs[0]}" if len(logs) == 1 else f"fixtures/{logs[0].rsplit('/', 1)[0]}/"
+
+    def _summary(self, fx: Fixtures, logs: List[str]) -> AccessLogSummary:
+        def build() -> AccessLogSummary:
+            summary = AccessLogSummary()
+            for rel in logs:
+                local = fx.local_path(rel)
+                if local is not None:
+                    part = access_log.analyze(local, sampling=fx.sampling)
+                    fx.reads.add(rel, nbytes=part.bytes_read, rows=part.lines)
+                else:
+                    # Archive member or in-memory artifact: one sequential pass (open_raw counts the bytes).
+                    raw, compressed, size = fx.open_raw(rel)  # type: ignore[misc]
+                    part = access_log.analyze_stream(raw, size, compressed, sampling=fx.sampling)
+                    fx.reads.add(rel, rows=part.lines)
+                summary.merge(part)
+            return summary
+
+        return fx.memo(("edge.access_log", tuple(logs)), build)
+
+    def events(self, fx: Fixtures) -> List[Event]:
+        # Minutes whose 5xx rate is well above the log-wide rate; a steady background of errors is not a spike.
+        logs = fx.glob(self.log_glob)
+        summary = self._summary(fx, logs)
+        total = sum(summary.requests_by_minute.values())
+        errors = sum(summary.errors_by_minute.values())
+        if not total or not errors:
+            return []
+        threshold = max(self.spike_min_rate, self.spike_factor * errors / total)
+        out: List[Event] = []
+        for minute, n in summary.errors_by_minute.items():
+            reqs = summary.requests_by_minute.get(minute, 0)
+            if reqs and n / reqs >= threshold:
+                out.append(
+                    Event(
+                        source="edge",
+                        stream="edge 5xx spikes",
+                        start=float(minute),
+                        end=float(minute + 60),
+                        weight=n,
+                        evidence=EvidenceRef(
+                            path=self._evidence_path(logs),
+                            note=(
+                                f"{n}/{reqs} {'sampled ' if summary.sampled else ''}requests failed with 5xx "
+                                f"in the minute from {self._fmt_minute(minute)}"
+                            ),
+                        ),
+                    )
+                )
+        return out
+
+    def run(self, fx: Fixtures) -> List[Finding]:
+        logs = fx.glob(self.log_glob)
+        summary = self._summary(fx, logs)
+        if not summary.routes:
+            return []
+
+        locations = self._read_timeouts(fx)
+        findings: List[Finding] = []
+        info = summary.sample_info()
+        confidence = "High" if info is None else f"Medium ({info.describe()})"
+
+        # min_requests is about the route's real traffic: sampled counts are scaled to whole-log estimates
+        # first (the 5xx rate is a ratio and needs no scaling).
+        erroring: List[Tuple[str, RouteStats]] = [
+            (route, st)
+            for route, st in summary.routes.items()
+            if st.status_504 > 0
+            or (st.requests * summary.scale >= self.min_requests and st.status_5xx / st.requests >= 0.01)
+        ]
+        erroring.sort(key=lambda kv: (kv[1].status_504, kv[1].status_5xx), reverse=True)
+
+        # Routes whose upstream p99 already uses half the read timeout are one slow dependency away from 504s.
+        near_timeout: List[Tuple[str, RouteStats, float, str]] = []
+        for route, st in summary.routes.items():
+            if st.upstream_ms.total == 0:
+                continue
+            timeout_s, timeout_label = self._timeout_s(locations, route)
+            if st.upstream_ms.quantile(0.99) >= 0.5 * timeout_s * 1000.0:
+                near_timeout.append((route, st, timeout_s, timeout_label))
+        near_timeout.sort(key=lambda t: t[1].upstream_ms.quantile(0.99), reverse=True)
+
+        if erroring:
+            total_504 = sum(st.status_504 for _, st in erroring)
+            findings.append(
+                Finding(
+                    category="Reliability",
+                    severity="high" if total_504 > 0 else "medium",
+                    title=f"Edge 5xx/504 responses concentrated on {len(erroring)} route(s) ({erroring[0][0]})",
+                    subject=f"{self.name}:5xx-routes",
+                    impact=(
+                        "Upstream errors at the edge are user-visible failures. 504s mean nginx gave up waiting on the upstream, "
+                        "which usually triggers client retries and multiplies load on an already slow dependency."
+                    ),
+                    confidence=confidence,
+                    effort="Medium",
+                    blast_radius="Medium",
+                    validate_safely="Compare the same routes in upstream application logs/APM for the same window before changing timeouts.",
+                    success_metric="5xx/504 rate per route below 0.1% at peak; no retry storms during deploys.",
+                    rollback="Revert timeout or upstream changes per location; nginx -t && reload is instant.",
+                    evidence=[
+                        EvidenceRef(path=self._evidence_path(logs), note=self._route_note(route, st, summary.scale))
+                        for route, st in erroring[:5]
+                    ],
+                    fix_now=FixNow(
+                        title="Break down 5xx/504 by route and upstream, then fix the slowest dependency first",
+                        commands=[
+                            "awk '$9 ~ /^5/ {print $7}' /var/log/nginx/access.log | sed 's/?.*//' | sort | uniq -c | sort -rn | head -20",
+                            "grep ' 504 ' /var/log/nginx/access.log | tail -20",
+                        ],
+                    ),
+                    plan_7d=[
+                        "Confirm which upstream(s) serve the erroring routes and pull their latency/error dashboards.",
+                        "Fix or isolate the slow dependency (query/index, pool limits, timeouts) behind the worst route.",
+                        "Alert on per-route 5xx rate rather than global error rate.",
+                    ],
+                    plan_30d=[
+                        "Add retries with budgets/backoff only where requests are idempotent.",
+                        "Move long-running work (exports, reports) off the request path.",
+                    ],
+                    questions=[
+                        "Are the erroring routes user-facing or internal/batch?",
+                        "Do clients retry automatically on 5xx/504?",
+                    ],
+                )
+            )
+
+        if near_timeout:
+            snippets: List[str] = []
+            for route, st, _, _ in near_timeout[:5]:
+                suggested = self._suggested_timeout_s(st.upstream_ms.quantile(0.99))
+                snippets.append(f"location {route} {{ proxy_read_timeout {suggested}s; }}")
+            findings.append(
+                Finding(
+                    category="Performance",
+                    severity="medium",
+                    title=f"Upstream p99 latency is close to proxy_read_timeout on {len(near_timeout)} route(s)",
+                    subject=f"{self.name}:near-timeout",
+                    impact=(
+                        "When upstream p99 sits near the proxy timeout, small slowdowns turn into 504s. Timeouts should be "
+                        "set from observed tail latency, and routes that need long timeouts are candidates for async processing."
+                    ),
+                    confidence=confidence,
+                    effort="Low",
+                    blast_radius="Medium",
+                    validate_safely="Apply per-location overrides on one server first and compare 504 rate and upstream p99 for a day.",
+                    success_metric="No 504s on the listed routes; upstream p99 comfortably below the configured timeout.",
+                    rollback="Remove the per-location proxy_read_timeout override and reload nginx.",
+                    evidence=[
+                        EvidenceRef(
+                            path=self._evidence_path(logs),
+                            note=f"{self._route_note(route, st, summary.scale)}; effective proxy_read_timeout={label}",
+                        )
+                        for route, st, _, label in near_timeout[:5]
+                    ],
+                    fix_now=FixNow(
+                        title="Set per-route proxy_read_timeout from observed p99 (and fix the slow upstream)",
+                        commands=["nginx -t && sudo systemctl reload nginx"],
+                        snippet="\n".join(snippets),
+                    ),
+                    plan_7d=[
+                        "Profile the slowest routes upstream (DB queries, external calls) and cut their p99.",
+                        "Set explicit per-location timeouts sized from p99 with headroom.",
+                    ],
+                    plan_30d=[
+                        "Track per-route p99 against timeout budgets on a dashboard.",
+                        "Convert long-running endpoints to background jobs with polling or callbacks.",
+                    ],
+                    questions=[
+                        "Which of these routes are expected to be long-running (exports, reports)?",
+                        "Is there a CDN/LB in front with a shorter idle timeout than nginx?",
+                    ],
+                )
+            )
+
+        return findings
+
+    def _route_note(self, route: str, st: RouteStats, scale: float = 1.0) -> str:
+        note = (
+            f"route {route}: requests={st.requests}, 5xx={st.status_5xx}, 504={st.status_504}, "
+            f"upstream p50/p99={self._fmt_ms(st.upstream_ms.quantile(0.50))}/{self._fmt_ms(st.upstream_ms.quantile(0.99))}, "
+            f"request p99={self._fmt_ms(st.request_ms.quantile(0.99))}"
+        )
+        if scale <= 1.0:
+            return note
+        # Sampled: counts above are from the sample; add whole-input estimates with 95% bounds.
+        req_lo, req_hi = count_bounds(st.requests, scale)
+        err_lo, err_hi = wilson_interval(st.status_5xx, st.requests)
+        note += f"; est. requests {req_lo:,}-{req_hi:,}, 5xx rate {err_lo:.2%}-{err_hi:.2%}"
+        hist = st.upstream_ms if st.upstream_ms.total else st.request_ms
+        q_lo, q_hi = quantile_bounds(0.99, hist.total)
+        note += f", p99 {self._fmt_ms(hist.quantile(q_lo))}-{self._fmt_ms(hist.quantile(q_hi))} (95% CI)"
+        return note
+
+    @staticmethod
+    def _fmt_minute(minute: int) -> str:
+        return datetime.fromtimestamp(minute, tz=timezone.utc).strftime("%Y-%m-%d %H:%MZ")
+
+    @staticmethod
+    def _fmt_ms(ms: float) -> str:
+        return f"{ms / 1000.0:.2f}s" if ms >= 1000.0 else f"{ms:.0f}ms"
+
+    @staticmethod
+    def _suggested_timeout_s(p99_ms: float) -> int:
+        # 1.5x observed p99, rounded up to a 5s step, never below 5s.
+        return max(5, int(math.ceil(p99_ms * 1.5 / 1000.0 / 5.0)) * 5)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import List, Tuple
 
 from teardown_box.findings import EvidenceRef, Finding, FixNow
-from teardown_box.fixtures import Fixtures
+from teardown_box.fixtures import CsvRow, Fixtures
+from teardown_box.parsers import pg_log, pg_statements
 
 
 class PostgresAutovacuumCheck:
@@ -12,12 +13,32 @@ class PostgresAutovacuumCheck:
     def applies(self, fx: Fixtures) -> bool:
         return fx.exists("postgres/pg_stat_user_tables.csv")
 
+    def _log_evidence(self, fx: Fixtures, tables: List[CsvRow]) -> Tuple[List[EvidenceRef], List[str]]:
+        # Autovacuum's own log lines (log_autovacuum_min_duration) say whether it runs on these tables, how
+        # long it takes, and whether lock conflicts keep cancelling it.
+        if not fx.glob(pg_log.LOG_GLOB):
+            return [], []
+        summary = pg_log.load(fx)
+        evidence: List[EvidenceRef] = []
+        notes: List[str] = []
+        for r in tables:
+            tv = summary.table(r.get("schemaname"), r.get("relname") or "")
+            if tv is None:
+                continue
+            table = f"{r.get('schemaname')}.{r.get('relname')}"
+            note = f"{table}: {tv.runs} autovacuum runs logged ({tv.aggressive} aggressive), longest {tv.max_elapsed_s:.0f} s"
+            if tv.cancelled:
+                note += f", {tv.cancelled} cancelled by conflicting locks"
+                notes.append(f"# {table}: autovacuum cancelled {tv.cancelled}x; find the conflicting lock holder, then VACUUM (VERBOSE) off-peak")
+            evidence.append(EvidenceRef(path=pg_log.evidence_path(fx), note=note))
+        return evidence, notes
+
     def run(self, fx: Fixtures) -> List[Finding]:
         rows = fx.read_csv_dicts("postgres/pg_stat_user_tables.csv")
         if rows is None:
             return []
 
-        bad: List[Dict[str, str]] = []
+        bad: List[CsvRow] = []
         for r in rows:
             try:
                 live = int(float(r.get("n_live_tup", "0") or "0"))
@@ -40,22 +61,35 @@ class PostgresAutovacuumCheck:
 
         names = ", ".join([f"{r.get('schemaname')}.{r.get('relname')}" for r in bad[:3]])
 
+        evidence: List[EvidenceRef] = EvidenceRef.for_spans(
+            "fixtures/postgres/pg_stat_user_tables.csv",
+            "Tables with high n_dead_tup relative to n_live_tup",
+            (r.span for r in bad),
+        )
+        query_notes: List[str] = []
+        for table, summary, spans in pg_statements.offending_statements(fx, bad[:3]):
+            evidence.extend(
+                EvidenceRef.for_spans(
+                    f"fixtures/{pg_statements.STATEMENTS_PATH}", f"Heaviest statements on {table}: {summary}", spans
+                )
+            )
+            query_notes.append(f"# {table}: {summary}")
+
+        log_evidence, log_notes = self._log_evidence(fx, bad[:3])
+        evidence.extend(log_evidence)
+
         return [
             Finding(
                 category="Reliability",
                 severity="medium",
                 title=f"Autovacuum pressure likely on ({names}) with high dead tuple ratios",
+                subject=f"{self.name}:dead-tuples",
                 impact=(
                     "High dead tuples increase bloat and slow queries (more pages to scan, worse cache locality). "
                     "If vacuum can't keep up, performance degrades and storage costs rise."
                 ),
                 confidence="Medium",
-                evidence=[
-                    EvidenceRef(
-                        path="fixtures/postgres/pg_stat_user_tables.csv",
-                        note="Tables with high n_dead_tup relative to n_live_tup",
-                    )
-                ],
+                evidence=evidence,
                 fix_now=FixNow(
                     title="Inspect worst tables and tune vacuum/analyze thresholds where needed",
                     commands=[
@@ -65,7 +99,9 @@ class PostgresAutovacuumCheck:
                         "# autovacuum_vacuum_scale_factor, autovacuum_vacuum_threshold, "
                         "# autovacuum_analyze_scale_factor, autovacuum_analyze_threshold",
                         "# Also check for long-running transactions preventing cleanup.",
-                    ],
+                    ]
+                    + (["# Heaviest statements touching these tables (churn sources):"] + query_notes if query_notes else [])
+                    + log_notes,
                 ),
                 plan_7d=[
                     "Identify top bloat contributors and confirm vacuum is running as expected.",
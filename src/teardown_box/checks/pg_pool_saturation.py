@@ -1,42 +1,159 @@
 from __future__ import annotations
 
-from typing import List
+import heapq
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from teardown_box.findings import EvidenceRef, Finding, FixNow
+from teardown_box.correlate import Event
+from teardown_box.findings import EvidenceRef, Finding, FixNow, Metric
 from teardown_box.fixtures import Fixtures
+from teardown_box.parsers import pgbouncer
+from teardown_box.parsers.pgbouncer import PoolStat
 
 
 class PostgresPoolSaturationCheck:
     name = "postgres.pool_saturation"
 
+    # pgbouncer SHOW dumps: a pool is saturated with any client queued, with servers at this share of
+    # pool_size, or when the longest wait reaches wait_ms; a pooler when clients reach this share of
+    # max_client_conn. The single-pool summary applies the same thresholds to its average wait.
+    usage_threshold = 0.90
+    wait_ms = 150.0
+    high_waiting = 100
+    high_wait_ms = 1000.0
+    # Ranked per-pool findings; the rest are rolled up into one.
+    max_pool_findings = 10
+
     def applies(self, fx: Fixtures) -> bool:
-        return fx.exists("postgres/pg_pool_stats.json")
+        return fx.exists("postgres/pg_pool_stats.json") or bool(fx.glob(pgbouncer.POOLS_GLOB))
+
+    def events(self, fx: Fixtures) -> List[Event]:
+        # Optional "wait_spikes": [{"start": ISO-8601, "end": ISO-8601, "peak_wait_ms": .., "peak_waiting": ..}]
+        d = fx.read_json("postgres/pg_pool_stats.json")
+        if not isinstance(d, dict):
+            return []
+        out: List[Event] = []
+        for spike in d.get("wait_spikes") or []:
+            if not isinstance(spike, dict):
+                continue
+            start = self._epoch(spike.get("start"))
+            end = self._epoch(spike.get("end")) or start
+            if start is None or end is None:
+                continue
+            peak_ms = spike.get("peak_wait_ms", "?")
+            waiting = int(spike.get("peak_waiting", 0) or 0)
+            out.append(
+                Event(
+                    source="pool",
+                    stream="connection pool wait spikes",
+                    start=start,
+                    end=max(start, end),
+                    weight=max(waiting, 1),
+                    evidence=EvidenceRef(
+                        path="fixtures/postgres/pg_pool_stats.json",
+                        note=f"wait spike {spike.get('start')} to {spike.get('end')}: peak_wait_ms={peak_ms}, waiting={waiting}",
+                    ),
+                )
+            )
+        return out
+
+    def metrics(self, fx: Fixtures) -> List[Metric]:
+        out = self._legacy_metrics(fx)
+        fleet = pgbouncer.load(fx)
+        for st in fleet.pools.values():
+            subject = f"{st.pooler}/{st.database}/{st.user}"
+            out.append(Metric(name="pool.waiting", subject=subject, value=float(st.waiting)))
+            out.append(Metric(name="pool.max_wait_ms", subject=subject, value=round(st.wait_ms, 1)))
+            if st.server_usage is not None:
+                out.append(Metric(name="pool.server_usage_pct", subject=subject, value=round(100.0 * st.server_usage, 1)))
+        for pooler in fleet.poolers.values():
+            if pooler.max_client_conn:
+                pct = round(100.0 * pooler.clients / pooler.max_client_conn, 1)
+                out.append(Metric(name="pool.client_usage_pct", subject=pooler.name, value=pct))
+        return out
+
+    @staticmethod
+    def _measured(d: dict, key: str) -> Optional[float]:
+        # Absent or null means not measured (collect-postgres can't see a pooler's queue), not zero.
+        try:
+            return float(d[key]) if d.get(key) is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def _legacy_limit(self, d: dict) -> Tuple[int, bool]:
+        # (connection limit, server-side): a pooler's max_client_conn, or collect-postgres' max_connections.
+        pooler_limit = int(self._measured(d, "max_client_conn") or 0)
+        if pooler_limit > 0:
+            return pooler_limit, False
+        return int(self._measured(d, "max_connections") or 0), True
+
+    def _legacy_metrics(self, fx: Fixtures) -> List[Metric]:
+        d = fx.read_json("postgres/pg_pool_stats.json")
+        if not isinstance(d, dict):
+            return []
+        db = str(d.get("db") or "-")
+        out: List[Metric] = []
+        avg_wait = self._measured(d, "avg_wait_ms")
+        if avg_wait is not None:
+            out.append(Metric(name="pool.avg_wait_ms", subject=db, value=avg_wait))
+        waiting = self._measured(d, "current_waiting")
+        if waiting is not None:
+            out.append(Metric(name="pool.waiting", subject=db, value=waiting))
+        limit, _ = self._legacy_limit(d)
+        if limit > 0:
+            current = int(self._measured(d, "current_clients") or 0)
+            out.append(Metric(name="pool.client_usage_pct", subject=db, value=round(100.0 * current / limit, 1)))
+        return out
+
+    @staticmethod
+    def _epoch(value: object) -> Optional[float]:
+        if not isinstance(value, str):
+            return None
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return dt.timestamp() if dt.tzinfo is not None else None
 
     def run(self, fx: Fixtures) -> List[Finding]:
+        return self._legacy_findings(fx) + self._pgbouncer_findings(fx)
+
+    def _legacy_findings(self, fx: Fixtures) -> List[Finding]:
+        # Single-pool summary (postgres/pg_pool_stats.json, also written by `collect-postgres`).
         d = fx.read_json("postgres/pg_pool_stats.json")
-        if d is None:
+        if not isinstance(d, dict):
             return []
 
-        max_client = int(d.get("max_client_conn", 0) or 0)
-        current = int(d.get("current_clients", 0) or 0)
-        waiting = int(d.get("current_waiting", 0) or 0)
-        avg_wait = float(d.get("avg_wait_ms", 0) or 0)
+        max_client, server_side = self._legacy_limit(d)
+        current = int(self._measured(d, "current_clients") or 0)
+        waiting_v = self._measured(d, "current_waiting")
+        avg_wait_v = self._measured(d, "avg_wait_ms")
+        waiting = int(waiting_v or 0)
+        avg_wait = avg_wait_v or 0.0
 
         if max_client <= 0:
             return []
 
         usage = current / max_client if max_client else 0.0
-        saturated = usage >= 0.90 or waiting > 0 or avg_wait >= 150
+        saturated = usage >= self.usage_threshold or waiting > 0 or avg_wait >= self.wait_ms
         if not saturated:
             return []
 
-        severity = "high" if waiting >= 100 or avg_wait >= 200 else "medium"
+        severity = "high" if waiting >= self.high_waiting or avg_wait >= self.high_wait_ms else "medium"
+        queue = (
+            f"waiting={waiting if waiting_v is not None else 'unknown'}, "
+            f"avg_wait_ms={avg_wait if avg_wait_v is not None else 'unknown'}"
+        )
 
         return [
             Finding(
                 category="Reliability",
                 severity=severity,
-                title="Connection pool appears saturated (high client usage / waiting queue)",
+                title=(
+                    "Postgres client backends near max_connections"
+                    if server_side
+                    else "Connection pool appears saturated (high client usage / waiting queue)"
+                ),
                 impact=(
                     "When the pool saturates, requests queue and tail latency spikes. This often presents as "
                     "timeouts and cascading retries, which further increases load."
@@ -45,7 +162,7 @@ class PostgresPoolSaturationCheck:
                 evidence=[
                     EvidenceRef(
                         path="fixtures/postgres/pg_pool_stats.json",
-                        note=f"clients={current}/{max_client}, waiting={waiting}, avg_wait_ms={avg_wait}",
+                        note=f"clients={current}/{max_client}{' (max_connections)' if server_side else ''}, {queue}",
                     )
                 ],
                 fix_now=FixNow(
@@ -74,3 +191,131 @@ class PostgresPoolSaturationCheck:
                 ],
             )
         ]
+
+    def _saturated(self, st: PoolStat) -> bool:
+        usage = st.server_usage
+        return st.waiting > 0 or st.wait_ms >= self.wait_ms or (usage is not None and usage >= self.usage_threshold)
+
+    def _pool_note(self, st: PoolStat) -> str:
+        size = f"{st.sv_active}/{st.pool_size}" if st.pool_size else f"{st.sv_active} (pool_size unknown)"
+        return (
+            f"{st.database}/{st.user}: clients active={st.cl_active}, waiting={st.waiting}, "
+            f"max wait={st.wait_ms:.0f}ms, servers active={size}, idle={st.sv_idle}"
+            + (f", pool_mode={st.pool_mode}" if st.pool_mode else "")
+        )
+
+    def _pool_ref(self, fleet: pgbouncer.Fleet, st: PoolStat) -> EvidenceRef:
+        path = fleet.poolers[st.pooler].pools_path
+        return EvidenceRef(path=f"fixtures/{path}", note=self._pool_note(st), line_start=st.line, line_end=st.line)
+
+    def _pgbouncer_findings(self, fx: Fixtures) -> List[Finding]:
+        fleet = pgbouncer.load(fx)
+        if not fleet.pools:
+            return []
+
+        # One pass over every (pooler, db, user) slot; only the entries that get evidence are ranked.
+        saturated = [st for st in fleet.pools.values() if self._saturated(st)]
+        ranked = heapq.nlargest(
+            self.max_pool_findings + 5,
+            saturated,
+            key=lambda st: (st.waiting, st.wait_ms, st.server_usage or 0.0),
+        )
+        findings: List[Finding] = []
+        for st in ranked[: self.max_pool_findings]:
+            sev = "high" if st.waiting >= self.high_waiting or st.wait_ms >= self.high_wait_ms else "medium"
+            findings.append(
+                self._pool_finding(
+                    sev,
+                    f"pgbouncer pool {st.database}/{st.user} on {st.pooler} is saturated",
+                    [self._pool_ref(fleet, st)],
+                    subject=f"{self.name}:pool:{st.pooler}/{st.database}/{st.user}",
+                )
+            )
+        rest = len(saturated) - self.max_pool_findings
+        if rest > 0:
+            findings.append(
+                self._pool_finding(
+                    "medium",
+                    f"{rest} more pgbouncer pools show saturation",
+                    [self._pool_ref(fleet, st) for st in ranked[self.max_pool_findings :]],
+                    subject=f"{self.name}:pools-rollup",
+                )
+            )
+
+        near_limit = [
+            p
+            for p in fleet.poolers.values()
+            if p.max_client_conn and p.clients >= self.usage_threshold * p.max_client_conn
+        ]
+        near_limit.sort(key=lambda p: p.clients / (p.max_client_conn or 1), reverse=True)
+        if near_limit:
+            findings.append(
+                Finding(
+                    category="Reliability",
+                    severity="high" if any(p.clients >= (p.max_client_conn or 0) for p in near_limit) else "medium",
+                    title=f"pgbouncer client connections near max_client_conn on {len(near_limit)} pooler(s)",
+                    subject=f"{self.name}:max-client-conn",
+                    impact=(
+                        "At max_client_conn pgbouncer refuses new client connections outright, so app instances see "
+                        "connection errors instead of queueing."
+                    ),
+                    confidence="High",
+                    evidence=[
+                        EvidenceRef(
+                            path=f"fixtures/{p.pools_path.rsplit('/', 1)[0]}/show_config.txt",
+                            note=f"{p.name}: clients={p.clients}/{p.max_client_conn}",
+                        )
+                        for p in near_limit[:5]
+                    ],
+                    fix_now=FixNow(
+                        title="Raise max_client_conn (within file-descriptor limits) or shrink app-side pools",
+                        commands=[
+                            'psql -p 6432 -U pgbouncer pgbouncer -c "SHOW CONFIG;" | grep -E "max_client_conn|default_pool_size"',
+                            "ulimit -n  # pgbouncer needs roughly max_client_conn + pool sizes file descriptors",
+                        ],
+                    ),
+                    plan_7d=[
+                        "Count app instances x per-instance pool size against each pooler's max_client_conn.",
+                        "Spread clients across poolers (or add one) before raising limits further.",
+                    ],
+                    questions=["Do app pools hold idle connections to the pooler that could be closed?"],
+                )
+            )
+        return findings
+
+    def _pool_finding(
+        self, severity: str, title: str, evidence: List[EvidenceRef], subject: Optional[str] = None
+    ) -> Finding:
+        return Finding(
+            category="Reliability",
+            severity=severity,
+            title=title,
+            subject=subject,
+            impact=(
+                "Clients queue in pgbouncer once every server connection of the pool is busy; each queued request "
+                "adds its wait to response time, and retries on timeout add more load to the same pool."
+            ),
+            confidence="High",
+            evidence=evidence,
+            fix_now=FixNow(
+                title="Find what holds the pool's server connections, then size the pool to the database",
+                commands=[
+                    'psql -p 6432 -U pgbouncer pgbouncer -c "SHOW POOLS;"',
+                    "psql -c \"SELECT datname, usename, state, count(*), max(now() - xact_start) FROM pg_stat_activity "
+                    "GROUP BY 1, 2, 3 ORDER BY 4 DESC;\"",
+                ],
+            ),
+            plan_7d=[
+                "Check for long transactions or idle-in-transaction sessions holding server connections.",
+                "Raise pool_size for this database/user only if Postgres has headroom (max_connections, CPU).",
+                "Prefer transaction pooling for short statements where session features are not needed.",
+            ],
+            plan_30d=[
+                "Alert on cl_waiting > 0 and maxwait per pool across all poolers.",
+                "Budget server connections per database/user across the fleet against max_connections.",
+            ],
+            questions=[
+                "Which services connect as this database/user, and how many instances run at peak?",
+                "Is this pool in session mode with long-lived client sessions?",
+            ],
+        )
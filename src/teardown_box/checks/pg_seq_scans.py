@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import List
 
-from teardown_box.findings import EvidenceRef, Finding, FixNow
-from teardown_box.fixtures import Fixtures
+from teardown_box.findings import EvidenceRef, Finding, FixNow, Metric
+from teardown_box.fixtures import CsvRow, Fixtures
+from teardown_box.parsers import pg_statements
 
 
 class PostgresSeqScansCheck:
@@ -12,12 +13,25 @@ class PostgresSeqScansCheck:
     def applies(self, fx: Fixtures) -> bool:
         return fx.exists("postgres/pg_stat_user_tables.csv")
 
+    def metrics(self, fx: Fixtures) -> List[Metric]:
+        rows = fx.read_csv_dicts("postgres/pg_stat_user_tables.csv")
+        if rows is None:
+            return []
+        out: List[Metric] = []
+        for r in rows:
+            try:
+                seq_scan = float(r.get("seq_scan", "0") or "0")
+            except ValueError:
+                continue
+            out.append(Metric(name="postgres.seq_scan", subject=f"{r.get('schemaname')}.{r.get('relname')}", value=seq_scan))
+        return out
+
     def run(self, fx: Fixtures) -> List[Finding]:
         rows = fx.read_csv_dicts("postgres/pg_stat_user_tables.csv")
         if rows is None:
             return []
 
-        offenders: List[Dict[str, str]] = []
+        offenders: List[CsvRow] = []
         for r in rows:
             try:
                 reltuples = int(float(r.get("reltuples", "0") or "0"))
@@ -33,26 +47,36 @@ class PostgresSeqScansCheck:
 
         names = ", ".join([f"{r.get('schemaname')}.{r.get('relname')}" for r in offenders[:3]])
 
+        evidence: List[EvidenceRef] = EvidenceRef.for_spans(
+            "fixtures/postgres/pg_stat_user_tables.csv",
+            "Tables with high reltuples and high seq_scan",
+            (r.span for r in offenders),
+        )
+        query_notes: List[str] = []
+        for table, summary, spans in pg_statements.offending_statements(fx, offenders[:3]):
+            evidence.extend(
+                EvidenceRef.for_spans(
+                    f"fixtures/{pg_statements.STATEMENTS_PATH}", f"Heaviest statements on {table}: {summary}", spans
+                )
+            )
+            query_notes.append(f"# {table}: {summary}")
+
         return [
             Finding(
                 category="Performance",
                 severity="high",
                 title=f"High sequential scan activity on large tables ({names})",
+                subject=f"{self.name}:large-tables",
                 impact=(
                     "Repeated sequential scans on large tables inflate latency and CPU, especially under concurrency. "
                     "This is a common root cause of 'DB is slow' incidents."
                 ),
                 confidence="Medium",
-                evidence=[
-                    EvidenceRef(
-                        path="fixtures/postgres/pg_stat_user_tables.csv",
-                        note="Tables with high reltuples and high seq_scan",
-                    )
-                ],
+                evidence=evidence,
                 fix_now=FixNow(
                     title="Identify query patterns causing seq_scans and add targeted indexes",
-                    commands=[
-                        "# Map top seq_scans to query patterns (pg_stat_statements + logs)",
+                    commands=(query_notes or ["# Map top seq_scans to query patterns (pg_stat_statements + logs)"])
+                    + [
                         "# Run EXPLAIN (ANALYZE, BUFFERS) to confirm scan type and cost",
                         "# Add the smallest viable index to support the common filter/order",
                         'psql -c "SELECT relname, seq_scan, idx_scan, n_live_tup, n_dead_tup '
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import heapq
+from typing import List
+
+from teardown_box.findings import EvidenceRef, Finding, FixNow, Metric
+from teardown_box.fixtures import Fixtures
+from teardown_box.parsers import pg_log
+from teardown_box.parsers.pg_log import PgLogSummary
+
+_MB = 1024 * 1024
+
+
+class PostgresServerLogCheck:
+    name = "postgres.server_log"
+
+    # Lock waits that outlast deadlock_timeout (log_lock_waits) before a finding; any deadlock is one.
+    lock_wait_threshold = 10
+    temp_files_threshold = 10
+    temp_bytes_threshold = 1024 * _MB
+
+    def applies(self, fx: Fixtures) -> bool:
+        return bool(fx.glob(pg_log.LOG_GLOB))
+
+    def run(self, fx: Fixtures) -> List[Finding]:
+        summary = pg_log.load(fx)
+        return self._lock_findings(fx, summary) + self._temp_findings(fx, summary)
+
+    def metrics(self, fx: Fixtures) -> List[Metric]:
+        summary = pg_log.load(fx)
+        return [
+            Metric(name="pglog.slow_statements", subject="postgres", value=float(summary.slow_statements)),
+            Metric(name="pglog.lock_waits", subject="postgres", value=float(summary.lock_waits)),
+            Metric(name="pglog.deadlocks", subject="postgres", value=float(summary.deadlocks)),
+            Metric(name="pglog.temp_files", subject="postgres", value=float(summary.temp_files)),
+            Metric(name="pglog.temp_mb", subject="postgres", value=round(summary.temp_bytes / _MB, 1)),
+        ]
+
+    def _lock_findings(self, fx: Fixtures, summary: PgLogSummary) -> List[Finding]:
+        if not summary.deadlocks and summary.lock_waits < self.lock_wait_threshold:
+            return []
+
+        modes = ", ".join(f"{mode} x{n}" for mode, n in sorted(summary.lock_modes.items(), key=lambda kv: -kv[1])[:3])
+        parts = [f"{summary.deadlocks} deadlocks", f"{summary.lock_waits} lock waits past deadlock_timeout"]
+        if modes:
+            parts.append(f"waiting for {modes}")
+        if summary.lock_wait_ms.total:
+            parts.append(
+                f"waits that ended in the lock: p50 {summary.lock_wait_ms.quantile(0.5):.0f} ms, "
+                f"max {summary.lock_wait_ms.max_ms:.0f} ms"
+            )
+        evidence = [EvidenceRef(path=pg_log.evidence_path(fx), note="; ".join(parts))]
+        victims = heapq.nlargest(3, ((st.deadlocks, q) for q, st in summary.statements.items() if st.deadlocks))
+        for n, query in victims:
+            evidence.append(EvidenceRef(path=pg_log.evidence_path(fx), note=f"{n} deadlocks aborting: {query[:160]}"))
+
+        return [
+            Finding(
+                category="Reliability",
+                severity="high" if summary.deadlocks else "medium",
+                subject=f"{self.name}:locks",
+                title=(
+                    f"Postgres server log shows {summary.deadlocks} deadlocks and {summary.lock_waits} long lock waits"
+                    if summary.deadlocks
+                    else f"Postgres server log shows {summary.lock_waits} lock waits past deadlock_timeout"
+                ),
+                impact=(
+                    "Sessions queue behind row and table locks, so latency spikes track write contention rather "
+                    "than load; deadlocks abort one transaction each, which surfaces as retries or user-facing errors."
+                ),
+                confidence="High",
+                evidence=evidence,
+                fix_now=FixNow(
+                    title="Find the blocking transactions and make them shorter or consistently ordered",
+                    commands=[
+                        'psql -c "SELECT pid, pg_blocking_pids(pid), wait_event_type, state, '
+                        'now() - xact_start AS xact_age, left(query, 80) FROM pg_stat_activity '
+                        "WHERE cardinality(pg_blocking_pids(pid)) > 0;\"",
+                        "# Deadlock DETAIL lines in the log name both processes and their statements;",
+                        "# touch rows in one consistent order (e.g. ORDER BY id ... FOR UPDATE) in both code paths.",
+                        "# Keep lock_timeout short on DDL: SET lock_timeout = '5s'; before ALTER TABLE.",
+                    ],
+                ),
+                plan_7d=[
+                    "Map each deadlock's two statements to code paths and fix the lock ordering.",
+                    "Move slow work (HTTP calls, batch loops) out of open transactions.",
+                    "Alert on deadlocks and on lock waits past deadlock_timeout from the server log.",
+                ],
+                plan_30d=[
+                    "Set idle_in_transaction_session_timeout and statement_timeout per role.",
+                    "Run schema changes with lock_timeout and retries.",
+                    "Review hot-row patterns (counters, queues) for contention-free alternatives.",
+                ],
+                questions=[
+                    "Do the deadlocks line up with batch jobs or deploys?",
+                    "Is log_lock_waits on everywhere, or only on this server?",
+                ],
+            )
+        ]
+
+    def _temp_findings(self, fx: Fixtures, summary: PgLogSummary) -> List[Finding]:
+        if summary.temp_files < self.temp_files_threshold and summary.temp_bytes < self.temp_bytes_threshold:
+            return []
+
+        evidence = [
+            EvidenceRef(
+                path=pg_log.evidence_path(fx),
+                note=f"{summary.temp_files} temporary files, {summary.temp_bytes / _MB:,.0f} MB spilled (log_temp_files)",
+            )
+        ]
+        spills = heapq.nlargest(3, ((st.temp_bytes, st.temp_files, q) for q, st in summary.statements.items() if st.temp_files))
+        for nbytes, files, query in spills:
+            evidence.append(
+                EvidenceRef(path=pg_log.evidence_path(fx), note=f"{files} files, {nbytes / _MB:,.0f} MB: {query[:160]}")
+            )
+
+        return [
+            Finding(
+                category="Performance",
+                severity="medium",
+                title=f"Postgres queries spill {summary.temp_bytes / _MB:,.0f} MB to temporary files",
+                subject=f"{self.name}:temp-files",
+                impact=(
+                    "Sorts and hashes that exceed work_mem write to disk, turning in-memory operations into I/O; "
+                    "the affected queries slow down and compete with everything else for the disk."
+                ),
+                confidence="High",
+                evidence=evidence,
+                fix_now=FixNow(
+                    title="Give the spilling queries enough work_mem, or remove the sort",
+                    commands=[
+                        "# EXPLAIN (ANALYZE, BUFFERS) the statements above; look for 'Sort Method: external merge'",
+                        "# and 'Batches: N' (N > 1) on Hash nodes.",
+                        "# Raise work_mem for the role or transaction that runs them, not globally:",
+                        "ALTER ROLE <reporting_role> SET work_mem = '64MB';",
+                        "# or: BEGIN; SET LOCAL work_mem = '256MB'; <query>; COMMIT;",
+                    ],
+                ),
+                plan_7d=[
+                    "Fix the top spilling statements with an index that provides the order, or per-role work_mem.",
+                    "Keep log_temp_files on (e.g. 10MB) to confirm the spills stop.",
+                ],
+                plan_30d=[
+                    "Size work_mem against max_connections and concurrent sorts per query.",
+                    "Move heavy reporting queries to a replica with its own settings.",
+                ],
+                questions=[
+                    "Which role/service runs the spilling statements?",
+                    "How much RAM is left after shared_buffers for per-query memory?",
+                ],
+            )
+        ]
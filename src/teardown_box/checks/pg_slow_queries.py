@@ -1,19 +1,24 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
 
 from teardown_box.findings import EvidenceRef, Finding, FixNow
-from teardown_box.fixtures import Fixtures
+from teardown_box.fixtures import CsvRow, Fixtures
+from teardown_box.parsers import pg_explain, pg_log
 
 
 class PostgresSlowQueriesCheck:
     name = "postgres.slow_queries"
 
+    # EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output saved as postgres/explain/<queryid>.json.
+    explain_glob = "postgres/explain/*.json"
+    plan_top_n = 5
+
     def applies(self, fx: Fixtures) -> bool:
         return fx.exists("postgres/pg_stat_statements.csv")
 
-    def _top_queries(self, rows: List[Dict[str, str]], n: int) -> List[Dict[str, str]]:
-        def total_ms(r: Dict[str, str]) -> float:
+    def _top_queries(self, rows: List[CsvRow], n: int) -> List[CsvRow]:
+        def total_ms(r: CsvRow) -> float:
             try:
                 return float(r.get("total_time_ms", "0") or "0")
             except ValueError:
@@ -32,28 +37,99 @@ class PostgresSlowQueriesCheck:
             return "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_token ON public.sessions (session_token);"
         return None
 
+    def _plan_evidence(self, fx: Fixtures, rows: List[CsvRow]) -> Tuple[List[EvidenceRef], List[str]]:
+        plans = {rel.rsplit("/", 1)[-1][: -len(".json")]: rel for rel in fx.glob(self.explain_glob)}
+        if not plans:
+            return [], []
+
+        evidence: List[EvidenceRef] = []
+        notes: List[str] = []
+        for r in self._top_queries(rows, self.plan_top_n):
+            qid = (r.get("queryid") or "").strip()
+            rel = plans.get(qid)
+            if rel is None:
+                continue
+            txt = fx.read_text(rel)
+            try:
+                plan = pg_explain.load_plan(txt or "")
+            except ValueError:
+                continue
+
+            parts = [f"queryid {qid}: execution {plan.execution_ms:.0f} ms over {plan.nodes} plan nodes"]
+            if plan.top_time:
+                hot = plan.top_time[0]
+                parts.append(f"hottest node {hot.label()} ({hot.exclusive_ms:.0f} ms self, {hot.exclusive_blocks:,} blocks)")
+            if plan.top_buffers and plan.top_buffers[0] != (plan.top_time[0] if plan.top_time else None):
+                parts.append(f"most buffers {plan.top_buffers[0].label()} ({plan.top_buffers[0].exclusive_blocks:,} blocks)")
+            parts.extend(plan.issues[:1])
+            evidence.append(EvidenceRef(path=f"fixtures/{rel}", note="; ".join(parts)))
+            notes.extend(f"# queryid {qid}: {issue}" for issue in plan.issues)
+        return evidence, notes
+
+    def _log_evidence(self, fx: Fixtures, top: List[CsvRow]) -> Tuple[List[EvidenceRef], List[str]]:
+        # Per-execution detail pg_stat_statements averages away: the duration spread of logged runs
+        # (log_min_duration_statement / auto_explain) and sorts or hashes that spilled to disk.
+        if not fx.glob(pg_log.LOG_GLOB):
+            return [], []
+        summary = pg_log.load(fx)
+        evidence: List[EvidenceRef] = []
+        notes: List[str] = []
+        for r in top:
+            st = summary.statement((r.get("query") or "").strip().strip('"'))
+            if st is None:
+                continue
+            qid = (r.get("queryid") or "").strip() or "?"
+            parts: List[str] = []
+            hist = st.durations
+            if hist.total:
+                parts.append(
+                    f"{hist.total:,} slow executions logged, p50 {hist.quantile(0.5):.0f} ms, "
+                    f"p99 {hist.quantile(0.99):.0f} ms, max {hist.max_ms:.0f} ms"
+                )
+            if st.temp_files:
+                parts.append(f"{st.temp_files} temp files ({st.temp_bytes / (1024 * 1024):,.0f} MB)")
+                notes.append(f"# queryid {qid}: spills to temp files; raise work_mem for it or avoid the sort/hash")
+            if st.deadlocks:
+                parts.append(f"{st.deadlocks} deadlocks")
+            if parts:
+                evidence.append(EvidenceRef(path=pg_log.evidence_path(fx), note=f"queryid {qid}: " + "; ".join(parts)))
+        return evidence, notes
+
     def run(self, fx: Fixtures) -> List[Finding]:
-        rows = fx.read_csv_dicts("postgres/pg_stat_statements.csv")
-        if rows is None:
+        # With --max-rows, a weighted reservoir keeps the statements with the most total time.
+        loaded = fx.sample_csv_dicts("postgres/pg_stat_statements.csv", weight_col="total_time_ms")
+        if loaded is None:
             return []
+        rows, info = loaded
 
         top = self._top_queries(rows, 3)
         if not top:
             return []
 
-        evidence_notes: List[EvidenceRef] = [
-            EvidenceRef(
-                path="fixtures/postgres/pg_stat_statements.csv",
-                note="Top queries by total_time_ms (sample)",
-                line_start=1,
-                line_end=1 + len(top),
-            )
-        ]
+        evidence_notes: List[EvidenceRef] = EvidenceRef.for_spans(
+            "fixtures/postgres/pg_stat_statements.csv",
+            "Top queries by total_time_ms (sample)" if info is None else (
+                f"Top queries by total_time_ms from a {info.describe()}, rows kept with probability "
+                "increasing with total_time_ms"
+            ),
+            (r.span for r in top),
+        )
+
+        plan_evidence, plan_notes = self._plan_evidence(fx, rows)
+        evidence_notes.extend(plan_evidence)
+        log_evidence, log_notes = self._log_evidence(fx, top)
+        evidence_notes.extend(log_evidence)
 
         fix_cmds: List[str] = [
             "# For each top query, run EXPLAIN (ANALYZE, BUFFERS) in a safe environment",
             r"# Confirm indexes with \d+ <table> and actual query patterns (params, ordering)",
         ]
+        if plan_notes:
+            fix_cmds.append("# Plan findings from the supplied EXPLAIN (ANALYZE, BUFFERS) output:")
+            fix_cmds.extend(plan_notes)
+        if log_notes:
+            fix_cmds.append("# From the server log:")
+            fix_cmds.extend(log_notes)
 
         hints: List[str] = []
         for r in top:
@@ -75,7 +151,7 @@ class PostgresSlowQueriesCheck:
                     "A handful of queries often dominate database load. Improving them typically reduces p95 latency, "
                     "stabilizes CPU, and lowers infra cost by delaying scale-up."
                 ),
-                confidence="Medium",
+                confidence="Medium" if info is None else f"Medium ({info.describe()})",
                 evidence=evidence_notes,
                 fix_now=FixNow(
                     title="Validate query plans and implement the highest-impact index/query changes",
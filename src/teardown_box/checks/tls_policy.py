@@ -1,44 +1,91 @@
 from __future__ import annotations
 
-from typing import List
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 
+from teardown_box import scan
 from teardown_box.findings import EvidenceRef, Finding, FixNow
 from teardown_box.fixtures import Fixtures
 
+SCAN = "edge/tls_scan.txt"
+# Per-endpoint summaries written by `teardown-box probe-tls` (same format, plus certificate expiry).
+PROBES = "edge/tls/*.txt"
+CERT_WARN_DAYS = 30
+
+for _files in (SCAN, PROBES):
+    scan.rule(_files, "edge.tls.legacy", re.compile(r"tlsv1\.[01]: enabled", re.IGNORECASE), first_only=True)
+    scan.rule(_files, "edge.tls.no_hsts", re.compile(r"hsts: missing", re.IGNORECASE), first_only=True)
+    scan.rule(
+        _files,
+        "edge.tls.not_after",
+        re.compile(r"^certificate notafter:\s*(\S+)(?:\s*\((-?\d+) days\))?", re.IGNORECASE),
+        first_only=True,
+    )
+
+
+def _parse_not_after(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
 
 class TlsPolicyCheck:
     name = "edge.tls_policy"
 
+    # Days left are counted from when the check runs (a bundle may be analysed weeks after probing);
+    # None means now. The probe's own "(N days)" is only a fallback and an evidence note.
+    now: Optional[datetime] = None
+
+    def _summaries(self, fx: Fixtures) -> List[str]:
+        return ([SCAN] if fx.exists(SCAN) else []) + fx.glob(PROBES)
+
     def applies(self, fx: Fixtures) -> bool:
-        return fx.exists("edge/tls_scan.txt")
+        return fx.exists(SCAN) or bool(fx.glob(PROBES))
 
     def run(self, fx: Fixtures) -> List[Finding]:
-        txt = fx.read_text("edge/tls_scan.txt")
-        if txt is None:
-            return []
+        legacy: List[str] = []
+        no_hsts: List[str] = []
+        expiring: List[Tuple[int, str, str, str]] = []  # (days left now, notAfter, rel, days at probe time)
+        now = self.now or datetime.now(timezone.utc)
+        for rel in self._summaries(fx):
+            if scan.hits(fx, rel, "edge.tls.legacy"):
+                legacy.append(rel)
+            if scan.hits(fx, rel, "edge.tls.no_hsts"):
+                no_hsts.append(rel)
+            for hit in scan.hits(fx, rel, "edge.tls.not_after") or []:
+                not_after, probed = hit.groups
+                expires = _parse_not_after(not_after)
+                if expires is not None:
+                    days = int((expires - now).total_seconds() // 86400)
+                elif probed is not None:
+                    days = int(probed)
+                else:
+                    continue
+                if days <= CERT_WARN_DAYS:
+                    expiring.append((days, not_after, rel, probed or "?"))
 
-        lower = txt.lower()
-        legacy_enabled = ("tlsv1.0: enabled" in lower) or ("tlsv1.1: enabled" in lower)
-        hsts_missing = "hsts: missing" in lower
+        def where(rels: List[str]) -> str:
+            return "" if len(rels) <= 1 else f" on {len(rels)} endpoints"
 
         findings: List[Finding] = []
 
-        if legacy_enabled:
+        if legacy:
             findings.append(
                 Finding(
                     category="Security",
                     severity="medium",
-                    title="Legacy TLS versions appear enabled (TLS 1.0/1.1)",
+                    title=f"Legacy TLS versions appear enabled (TLS 1.0/1.1){where(legacy)}",
+                    subject=f"{self.name}:legacy-versions",
                     impact=(
                         "Older TLS versions weaken security posture and may violate compliance expectations. "
                         "Most modern clients support TLS 1.2+."
                     ),
                     confidence="Medium",
                     evidence=[
-                        EvidenceRef(
-                            path="fixtures/edge/tls_scan.txt",
-                            note="TLSv1.0/TLSv1.1 enabled in scan summary",
-                        )
+                        EvidenceRef(path=f"fixtures/{rel}", note="TLSv1.0/TLSv1.1 enabled in scan summary")
+                        for rel in legacy
                     ],
                     fix_now=FixNow(
                         title="Disable TLS 1.0/1.1 and standardize a modern policy",
@@ -66,22 +113,21 @@ class TlsPolicyCheck:
                 )
             )
 
-        if hsts_missing:
+        if no_hsts:
             findings.append(
                 Finding(
                     category="Security",
                     severity="low",
-                    title="HSTS is missing",
+                    title=f"HSTS is missing{where(no_hsts)}",
+                    subject=f"{self.name}:hsts-missing",
                     impact=(
                         "Without HSTS, clients can be tricked into initial HTTP connections in some downgrade scenarios. "
                         "HSTS is usually a low-risk hardening win for public HTTPS sites."
                     ),
                     confidence="Medium",
                     evidence=[
-                        EvidenceRef(
-                            path="fixtures/edge/tls_scan.txt",
-                            note="HSTS marked missing in scan summary",
-                        )
+                        EvidenceRef(path=f"fixtures/{rel}", note="HSTS marked missing in scan summary")
+                        for rel in no_hsts
                     ],
                     fix_now=FixNow(
                         title="Add an HSTS header after validating HTTPS-only readiness",
@@ -105,4 +151,53 @@ class TlsPolicyCheck:
                 )
             )
 
+        if expiring:
+            expiring.sort()
+            soonest = expiring[0][0]
+            severity = "critical" if soonest <= 0 else "high" if soonest <= 7 else "medium"
+            findings.append(
+                Finding(
+                    category="Reliability",
+                    severity=severity,
+                    subject=f"{self.name}:cert-expiry",
+                    title=(
+                        f"TLS certificate expired{where([r for d, _, r, _ in expiring if d <= 0])}"
+                        if soonest <= 0
+                        else f"TLS certificate expires within {CERT_WARN_DAYS} days{where([r for _, _, r, _ in expiring])}"
+                    ),
+                    impact=(
+                        "An expired certificate is a hard outage for every client that validates it, "
+                        "and renewals that slip usually slip on several endpoints at once."
+                    ),
+                    confidence="High",
+                    effort="Low",
+                    evidence=[
+                        EvidenceRef(
+                            path=f"fixtures/{rel}",
+                            note=f"certificate notAfter {not_after}: {days} days left now ({probed} days at probe time)",
+                        )
+                        for days, not_after, rel, probed in expiring
+                    ],
+                    fix_now=FixNow(
+                        title="Renew the certificate and confirm the new one is served",
+                        commands=[
+                            "# Check what the endpoint serves right now:",
+                            "echo | openssl s_client -connect HOST:443 -servername HOST 2>/dev/null | openssl x509 -noout -enddate",
+                        ],
+                    ),
+                    plan_7d=[
+                        "Renew or re-issue the listed certificates and reload the terminating proxies.",
+                        "Re-run probe-tls to confirm the new expiry is served on every endpoint.",
+                    ],
+                    plan_30d=[
+                        "Automate renewal (ACME or your CA's API) and alert at 30 days remaining.",
+                        "Keep an inventory of which endpoints terminate TLS with which certificate.",
+                    ],
+                    questions=[
+                        "Who owns renewal for these endpoints, and is it automated?",
+                        "Are the same certificates deployed on hosts that were not probed?",
+                    ],
+                )
+            )
+
         return findings
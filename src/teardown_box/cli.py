@@ -1,12 +1,111 @@
 from __future__ import annotations
 
 import argparse
+import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 
+from teardown_box.checks import discover, load_checks, select
 from teardown_box.report.render_html import render_html_from_markdown
 from teardown_box.report.render_md import render_markdown
-from teardown_box.runner import run_all_checks
+from teardown_box.runner import RunResult, run_all_checks
+from teardown_box.sources import FixtureSource, open_source
+
+
+def _add_report_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--fixtures", required=True, help="Path to fixtures root (e.g., ./fixtures)")
+    p.add_argument("--out", required=True, help="Output directory for docs (e.g., ./docs)")
+    p.add_argument("--html", action="store_true", help="Also generate HTML output")
+    _add_render_args(p)
+
+
+def _add_render_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--title", default="Teardown Report (Sample)", help="Report title")
+    p.add_argument("--cta-label", default="Book 15 minutes", help="CTA label shown near the top of the report")
+    p.add_argument("--cta-url", default="#", help="CTA URL (Calendly, mailto, website contact page, etc.)")
+    p.add_argument(
+        "--contact-line",
+        default="Replace this with your email / Calendly link",
+        help="Short contact note shown next to the CTA",
+    )
+
+    p.add_argument(
+        "--contact-url",
+        default="#",
+        help="Optional URL for a contact page (shown next to contact line).",
+    )
+
+
+def _add_selection_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        help="Run only these checks (names or globs, comma-separated or repeated, e.g. 'postgres.*')",
+    )
+    p.add_argument(
+        "--skip",
+        action="append",
+        default=[],
+        help="Skip these checks (names or globs, comma-separated or repeated)",
+    )
+
+
+def _patterns(values: List[str]) -> List[str]:
+    return [p.strip() for v in values for p in v.split(",") if p.strip()]
+
+
+def _render_options(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "title": args.title,
+        "cta_label": args.cta_label,
+        "cta_url": args.cta_url,
+        "contact_line": args.contact_line,
+        "contact_url": args.contact_url,
+    }
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # Readers (browsers, static servers) never see a half-written report.
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_report(args: argparse.Namespace, res: RunResult, source: Optional[FixtureSource] = None) -> List[Path]:
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    generated_at = datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
+    md = render_markdown(
+        res.findings,
+        generated_at_iso=generated_at,
+        inputs_reviewed=res.inputs_reviewed,
+        fixtures_root=source if source is not None else args.fixtures,
+        **_render_options(args),
+    )
+
+    md_path = out_dir / "sample-report.md"
+    _write_atomic(md_path, md)
+    written = [md_path]
+
+    if args.html:
+        html_doc = render_html_from_markdown(md, title=args.title)
+        html_path = out_dir / "sample-report.html"
+        _write_atomic(html_path, html_doc)
+
+        # Convenience for GitHub Pages: publish docs/index.html by default.
+        index_path = out_dir / "index.html"
+        _write_atomic(index_path, html_doc)
+        written += [html_path, index_path]
+
+        nojekyll = out_dir / ".nojekyll"
+        if not nojekyll.exists():
+            nojekyll.write_text("", encoding="utf-8")
+
+    return written
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -16,65 +115,337 @@ def main(argv: list[str] | None = None) -> int:
     )
     sub = parser.add_subparsers(dest="cmd", required=True)
 
-    run_p = sub.add_parser("run", help="Run all checks against a fixtures folder and emit a report.")
-    run_p.add_argument("--fixtures", required=True, help="Path to fixtures root (e.g., ./fixtures)")
-    run_p.add_argument("--out", required=True, help="Output directory for docs (e.g., ./docs)")
-    run_p.add_argument("--title", default="Teardown Report (Sample)", help="Report title")
-    run_p.add_argument("--html", action="store_true", help="Also generate HTML output")
-    run_p.add_argument("--cta-label", default="Book 15 minutes", help="CTA label shown near the top of the report")
-    run_p.add_argument("--cta-url", default="#", help="CTA URL (Calendly, mailto, website contact page, etc.)")
+    run_p = sub.add_parser(
+        "run", help="Run all checks against a fixtures folder (or .zip/.tar.gz bundle) and emit a report."
+    )
+    _add_report_args(run_p)
+    _add_selection_args(run_p)
+    run_p.add_argument("--ndjson", help="Also write findings as NDJSON (a baseline for `diff`; *.gz is compressed)")
+    run_p.add_argument("--history", help="Append this run's inventory, findings and metrics to a SQLite history database")
+    run_p.add_argument("--host", help="Host name recorded with --history (default: the fixtures directory name)")
     run_p.add_argument(
-        "--contact-line",
-        default="Replace this with your email / Calendly link",
-        help="Short contact note shown next to the CTA",
+        "--metrics-file",
+        help="Write run metrics (durations, I/O, failures, findings) for node_exporter's textfile collector (*.prom)",
     )
-
     run_p.add_argument(
-        "--contact-url",
-        default="#",
-        help="Optional URL for a contact page (shown next to contact line).",
+        "--isolate",
+        action="store_true",
+        help="Run each check in its own worker process with memory/CPU limits and a hard deadline",
+    )
+    run_p.add_argument("--check-memory-mb", type=int, default=2048, help="Per-check address-space limit with --isolate (default: 2048)")
+    run_p.add_argument("--check-cpu", type=int, default=60, help="Per-check CPU seconds with --isolate (default: 60)")
+    run_p.add_argument(
+        "--sample-rate",
+        type=float,
+        help="Approximate mode: parse only this fraction of large logs (stratified; e.g. 0.05)",
+    )
+    run_p.add_argument(
+        "--max-rows",
+        type=int,
+        help="Approximate mode: row/line budget per large input (logs and pg_stat_statements)",
+    )
+    run_p.add_argument("--sample-seed", type=int, default=0, help="Seed for --sample-rate/--max-rows (default: 0)")
+    run_p.add_argument("--check-timeout", type=float, default=120.0, help="Per-check wall-clock deadline with --isolate (default: 120)")
+
+    trend_p = sub.add_parser("trend", help="Query the --history database: a metric over time, or newly seen subjects.")
+    trend_p.add_argument("--history", required=True, help="SQLite history database written by run --history")
+    trend_p.add_argument("--metric", help="Metric name, e.g. disk.used_pct or linux.public_port (omit to list names)")
+    trend_p.add_argument("--host", help="Only this host")
+    trend_p.add_argument("--subject", help="Only this subject (mount point, port, table, ...)")
+    trend_p.add_argument("--since", default="90d", help="Window start: 90d, 12h, or an ISO date (default: 90d)")
+    trend_p.add_argument(
+        "--new",
+        action="store_true",
+        help="List subjects first seen in the window (e.g. new public ports) instead of the series",
+    )
+
+    diff_p = sub.add_parser(
+        "diff",
+        help="Compare findings against a previous run's NDJSON and report new, worsened and resolved ones.",
+    )
+    diff_p.add_argument("--baseline", required=True, help="Findings NDJSON from the previous run (from run --ndjson or diff)")
+    source = diff_p.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixtures", help="Run checks against this fixtures root to get the current findings")
+    source.add_argument("--current", help="Use an existing findings NDJSON as the current run (e.g., a fleet merge)")
+    diff_p.add_argument("--out", required=True, help="Output directory for delta-report.md (and findings.ndjson)")
+    diff_p.add_argument("--html", action="store_true", help="Also generate delta-report.html")
+    diff_p.add_argument("--title", default="Teardown Delta Report", help="Report title")
+    diff_p.add_argument("--limit", type=int, default=50, help="Rows shown per section, most severe first (default: 50)")
+    _add_selection_args(diff_p)
+
+    watch_p = sub.add_parser(
+        "watch",
+        help="Re-run affected checks and re-render the report whenever fixture files change.",
+    )
+    _add_report_args(watch_p)
+    _add_selection_args(watch_p)
+    watch_p.add_argument("--interval", type=float, default=2.0, help="Seconds between fixture polls (default: 2)")
+    watch_p.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="Seconds the fixtures must stay unchanged before re-running (default: 1)",
     )
 
+    serve_p = sub.add_parser(
+        "serve",
+        help="Serve the report over HTTP, rendering pages on request and reloading when fixtures change.",
+    )
+    serve_p.add_argument("--fixtures", required=True, help="Path to fixtures root (e.g., ./fixtures)")
+    serve_p.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    serve_p.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    serve_p.add_argument("--interval", type=float, default=2.0, help="Seconds between fixture polls (default: 2)")
+    _add_render_args(serve_p)
+    _add_selection_args(serve_p)
+
+    collect_p = sub.add_parser(
+        "collect",
+        help="Collect a fixtures bundle (df, ss, systemctl, journal) from the local host.",
+    )
+    collect_p.add_argument("--out", required=True, help="Bundle directory to write (e.g., ./bundle)")
+    collect_p.add_argument("--gzip", action="store_true", help="Store artifacts gzip-compressed (*.gz); run reads them transparently")
+    collect_p.add_argument("--timeout", type=float, default=5.0, help="Per-command timeout in seconds (default: 5)")
+
+    pg_p = sub.add_parser(
+        "collect-postgres",
+        help="Snapshot pg_stat_* views from one or more Postgres instances into fixture bundles (needs teardown-box[postgres]).",
+    )
+    pg_p.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        help="DSN or NAME=postgresql://... (repeatable); several targets write one bundle per NAME under --out",
+    )
+    pg_p.add_argument("--targets-file", help="File with one target per line (same syntax as --target)")
+    pg_p.add_argument("--out", required=True, help="Bundle directory to write (e.g., ./bundle)")
+    pg_p.add_argument("--max-connections", type=int, default=8, help="Connections open at once across all targets (default: 8)")
+    pg_p.add_argument("--statement-timeout", type=float, default=30.0, help="Per-query timeout in seconds (default: 30)")
+    pg_p.add_argument("--gzip", action="store_true", help="Store artifacts gzip-compressed (*.gz)")
+
+    tls_p = sub.add_parser(
+        "probe-tls",
+        help="Handshake with TLS endpoints concurrently and write per-endpoint summaries (edge/tls/*.txt).",
+    )
+    tls_p.add_argument("--target", action="append", default=[], help="HOST[:PORT] to probe (repeatable; port defaults to 443)")
+    tls_p.add_argument("--targets-file", help="File with one HOST[:PORT] per line")
+    tls_p.add_argument("--out", required=True, help="Bundle directory to write (e.g., ./bundle)")
+    tls_p.add_argument("--concurrency", type=int, default=100, help="Handshakes in flight at once across all targets (default: 100)")
+    tls_p.add_argument("--timeout", type=float, default=5.0, help="Per-handshake timeout in seconds (default: 5)")
+
+    checks_p = sub.add_parser("checks", help="List registered checks (built-in and plugins) without importing them.")
+    _add_selection_args(checks_p)
+
     args = parser.parse_args(argv)
 
     if args.cmd == "run":
-        res = run_all_checks(args.fixtures)
-        out_dir = Path(args.out)
-        out_dir.mkdir(parents=True, exist_ok=True)
+        isolate = None
+        if args.isolate:
+            from teardown_box.isolate import Limits
 
-        generated_at = datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
-        md = render_markdown(
-            res.findings,
-            title=args.title,
-            generated_at_iso=generated_at,
-            inputs_reviewed=res.inputs_reviewed,
-            fixtures_root=args.fixtures,
-            cta_label=args.cta_label,
-            cta_url=args.cta_url,
-            contact_line=args.contact_line,
-            contact_url=args.contact_url,
+            isolate = Limits(memory_mb=args.check_memory_mb, cpu_s=args.check_cpu, wall_s=args.check_timeout)
+        sampling = None
+        if args.sample_rate is not None or args.max_rows is not None:
+            from teardown_box.sampling import Sampling
+
+            if args.sample_rate is not None and not 0.0 < args.sample_rate <= 1.0:
+                print("error: --sample-rate must be in (0, 1]")
+                return 2
+            if args.max_rows is not None and args.max_rows < 1:
+                print("error: --max-rows must be at least 1")
+                return 2
+            sampling = Sampling(rate=args.sample_rate, max_rows=args.max_rows, seed=args.sample_seed)
+        # Opened once: an archive bundle is not re-read for the evidence snippets.
+        source = open_source(args.fixtures)
+        res = run_all_checks(
+            source,
+            only=_patterns(args.only),
+            skip=_patterns(args.skip),
+            isolate=isolate,
+            sampling=sampling,
         )
+        for path in _write_report(args, res, source):
+            print(f"Wrote: {path}")
+        if args.ndjson:
+            from teardown_box.baseline import write_ndjson
 
-        md_path = out_dir / "sample-report.md"
-        md_path.write_text(md, encoding="utf-8")
+            write_ndjson(res.findings, Path(args.ndjson))
+            print(f"Wrote: {args.ndjson}")
+        if args.history:
+            from teardown_box.history import default_host, record_run
 
-        if args.html:
-            html_doc = render_html_from_markdown(md, title=args.title)
-            html_path = out_dir / "sample-report.html"
-            html_path.write_text(html_doc, encoding="utf-8")
+            host = args.host or default_host(args.fixtures)
+            run_id = record_run(args.history, host, args.fixtures, res)
+            print(f"Recorded run {run_id} for {host} in {args.history}")
+        if args.metrics_file:
+            from teardown_box.promfile import render_textfile, write_textfile
 
-            # Convenience for GitHub Pages: publish docs/index.html by default.
-            index_path = out_dir / "index.html"
-            index_path.write_text(html_doc, encoding="utf-8")
+            write_textfile(render_textfile(res), Path(args.metrics_file))
+            print(f"Wrote: {args.metrics_file}")
+        return 0
 
-            nojekyll = out_dir / ".nojekyll"
-            if not nojekyll.exists():
-                nojekyll.write_text("", encoding="utf-8")
+    if args.cmd == "trend":
+        from teardown_box.history import connect, metric_names, new_subjects, parse_since, series
 
+        conn = connect(args.history)
+        try:
+            if not args.metric:
+                for name in metric_names(conn):
+                    print(name)
+                return 0
+            since = parse_since(args.since)
+            if args.new:
+                for host, subject, first_seen in new_subjects(conn, args.metric, since, host=args.host):
+                    print(f"{first_seen}  {host:<24} {subject}")
+            else:
+                for started_at, host, subject, value in series(conn, args.metric, since, host=args.host, subject=args.subject):
+                    print(f"{started_at}  {host:<24} {subject:<32} {value:g}")
+        finally:
+            conn.close()
+        return 0
+
+    if args.cmd == "diff":
+        from teardown_box.baseline import diff, read_lines, write_ndjson
+        from teardown_box.report.render_delta import render_delta_markdown
+
+        out_dir = Path(args.out)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if args.current:
+            current = Path(args.current)
+        else:
+            # The current findings are kept as the next run's baseline.
+            res = run_all_checks(args.fixtures, only=_patterns(args.only), skip=_patterns(args.skip))
+            current = out_dir / "findings.ndjson"
+            write_ndjson(res.findings, current)
+            print(f"Wrote: {current}")
+        delta = diff(read_lines(current), read_lines(Path(args.baseline)))
+        md = render_delta_markdown(
+            delta,
+            title=args.title,
+            generated_at_iso=datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds"),
+            baseline_label=args.baseline,
+            limit=args.limit,
+        )
+        md_path = out_dir / "delta-report.md"
+        _write_atomic(md_path, md)
         print(f"Wrote: {md_path}")
         if args.html:
-            print(f"Wrote: {out_dir / 'sample-report.html'}")
-            print(f"Wrote: {out_dir / 'index.html'}")
+            html_path = out_dir / "delta-report.html"
+            _write_atomic(html_path, render_html_from_markdown(md, title=args.title))
+            print(f"Wrote: {html_path}")
+        print(f"{len(delta.new)} new, {len(delta.worsened)} worsened, {len(delta.resolved)} resolved, "
+              f"{delta.unchanged} unchanged")
+        return 0
+
+    if args.cmd == "watch":
+        from teardown_box.watch import watch
+
+        def on_result(res: RunResult, changed: Set[str], checks_run: int) -> None:
+            written = _write_report(args, res)
+            stamp = datetime.now().strftime("%H:%M:%S")
+            print(
+                f"[{stamp}] {len(changed)} file(s) changed, re-ran {checks_run} check(s), "
+                f"{len(res.findings)} finding(s); wrote {', '.join(str(p) for p in written)}",
+                flush=True,
+            )
+
+        try:
+            watch(
+                args.fixtures,
+                on_result,
+                interval_s=args.interval,
+                debounce_s=args.debounce,
+                checks=load_checks(only=_patterns(args.only), skip=_patterns(args.skip)),
+            )
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.cmd == "serve":
+        from teardown_box.serve import CATEGORIES, serve
+
+        httpd = serve(
+            args.fixtures,
+            _render_options(args),
+            host=args.host,
+            port=args.port,
+            interval_s=args.interval,
+            checks=load_checks(only=_patterns(args.only), skip=_patterns(args.skip)),
+        )
+        base = f"http://{args.host}:{httpd.server_address[1]}"
+        print(f"Serving {base}/ (full report), {base}/sample-report.md", flush=True)
+        print("Per-category pages: " + ", ".join(f"{base}/category/{c.lower()}" for c in CATEGORIES), flush=True)
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+        return 0
+
+    if args.cmd == "collect":
+        from teardown_box.collect import collect
+
+        started = time.monotonic()
+        outcomes = collect(args.out, compress=args.gzip, timeout_s=args.timeout)
+        for o in outcomes:
+            note = f" ({o.detail})" if o.detail else ""
+            print(f"{o.rel:<30} {o.source:<8} {o.bytes_written:>10,} B {o.seconds * 1000:>7.0f} ms{note}")
+        print(f"Collected {sum(o.source != 'failed' for o in outcomes)}/{len(outcomes)} artifacts into {args.out} "
+              f"in {time.monotonic() - started:.2f}s")
+        return 0 if any(o.source != "failed" for o in outcomes) else 1
+
+    if args.cmd == "collect-postgres":
+        from teardown_box.collect_postgres import collect_postgres
+
+        specs = list(args.target)
+        if args.targets_file:
+            lines = Path(args.targets_file).read_text(encoding="utf-8").splitlines()
+            specs += [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+        if not specs:
+            print("error: give at least one --target or a --targets-file")
+            return 2
+        started = time.monotonic()
+        try:
+            outcomes = collect_postgres(
+                specs,
+                args.out,
+                max_connections=args.max_connections,
+                compress=args.gzip,
+                statement_timeout_s=args.statement_timeout,
+            )
+        except RuntimeError as e:
+            print(f"error: {e}")
+            return 2
+        for o in outcomes:
+            note = f" ({o.detail})" if o.detail else ""
+            print(f"{o.rel:<45} {o.source:<8} {o.bytes_written:>10,} B {o.seconds * 1000:>7.0f} ms{note}")
+        print(f"Collected {sum(o.source != 'failed' for o in outcomes)}/{len(outcomes)} artifacts from {len(specs)} "
+              f"instance(s) into {args.out} in {time.monotonic() - started:.2f}s")
+        return 0 if any(o.source != "failed" for o in outcomes) else 1
+
+    if args.cmd == "probe-tls":
+        from teardown_box.tls_probe import probe_all
+
+        specs = list(args.target)
+        if args.targets_file:
+            lines = Path(args.targets_file).read_text(encoding="utf-8").splitlines()
+            specs += [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+        if not specs:
+            print("error: give at least one --target or a --targets-file")
+            return 2
+        started = time.monotonic()
+        results = probe_all(specs, args.out, concurrency=args.concurrency, timeout_s=args.timeout)
+        for r in results:
+            enabled = ",".join(label for label, state in r.versions.items() if state == "enabled") or "-"
+            note = f" ({r.error})" if r.error else ""
+            print(f"{r.host + ':' + str(r.port):<40} {enabled:<32} {r.rel}{note}")
+        print(f"Probed {sum(r.error is None for r in results)}/{len(results)} endpoint(s) into {args.out} "
+              f"in {time.monotonic() - started:.2f}s")
+        return 0 if any(r.error is None for r in results) else 1
+
+    if args.cmd == "checks":
+        for spec in select(discover(), _patterns(args.only), _patterns(args.skip)):
+            print(f"{spec.name:<30} {spec.category or '-':<12} {', '.join(spec.inputs) or '(always)'}  [{spec.target}]")
         return 0
 
     return 1
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import math
+import os
+import socket
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, List, Optional, Sequence, Tuple
+
+DEFAULT_TIMEOUT_S = 5.0
+READ_BYTES = 64 * 1024
+
+# Pseudo filesystems `df` hides by default; the /proc fallback skips them too.
+_PSEUDO_FS = {
+    "proc", "sysfs", "devpts", "cgroup", "cgroup2", "mqueue", "debugfs", "tracefs", "securityfs",
+    "pstore", "bpf", "configfs", "fusectl", "hugetlbfs", "autofs", "binfmt_misc", "rpc_pipefs",
+    "nsfs", "efivarfs", "selinuxfs", "ramfs", "squashfs", "overlay", "fuse.lxcfs",
+}
+_TCP_LISTEN = "0A"
+
+
+@dataclass(frozen=True)
+class Artifact:
+    rel: str  # bundle path the checks read
+    argv: Tuple[str, ...]
+    ok_codes: Tuple[int, ...] = (0,)
+    # Direct /proc-based equivalent, used when the command is missing, fails, or times out with no output.
+    fallback: Optional[Callable[[], str]] = None
+
+
+@dataclass(frozen=True)
+class Outcome:
+    rel: str
+    source: str  # command / proc / failed
+    seconds: float
+    bytes_written: int
+    detail: str = ""
+
+
+def _human(n: float) -> str:
+    # `df -h` style: 1024-based, rounded up, one decimal below 10.
+    for unit in ("", "K", "M", "G", "T"):
+        if n < 1024:
+            break
+        n /= 1024.0
+    else:
+        unit = "P"
+    if unit == "":
+        return f"{int(n)}"
+    return f"{math.ceil(n * 10) / 10:.1f}{unit}" if n < 10 else f"{math.ceil(n)}{unit}"
+
+
+def df_from_proc() -> str:
+    rows = [("Filesystem", "Size", "Used", "Avail", "Use%", "Mounted on")]
+    seen = set()
+    with open("/proc/mounts", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 3 or parts[2] in _PSEUDO_FS or parts[1] in seen:
+                continue
+            mount = parts[1].replace("\\040", " ")
+            try:
+                st = os.statvfs(mount)
+            except OSError:
+                continue
+            if st.f_blocks == 0:
+                continue
+            seen.add(parts[1])
+            size = st.f_blocks * st.f_frsize
+            used = (st.f_blocks - st.f_bfree) * st.f_frsize
+            avail = st.f_bavail * st.f_frsize
+            pct = math.ceil(100.0 * used / (used + avail)) if used + avail else 0
+            rows.append((parts[0], _human(size), _human(used), _human(avail), f"{pct}%", mount))
+    width = max(len(r[0]) for r in rows)
+    return "\n".join(f"{r[0]:<{width}} {r[1]:>5} {r[2]:>5} {r[3]:>5} {r[4]:>4} {r[5]}" for r in rows) + "\n"
+
+
+def _hex_addr(hex_addr: str) -> str:
+    # /proc/net/tcp stores addresses as host-order 32-bit words in hex.
+    raw = bytes.fromhex(hex_addr)
+    words = b"".join(raw[i : i + 4][::-1] for i in range(0, len(raw), 4))
+    if len(words) == 4:
+        return socket.inet_ntop(socket.AF_INET, words)
+    return "[" + socket.inet_ntop(socket.AF_INET6, words) + "]"
+
+
+def ss_from_proc() -> str:
+    # `ss -lntp` layout without the Process column (mapping sockets to PIDs needs a walk of /proc/*/fd).
+    lines = [f"{'State':<6} {'Recv-Q':<6} {'Send-Q':<6} {'Local Address:Port':<24} {'Peer Address:Port':<18} Process"]
+    for table, peer in (("/proc/net/tcp", "0.0.0.0:*"), ("/proc/net/tcp6", "[::]:*")):
+        try:
+            with open(table, encoding="ascii") as f:
+                next(f, None)
+                for line in f:
+                    parts = line.split()
+                    if len(parts) < 4 or parts[3] != _TCP_LISTEN:
+                        continue
+                    addr, port = parts[1].split(":")
+                    rx = int(parts[4].split(":")[1], 16)
+                    local = f"{_hex_addr(addr)}:{int(port, 16)}"
+                    lines.append(f"{'LISTEN':<6} {rx:<6} {0:<6} {local:<24} {peer:<18}")
+        except OSError:
+            continue
+    return "\n".join(lines) + "\n"
+
+
+ARTIFACTS: Tuple[Artifact, ...] = (
+    # -l: local filesystems only, so a hung network mount can't stall the collection.
+    Artifact("linux/df_h.txt", ("df", "-h", "-l"), fallback=df_from_proc),
+    Artifact("linux/ss_lntp.txt", ("ss", "-lntp"), fallback=ss_from_proc),
+    # Only units that are failing or restarting; `systemctl status` exits 3 when any listed unit is inactive.
+    Artifact(
+        "linux/systemctl_status.txt",
+        ("systemctl", "status", "--no-pager", "--full", "--lines=20", "--state=failed,activating"),
+        ok_codes=(0, 3),
+    ),
+    # Restart bookkeeping is logged by the service manager (PID 1), which keeps the export small.
+    Artifact("linux/journal.json", ("journalctl", "-o", "json", "--no-pager", "--since=-6h", "_PID=1")),
+)
+
+
+def open_output(path: Path, compress: bool) -> IO[bytes]:
+    if compress:
+        return gzip.open(path, "wb", compresslevel=6)  # type: ignore[return-value]
+    return path.open("wb")
+
+
+async def _run_command(art: Artifact, tmp: Path, compress: bool, timeout_s: float) -> Tuple[bool, int, str]:
+    # Streams stdout to `tmp` as it arrives; returns (ok, bytes written, detail).
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *art.argv,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env={**os.environ, "LC_ALL": "C", "SYSTEMD_COLORS": "0", "SYSTEMD_PAGER": ""},
+        )
+    except OSError as e:
+        return False, 0, f"{art.argv[0]}: {e.strerror or e}"
+
+    written = 0
+    assert proc.stdout is not None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s
+    timed_out = False
+    with open_output(tmp, compress) as out:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                timed_out = True
+                break
+            try:
+                chunk = await asyncio.wait_for(proc.stdout.read(READ_BYTES), remaining)
+            except asyncio.TimeoutError:
+                timed_out = True
+                break
+            if not chunk:
+                break
+            out.write(chunk)
+            written += len(chunk)
+
+    rc: Optional[int] = None
+    if not timed_out:
+        # A command can close stdout and keep running; its exit is still bounded by the same deadline.
+        try:
+            rc = await asyncio.wait_for(proc.wait(), max(deadline - loop.time(), 0.0))
+        except asyncio.TimeoutError:
+            timed_out = True
+    if timed_out:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass  # exited between the timeout and the kill
+        await proc.wait()
+        # Partial output is kept: the head of a journal export is still evidence.
+        return written > 0, written, f"timed out after {timeout_s:g}s"
+    if rc not in art.ok_codes:
+        return False, written, f"exit code {rc}"
+    return True, written, ""
+
+
+async def _collect_one(art: Artifact, out_dir: Path, compress: bool, timeout_s: float) -> Outcome:
+    started = time.monotonic()
+    final = out_dir / (art.rel + (".gz" if compress else ""))
+    final.parent.mkdir(parents=True, exist_ok=True)
+    tmp = final.with_name(f".{final.name}.tmp")
+
+    ok, written, detail = await _run_command(art, tmp, compress, timeout_s)
+    source = "command"
+    if not ok and art.fallback is not None:
+        try:
+            text = await asyncio.get_running_loop().run_in_executor(None, art.fallback)
+        except OSError as e:
+            detail = f"{detail}; /proc fallback failed: {e}"
+        else:
+            data = text.encode("utf-8")
+            with open_output(tmp, compress) as out:
+                out.write(data)
+            ok, written, source = True, len(data), "proc"
+
+    if not ok:
+        tmp.unlink(missing_ok=True)
+        return Outcome(art.rel, "failed", time.monotonic() - started, 0, detail)
+    os.replace(tmp, final)
+    return Outcome(art.rel, source, time.monotonic() - started, written, detail)
+
+
+async def collect_async(
+    out_dir: Path,
+    artifacts: Sequence[Artifact] = ARTIFACTS,
+    compress: bool = False,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+) -> List[Outcome]:
+    return list(await asyncio.gather(*(_collect_one(a, out_dir, compress, timeout_s) for a in artifacts)))
+
+
+def collect(out_dir: str, compress: bool = False, timeout_s: float = DEFAULT_TIMEOUT_S) -> List[Outcome]:
+    # Writes the same layout as fixtures/ (linux/df_h.txt, ...), so the bundle can be passed to `run --fixtures`.
+    return asyncio.run(collect_async(Path(out_dir), compress=compress, timeout_s=timeout_s))
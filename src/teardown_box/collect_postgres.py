@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from teardown_box.collect import Outcome, open_output
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_STATEMENT_TIMEOUT_S = 30.0
+STATEMENTS_LIMIT = 500
+
+# Column lists match the fixture CSVs the Postgres checks read.
+_STATEMENTS_SQL = """
+COPY (
+  SELECT queryid, calls, round({total}::numeric, 1) AS total_time_ms, round({mean}::numeric, 1) AS mean_time_ms,
+         rows, query
+  FROM pg_stat_statements
+  ORDER BY {total} DESC
+  LIMIT {limit}
+) TO STDOUT WITH (FORMAT csv, HEADER)
+"""
+
+_USER_TABLES_SQL = """
+COPY (
+  SELECT t.schemaname, t.relname, t.seq_scan, t.seq_tup_read, coalesce(t.idx_scan, 0) AS idx_scan,
+         t.n_tup_ins, t.n_tup_upd, t.n_tup_del, t.n_live_tup, t.n_dead_tup,
+         to_char(t.last_vacuum, 'YYYY-MM-DD HH24:MI:SS') AS last_vacuum,
+         to_char(t.last_autovacuum, 'YYYY-MM-DD HH24:MI:SS') AS last_autovacuum,
+         to_char(t.last_analyze, 'YYYY-MM-DD HH24:MI:SS') AS last_analyze,
+         to_char(t.last_autoanalyze, 'YYYY-MM-DD HH24:MI:SS') AS last_autoanalyze,
+         c.reltuples::bigint AS reltuples
+  FROM pg_stat_user_tables t
+  JOIN pg_class c ON c.oid = t.relid
+  ORDER BY t.seq_tup_read DESC
+) TO STDOUT WITH (FORMAT csv, HEADER)
+"""
+
+# Without a pooler in front, the closest server-side signal is backend usage against max_connections.
+_CONNECTIONS_SQL = """
+SELECT current_database(),
+       current_setting('max_connections')::int,
+       (SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend'),
+       (SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend' AND wait_event_type = 'Lock')
+"""
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str  # bundle subdirectory when collecting several instances
+    dsn: str
+
+
+def parse_target(spec: str) -> Target:
+    # "name=postgresql://..." or a bare URI / key=value DSN; the name defaults to host_port_dbname.
+    m = re.match(r"^([\w.-]+)=(postgres(?:ql)?://.+)$", spec)
+    if m is not None:
+        return Target(name=m.group(1), dsn=m.group(2))
+    try:
+        from psycopg.conninfo import conninfo_to_dict
+
+        parts = conninfo_to_dict(spec)
+    except Exception:
+        parts = {}
+    name = "_".join(str(parts.get(k)) for k in ("host", "port", "dbname") if parts.get(k)) or "postgres"
+    return Target(name=re.sub(r"[^\w.-]+", "_", name), dsn=spec)
+
+
+def statements_sql(server_version: int) -> str:
+    # pg_stat_statements renamed total_time/mean_time to total_exec_time/mean_exec_time in PostgreSQL 13.
+    pg13 = server_version >= 130000
+    return _STATEMENTS_SQL.format(
+        total="total_exec_time" if pg13 else "total_time",
+        mean="mean_exec_time" if pg13 else "mean_time",
+        limit=STATEMENTS_LIMIT,
+    )
+
+
+def _first_line(e: BaseException) -> str:
+    text = str(e).strip()
+    return text.splitlines()[0] if text else type(e).__name__
+
+
+async def _copy_to_file(conn: Any, sql: str, out_dir: Path, rel: str, compress: bool) -> Outcome:
+    # COPY ... TO STDOUT streams server-formatted CSV in chunks; rows never become Python objects.
+    started = time.monotonic()
+    final = out_dir / (rel + (".gz" if compress else ""))
+    final.parent.mkdir(parents=True, exist_ok=True)
+    tmp = final.with_name(f".{final.name}.tmp")
+    written = 0
+    try:
+        with open_output(tmp, compress) as out:
+            async with conn.cursor() as cur:
+                async with cur.copy(sql) as copy:
+                    async for data in copy:
+                        out.write(data)
+                        written += len(data)
+    except Exception as e:
+        tmp.unlink(missing_ok=True)
+        return Outcome(rel, "failed", time.monotonic() - started, 0, _first_line(e))
+    os.replace(tmp, final)
+    return Outcome(rel, "copy", time.monotonic() - started, written)
+
+
+async def _pool_stats(conn: Any, out_dir: Path, rel: str, compress: bool) -> Outcome:
+    started = time.monotonic()
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(_CONNECTIONS_SQL)
+            db, max_conn, clients, lock_waits = await cur.fetchone()
+    except Exception as e:
+        return Outcome(rel, "failed", time.monotonic() - started, 0, _first_line(e))
+    # Only what the server can see: the pooler's queue (current_waiting, avg_wait_ms) is unknown, not zero.
+    doc = {
+        "pooler": "postgres",
+        "db": db,
+        "max_connections": max_conn,
+        "current_clients": clients,
+        "current_waiting": None,
+        "avg_wait_ms": None,
+        "notes": f"Server-side backend usage from pg_stat_activity ({lock_waits} waiting on locks); pooler queue not visible.",
+    }
+    data = (json.dumps(doc, indent=2) + "\n").encode("utf-8")
+    final = out_dir / (rel + (".gz" if compress else ""))
+    final.parent.mkdir(parents=True, exist_ok=True)
+    tmp = final.with_name(f".{final.name}.tmp")
+    with open_output(tmp, compress) as out:
+        out.write(data)
+    os.replace(tmp, final)
+    return Outcome(rel, "query", time.monotonic() - started, len(data))
+
+
+async def _collect_target(
+    target: Target,
+    base: Path,
+    prefix: str,
+    limit: asyncio.Semaphore,
+    compress: bool,
+    statement_timeout_s: float,
+) -> List[Outcome]:
+    from psycopg_pool import AsyncConnectionPool
+
+    # One small pool per instance (one connection per artifact); `limit` bounds connections across all instances.
+    pool = AsyncConnectionPool(
+        target.dsn,
+        min_size=0,
+        max_size=3,
+        open=False,
+        kwargs={
+            "autocommit": True,
+            "application_name": "teardown-box-collect",
+            "options": f"-c statement_timeout={int(statement_timeout_s * 1000)}",
+        },
+    )
+    try:
+        await pool.open()
+
+        async def run(job: Any) -> Outcome:
+            async with limit:
+                async with pool.connection(timeout=statement_timeout_s) as conn:
+                    return await job(conn)
+
+        async def statements(conn: Any) -> Outcome:
+            sql = statements_sql(conn.info.server_version)
+            return await _copy_to_file(conn, sql, base, "postgres/pg_stat_statements.csv", compress)
+
+        async def user_tables(conn: Any) -> Outcome:
+            return await _copy_to_file(conn, _USER_TABLES_SQL, base, "postgres/pg_stat_user_tables.csv", compress)
+
+        async def pool_stats(conn: Any) -> Outcome:
+            return await _pool_stats(conn, base, "postgres/pg_pool_stats.json", compress)
+
+        results = await asyncio.gather(*(run(j) for j in (statements, user_tables, pool_stats)), return_exceptions=True)
+    finally:
+        await pool.close()
+
+    rels = ("postgres/pg_stat_statements.csv", "postgres/pg_stat_user_tables.csv", "postgres/pg_pool_stats.json")
+    out: List[Outcome] = []
+    for rel, r in zip(rels, results):
+        if isinstance(r, BaseException):
+            out.append(Outcome(prefix + rel, "failed", 0.0, 0, _first_line(r)))
+        else:
+            out.append(Outcome(prefix + r.rel, r.source, r.seconds, r.bytes_written, r.detail))
+    return out
+
+
+async def collect_postgres_async(
+    targets: Sequence[Target],
+    out_dir: Path,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    compress: bool = False,
+    statement_timeout_s: float = DEFAULT_STATEMENT_TIMEOUT_S,
+) -> List[Outcome]:
+    limit = asyncio.Semaphore(max_connections)
+    # A single target writes straight into out_dir; several targets get one bundle each (out_dir/<name>/postgres/...).
+    single = len(targets) == 1
+    per_target = await asyncio.gather(
+        *(
+            _collect_target(
+                t,
+                out_dir if single else out_dir / t.name,
+                "" if single else f"{t.name}/",
+                limit,
+                compress,
+                statement_timeout_s,
+            )
+            for t in targets
+        )
+    )
+    return [o for outcomes in per_target for o in outcomes]
+
+
+def collect_postgres(
+    specs: Sequence[str],
+    out_dir: str,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    compress: bool = False,
+    statement_timeout_s: float = DEFAULT_STATEMENT_TIMEOUT_S,
+) -> List[Outcome]:
+    if importlib.util.find_spec("psycopg") is None or importlib.util.find_spec("psycopg_pool") is None:
+        raise RuntimeError("collect-postgres needs psycopg 3 with the pool extra: pip install 'teardown-box[postgres]'")
+    targets: List[Target] = []
+    seen: Dict[str, int] = {}
+    for spec in specs:
+        t = parse_target(spec)
+        n = seen[t.name] = seen.get(t.name, 0) + 1
+        targets.append(t if n == 1 else Target(name=f"{t.name}_{n}", dsn=t.dsn))
+    return asyncio.run(
+        collect_postgres_async(targets, Path(out_dir), max_connections, compress, statement_timeout_s)
+    )
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional
+
+from teardown_box.findings import EvidenceRef, Finding, FixNow
+
+
+# Artifacts come from different hosts and tools (journal in µs, access logs bucketed per minute,
+# pooler snapshots), so intervals are padded by this much before they are joined.
+SLACK_S = 120.0
+# Events of one stream closer than this are coalesced into a single episode before the join.
+# The sweep then holds at most one open episode per stream, however many raw events there are.
+EPISODE_GAP_S = 300.0
+# An episode is closed once it spans this long, so a stream that errors all day is a series of bounded
+# episodes rather than one that overlaps everything else.
+MAX_EPISODE_S = 1800.0
+# Longest window an incident keeps accepting episodes for, measured from its first episode's start.
+MAX_INCIDENT_S = 3600.0
+MAX_EVIDENCE_PER_STREAM = 2
+# Composite findings kept per run, widest (most sources) and heaviest first.
+MAX_INCIDENTS = 5
+
+_start = attrgetter("start")
+
+
+@dataclass(frozen=True)
+class Event:
+    source: str  # artifact family: "systemd", "edge", "pool", ...
+    stream: str  # what happened, e.g. "api.service restarts"; episodes are built per stream
+    start: float  # epoch seconds, UTC
+    end: float
+    weight: int = 1  # restarts / errors / waiting clients the event stands for
+    evidence: Optional[EvidenceRef] = None
+
+
+@dataclass
+class Episode:
+    source: str
+    stream: str
+    start: float
+    end: float
+    weight: int = 0
+    events: int = 0
+    evidence: List[EvidenceRef] = field(default_factory=list)
+
+
+@dataclass
+class Incident:
+    start: float
+    end: float
+    episodes: List[Episode] = field(default_factory=list)
+
+    @property
+    def sources(self) -> List[str]:
+        return sorted({e.source for e in self.episodes})
+
+
+def episodes(
+    events: Iterable[Event],
+    gap_s: float = EPISODE_GAP_S,
+    max_span_s: float = MAX_EPISODE_S,
+) -> List[Episode]:
+    # Sort-merge per stream: bucket by stream, order each bucket by start, then one linear pass.
+    by_stream: Dict[str, List[Event]] = {}
+    for ev in events:
+        bucket = by_stream.get(ev.stream)
+        if bucket is None:
+            bucket = by_stream[ev.stream] = []
+        bucket.append(ev)
+
+    out: List[Episode] = []
+    for bucket in by_stream.values():
+        bucket.sort(key=_start)
+        cur: Optional[Episode] = None
+        for ev in bucket:
+            if cur is None or ev.start - cur.end > gap_s or ev.start - cur.start > max_span_s:
+                cur = Episode(source=ev.source, stream=ev.stream, start=ev.start, end=ev.end)
+                out.append(cur)
+            elif ev.end > cur.end:
+                cur.end = ev.end
+            cur.weight += ev.weight
+            cur.events += 1
+            if ev.evidence is not None:
+                if len(cur.evidence) < MAX_EVIDENCE_PER_STREAM:
+                    cur.evidence.append(ev.evidence)
+                else:
+                    # Keep the first and the latest reference: where it started and how far it ran.
+                    cur.evidence[-1] = ev.evidence
+    return out
+
+
+def incidents(
+    eps: Iterable[Episode],
+    slack_s: float = SLACK_S,
+    max_span_s: float = MAX_INCIDENT_S,
+) -> List[Incident]:
+    # Interval sweep over episodes ordered by start: an episode joins the open incident when its padded
+    # start falls before the incident's padded end. That end stops growing MAX_INCIDENT_S after the start;
+    # otherwise each overlap extends the window for the next and one busy stream chains a whole day into
+    # a single incident. Only incidents spanning two or more sources are kept.
+    out: List[Incident] = []
+    cur: Optional[Incident] = None
+    for ep in sorted(eps, key=_start):
+        if cur is not None and ep.start - slack_s <= min(cur.end, cur.start + max_span_s) + slack_s:
+            cur.episodes.append(ep)
+            if ep.end > cur.end:
+                cur.end = ep.end
+            continue
+        if cur is not None and len(cur.sources) > 1:
+            out.append(cur)
+        cur = Incident(start=ep.start, end=ep.end, episodes=[ep])
+    if cur is not None and len(cur.sources) > 1:
+        out.append(cur)
+    return out
+
+
+def _fmt_ts(ts: float, fmt: str = "%Y-%m-%d %H:%M") -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime(fmt)
+
+
+def _window(start: float, end: float) -> str:
+    if _fmt_ts(start, "%Y-%m-%d") == _fmt_ts(end, "%Y-%m-%d"):
+        return f"{_fmt_ts(start)}–{_fmt_ts(end, '%H:%M')}Z"
+    return f"{_fmt_ts(start)}Z–{_fmt_ts(end)}Z"
+
+
+def _headline(inc: Incident) -> List[Episode]:
+    # Heaviest episode per stream, ordered by when it started (earliest first reads as a timeline).
+    best: Dict[str, Episode] = {}
+    for ep in inc.episodes:
+        cur = best.get(ep.stream)
+        if cur is None or ep.weight > cur.weight:
+            best[ep.stream] = ep
+    return sorted(best.values(), key=lambda e: e.start)
+
+
+def to_finding(inc: Incident) -> Finding:
+    eps = _headline(inc)
+    streams = [ep.stream for ep in eps]
+    title = f"{streams[0]} coincide with {' and '.join(streams[1:])} ({_window(inc.start, inc.end)})"
+    evidence: List[EvidenceRef] = []
+    for ep in eps:
+        evidence.extend(ep.evidence)
+    return Finding(
+        category="Reliability",
+        severity="high" if len(inc.sources) >= 3 else "medium",
+        title=title,
+        subject="correlate:" + "+".join(sorted(streams)),
+        impact=(
+            "Symptoms from separate systems line up in time, which usually means one incident rather than several. "
+            "Fixing each symptom in isolation tends to miss the trigger (deploy, dependency failure, retry storm)."
+        ),
+        confidence="Medium",
+        effort="Medium",
+        blast_radius="High",
+        validate_safely="Line up the same window in dashboards and deploy history; time overlap alone does not prove cause.",
+        success_metric="The listed signals no longer co-occur; each one is explained by a single root cause.",
+        evidence=evidence,
+        fix_now=FixNow(
+            title="Build a single timeline for the window before touching any one component",
+            commands=[
+                f"# {ep.stream}: {_window(ep.start, ep.end)}, {ep.events} event(s), weight {ep.weight}"
+                for ep in eps
+            ]
+            + ["# Check deploys, config pushes and dependency incidents that start just before the earliest signal."],
+        ),
+        plan_7d=[
+            "Write an incident timeline for the window and identify which signal came first.",
+            "Fix the earliest failing component first; re-check whether the later symptoms disappear.",
+        ],
+        plan_30d=[
+            "Ship logs, journal and pooler metrics to one place with synchronized clocks (NTP) for cross-system views.",
+            "Alert on combined signals (e.g. restarts + 5xx) rather than each one alone.",
+        ],
+        questions=[
+            "Was there a deploy, config change or dependency incident in this window?",
+            "Which of these signals do you alert on today, and did anyone get paged?",
+        ],
+    )
+
+
+def correlate(events: Iterable[Event], max_incidents: int = MAX_INCIDENTS) -> List[Finding]:
+    found = incidents(episodes(events))
+    top = heapq.nlargest(max_incidents, found, key=lambda inc: (len(inc.sources), sum(e.weight for e in inc.episodes)))
+    return [to_finding(inc) for inc in top]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -10,6 +10,24 @@ class EvidenceRef:
     note: str
     line_start: Optional[int] = None
     line_end: Optional[int] = None
+    # Where line_start begins in the (decompressed) artifact, when the citing reader knows; the
+    # renderer then seeks there instead of reading every line before it.
+    byte_offset: Optional[int] = None
+
+    @classmethod
+    def for_spans(cls, path: str, note: str, spans: Iterable[Optional[Tuple[int, int, int]]]) -> List["EvidenceRef"]:
+        # One ref per run of adjacent rows, in file order, from (line_start, line_end, offset) spans such
+        # as fixtures.CsvRow.span; a single unranged ref when no span is known.
+        known = sorted({s for s in spans if s is not None})
+        if not known:
+            return [cls(path=path, note=note)]
+        runs: List[List[int]] = []
+        for start, end, offset in known:
+            if runs and start <= runs[-1][1] + 1:
+                runs[-1][1] = max(runs[-1][1], end)
+            else:
+                runs.append([start, end, offset])
+        return [cls(path=path, note=note, line_start=s, line_end=e, byte_offset=o) for s, e, o in runs]
 
     def format(self) -> str:
         if self.line_start is not None and self.line_end is not None:
@@ -17,6 +35,14 @@ class EvidenceRef:
         return f"{self.path} ({self.note})"
 
 
+@dataclass(frozen=True)
+class Metric:
+    # A number worth trending across runs (recorded by `run --history`), e.g. ("disk.used_pct", "/", 87).
+    name: str
+    subject: str
+    value: float
+
+
 @dataclass(frozen=True)
 class FixNow:
     title: str
@@ -41,6 +67,9 @@ class Finding:
     plan_7d: List[str] = field(default_factory=list)
     plan_30d: List[str] = field(default_factory=list)
     questions: List[str] = field(default_factory=list)
+    # Stable identity across runs, "<check name>:<kind or key>" (a port, unit, pool); set it when the title
+    # carries ranked names or counts. With the category it is the finding's baseline.fingerprint.
+    subject: Optional[str] = None
 
 
 def finding_sort_key(f: Finding) -> tuple:
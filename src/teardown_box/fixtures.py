@@ -1,21 +1,209 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import io
 import json
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import IO, Any, BinaryIO, Callable, Dict, Hashable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+from teardown_box.sampling import SampleInfo, Sampling, weighted_sample
+from teardown_box.sources import DirectorySource, FixtureSource
+
+T = TypeVar("T")
+
+# Bundles written with `collect --gzip` store "linux/journal.json" as "linux/journal.json.gz";
+# every accessor below falls back to the compressed name transparently.
+GZ_SUFFIX = ".gz"
+
+
+class _OwnedGzip(gzip.GzipFile):
+    # GzipFile(fileobj=...) leaves the underlying stream open on close; this one closes it too.
+
+    def __init__(self, raw: BinaryIO) -> None:
+        super().__init__(fileobj=raw, mode="rb")
+        self._raw = raw
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+class RowSpan(NamedTuple):
+    # Where a CSV row sits in its artifact, for evidence that cites exact rows.
+    line_start: int  # 1-based physical lines, inclusive; a quoted field with newlines spans several
+    line_end: int
+    offset: int  # byte offset of line_start in the stored (decompressed) content
+
+
+class CsvRow(Dict[str, str]):
+    # A csv.DictReader row that also knows its span.
+    span: Optional[RowSpan] = None
+
+
+def _csv_rows(stream: BinaryIO) -> Iterator[CsvRow]:
+    # csv.DictReader semantics (blank rows skipped, extra values under None, missing ones None). The
+    # reader pulls exactly the physical lines a record needs, so the bytes consumed before a record are
+    # its offset and reader.line_num is its last line: spans cost a counter per line.
+    consumed = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal consumed
+        for raw in stream:
+            consumed += len(raw)
+            yield raw.decode("utf-8")
+
+    reader = csv.reader(lines())
+    header = next(reader, None)
+    if header is None:
+        return
+    width = len(header)
+    while True:
+        offset, line_start = consumed, reader.line_num + 1
+        values = next(reader, None)
+        if values is None:
+            return
+        if not values:
+            continue
+        row = CsvRow(zip(header, values))
+        if len(values) > width:
+            row[None] = values[width:]  # type: ignore[index]
+        elif len(values) < width:
+            row.update(dict.fromkeys(header[len(values) :]))  # type: ignore[arg-type]
+        row.span = RowSpan(line_start, reader.line_num, offset)
+        yield row
+
+
+@dataclass
+class ReadStats:
+    # What a run pulled out of the bundle, per artifact; exported with `run --metrics-file`. Bytes are
+    # on-disk (compressed) bytes; readers that stop early or sample report what they actually read.
+    bytes_read: Dict[str, int] = field(default_factory=dict)
+    rows_read: Dict[str, int] = field(default_factory=dict)
+    # Fixtures.memo lookups by cache (the key, or its first element for tuple keys).
+    memo_hits: Dict[str, int] = field(default_factory=dict)
+    memo_misses: Dict[str, int] = field(default_factory=dict)
+    # Checks may share one Fixtures across threads (runner.run_all_checks_async).
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sent back from isolated workers; locks do not pickle.
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add(self, rel: str, nbytes: int = 0, rows: int = 0) -> None:
+        with self._lock:
+            if nbytes:
+                self.bytes_read[rel] = self.bytes_read.get(rel, 0) + nbytes
+            if rows:
+                self.rows_read[rel] = self.rows_read.get(rel, 0) + rows
+
+    def lookup(self, cache: str, hit: bool) -> None:
+        counts = self.memo_hits if hit else self.memo_misses
+        with self._lock:
+            counts[cache] = counts.get(cache, 0) + 1
+
+    def merge(self, other: "ReadStats") -> None:
+        for rel, n in other.bytes_read.items():
+            self.add(rel, nbytes=n)
+        for rel, n in other.rows_read.items():
+            self.add(rel, rows=n)
+        for mine, theirs in ((self.memo_hits, other.memo_hits), (self.memo_misses, other.memo_misses)):
+            for cache, n in theirs.items():
+                mine[cache] = mine.get(cache, 0) + n
 
 
 @dataclass(frozen=True)
 class Fixtures:
+    # A directory bundle by default; `source` swaps in an archive or in-memory artifacts (see
+    # teardown_box.sources), and `root` is then only a label.
     root: Path
+    # Per-run cache for derived structures shared between checks (indexes, parsed logs).
+    _memo: Dict[Hashable, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # One lock per memo key: concurrent checks wanting the same parse wait for a single build.
+    _memo_locks: Dict[Hashable, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _memo_guard: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    # Approximate mode for oversized inputs; readers that support it report what they sampled.
+    sampling: Optional[Sampling] = field(default=None, compare=False)
+    reads: ReadStats = field(default_factory=ReadStats, init=False, repr=False, compare=False)
+    source: FixtureSource = field(default=None, compare=False)  # type: ignore[assignment]
+
+    def __post_init__(self) -> None:
+        if self.source is None:
+            object.__setattr__(self, "source", DirectorySource(self.root))
+
+    @classmethod
+    def from_source(cls, source: FixtureSource, sampling: Optional[Sampling] = None) -> "Fixtures":
+        root = source.root if isinstance(source, DirectorySource) else Path(source.label)
+        return cls(root=root, sampling=sampling, source=source)
+
+    def _resolve(self, rel: str) -> Tuple[Optional[str], bool]:
+        # Stored name (possibly the .gz variant) and whether it is compressed.
+        if self.source.exists(rel):
+            return rel, False
+        if self.source.exists(rel + GZ_SUFFIX):
+            return rel + GZ_SUFFIX, True
+        return None, False
+
+    def open_raw(self, rel: str) -> Optional[Tuple[BinaryIO, bool, int]]:
+        # The stored bytes as a stream (still gzipped when compressed) and their size, for readers that
+        # decompress themselves and want to see compressed progress.
+        name, compressed = self._resolve(rel)
+        if name is None:
+            return None
+        size = self.source.size(name)
+        raw = self.source.open(name)
+        self.reads.add(rel, nbytes=size)
+        return raw, compressed, size
+
+    def _open_stream(self, rel: str) -> Optional[BinaryIO]:
+        opened = self.open_raw(rel)
+        if opened is None:
+            return None
+        raw, compressed, _ = opened
+        return _OwnedGzip(raw) if compressed else raw  # type: ignore[return-value]
+
+    def open_text(self, rel: str) -> Optional[IO[str]]:
+        stream = self._open_stream(rel)
+        if stream is None:
+            return None
+        return io.TextIOWrapper(stream, encoding="utf-8", newline="")  # type: ignore[arg-type]
+
+    def local_path(self, rel: str) -> Optional[Path]:
+        # A real file (possibly the .gz variant) for readers that split by offset across worker processes;
+        # None when the bundle is not a directory or the artifact is absent.
+        name, _ = self._resolve(rel)
+        return self.source.local_path(name) if name is not None else None
+
+    def path(self, rel: str) -> Path:
+        # Actual on-disk path (possibly the .gz variant), for readers that need a real file.
+        p = self.local_path(rel)
+        return p if p is not None else self.root / rel
 
     def read_text(self, rel: str) -> Optional[str]:
-        p = self.root / rel
-        if not p.exists():
+        name, compressed = self._resolve(rel)
+        if name is None:
+            return None
+        view = self.source.view(name)
+        if view is not None and not compressed:
+            # In-memory artifact: decode straight from the buffer, no intermediate bytes copy.
+            self.reads.add(rel, nbytes=view.nbytes)
+            txt = str(view, "utf-8")
+            return txt.replace("\r\n", "\n").replace("\r", "\n") if "\r" in txt else txt
+        stream = self._open_stream(rel)
+        if stream is None:
             return None
-        return p.read_text(encoding="utf-8")
+        with io.TextIOWrapper(stream, encoding="utf-8") as f:  # type: ignore[arg-type]
+            return f.read()
 
     def read_json(self, rel: str) -> Optional[Dict]:
         txt = self.read_text(rel)
@@ -23,13 +211,68 @@ class Fixtures:
             return None
         return json.loads(txt)
 
-    def read_csv_dicts(self, rel: str) -> Optional[List[Dict[str, str]]]:
-        p = self.root / rel
-        if not p.exists():
+    def read_csv_dicts(self, rel: str) -> Optional[List[CsvRow]]:
+        stream = self._open_stream(rel)
+        if stream is None:
             return None
-        with p.open("r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+        with stream:
+            rows = list(_csv_rows(stream))
+        self.reads.add(rel, rows=len(rows))
+        return rows
+
+    def sample_csv_dicts(self, rel: str, weight_col: str) -> Optional[Tuple[List[CsvRow], Optional[SampleInfo]]]:
+        # Like read_csv_dicts, but with --max-rows keeps at most that many rows, favouring heavy ones by
+        # `weight_col` (weighted reservoir). The SampleInfo is None when every row was kept.
+        max_rows = self.sampling.max_rows if self.sampling is not None else None
+        if max_rows is None:
+            rows = self.read_csv_dicts(rel)
+            return None if rows is None else (rows, None)
+        stream = self._open_stream(rel)
+        if stream is None:
+            return None
+
+        def weight(r: CsvRow) -> float:
+            try:
+                return float(r.get(weight_col) or 0)
+            except ValueError:
+                return 0.0
+
+        with stream:
+            rows, seen = weighted_sample(_csv_rows(stream), weight, max_rows, self.sampling.seed)  # type: ignore[union-attr]
+        self.reads.add(rel, rows=seen)
+        if seen <= max_rows:
+            return rows, None
+        return rows, SampleInfo(sampled=len(rows), population=seen, method="weighted reservoir")
+
+    def open_binary(self, rel: str) -> BinaryIO:
+        # For streaming readers; large logs/exports never have to fit in memory.
+        stream = self._open_stream(rel)
+        if stream is None:
+            raise FileNotFoundError(f"{self.source.label}: {rel}")
+        return stream
 
     def exists(self, rel: str) -> bool:
-        return (self.root / rel).exists()
+        return self._resolve(rel)[0] is not None
+
+    def names(self) -> List[str]:
+        # Every stored artifact, as named in the bundle (.gz suffixes kept).
+        return self.source.names()
+
+    def glob(self, pattern: str) -> List[str]:
+        found = set(self.source.glob(pattern))
+        found.update(name[: -len(GZ_SUFFIX)] for name in self.source.glob(pattern + GZ_SUFFIX))
+        return sorted(found)
+
+    def memo(self, key: Hashable, build: Callable[[], T]) -> T:
+        cache = str(key[0] if isinstance(key, tuple) and key else key)
+        if key in self._memo:
+            self.reads.lookup(cache, hit=True)
+            return self._memo[key]
+        with self._memo_guard:
+            lock = self._memo_locks.setdefault(key, threading.RLock())
+        with lock:
+            hit = key in self._memo
+            self.reads.lookup(cache, hit=hit)
+            if not hit:
+                self._memo[key] = build()
+        return self._memo[key]
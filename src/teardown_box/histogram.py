@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+def _geometric_bounds(lo: float, hi: float, growth: float) -> Tuple[float, ...]:
+    out: List[float] = []
+    b = lo
+    while b < hi:
+        out.append(round(b, 4))
+        b *= growth
+    out.append(hi)
+    return tuple(out)
+
+
+# ~10% wide buckets from 0.1 ms to 30 minutes. Fixed bounds keep histograms from
+# different chunks/workers mergeable by adding counts.
+BOUNDS_MS: Tuple[float, ...] = _geometric_bounds(0.1, 1_800_000.0, 1.1)
+
+
+@dataclass
+class LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(BOUNDS_MS) + 1))
+    total: int = 0
+    sum_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, ms: float, weight: int = 1) -> None:
+        self.counts[bisect_left(BOUNDS_MS, ms)] += weight
+        self.total += weight
+        self.sum_ms += ms * weight
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.total += other.total
+        self.sum_ms += other.sum_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation (conservative).
+        if self.total == 0:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                upper = BOUNDS_MS[i] if i < len(BOUNDS_MS) else self.max_ms
+                return min(upper, self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_ms / self.total if self.total else 0.0
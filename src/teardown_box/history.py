@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from teardown_box.baseline import fingerprint
+from teardown_box.runner import RunResult
+from teardown_box.sources import ARCHIVE_SUFFIXES
+
+# Timestamps are stored as fixed-width UTC ISO strings, so text comparison is time order.
+TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+  id INTEGER PRIMARY KEY,
+  host TEXT NOT NULL,
+  started_at TEXT NOT NULL,
+  fixtures_root TEXT NOT NULL,
+  n_findings INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_host_time ON runs (host, started_at);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS inputs (
+  run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+  path TEXT NOT NULL,
+  PRIMARY KEY (run_id, path)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS findings (
+  run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+  fp TEXT NOT NULL,
+  category TEXT NOT NULL,
+  severity TEXT NOT NULL,
+  title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id);
+CREATE INDEX IF NOT EXISTS findings_fp ON findings (fp, run_id);
+
+CREATE TABLE IF NOT EXISTS metrics (
+  run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+  name TEXT NOT NULL,
+  subject TEXT NOT NULL,
+  value REAL NOT NULL,
+  PRIMARY KEY (run_id, name, subject)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_name ON metrics (name, subject, run_id);
+"""
+
+# Optional filters are spliced in only when given: "(:host IS NULL OR host = :host)" would stop SQLite
+# from using the (host, started_at) index.
+_SERIES_SQL = """
+SELECT r.started_at, r.host, m.subject, m.value
+FROM runs r JOIN metrics m ON m.run_id = r.id AND m.name = :name
+WHERE r.started_at >= :since {filters}
+ORDER BY r.host, m.subject, r.started_at
+"""
+
+# Subjects of a metric (e.g. public ports) seen in the window on a host but absent from that host's
+# last run before the window; hosts first recorded inside the window report everything as new. The
+# window is aggregated once, then each (host, subject) costs two index probes.
+_NEW_SQL = """
+WITH win AS (
+  SELECT r.host, m.subject, min(r.started_at) AS first_seen
+  FROM runs r JOIN metrics m ON m.run_id = r.id AND m.name = :name
+  WHERE r.started_at >= :since {filters}
+  GROUP BY r.host, m.subject
+)
+SELECT w.host, w.subject, w.first_seen
+FROM win w
+WHERE NOT EXISTS (
+  SELECT 1 FROM metrics pm
+  WHERE pm.run_id = (
+      SELECT p.id FROM runs p WHERE p.host = w.host AND p.started_at < :since ORDER BY p.started_at DESC LIMIT 1
+    )
+    AND pm.name = :name AND pm.subject = w.subject
+)
+ORDER BY w.first_seen, w.host, w.subject
+"""
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def now_ts() -> str:
+    return datetime.now(timezone.utc).strftime(TS_FORMAT)
+
+
+def record_run(
+    db_path: str,
+    host: str,
+    fixtures_root: str,
+    res: RunResult,
+    started_at: Optional[str] = None,
+) -> int:
+    # One transaction per run: a report either lands with its inventory, findings and metrics, or not at all.
+    conn = connect(db_path)
+    try:
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO runs (host, started_at, fixtures_root, n_findings) VALUES (?, ?, ?, ?)",
+                (host, started_at or now_ts(), fixtures_root, len(res.findings)),
+            )
+            run_id = int(cur.lastrowid)
+            conn.executemany(
+                "INSERT OR IGNORE INTO inputs (run_id, path) VALUES (?, ?)",
+                ((run_id, p) for p in res.inputs_reviewed),
+            )
+            conn.executemany(
+                "INSERT INTO findings (run_id, fp, category, severity, title) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (run_id, fingerprint(f.category, f.title, f.subject), f.category, f.severity, f.title)
+                    for f in res.findings
+                ),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO metrics (run_id, name, subject, value) VALUES (?, ?, ?, ?)",
+                ((run_id, m.name, m.subject, m.value) for m in res.metrics),
+            )
+    finally:
+        conn.close()
+    return run_id
+
+
+def parse_since(value: str) -> str:
+    # "90d", "12h", "30m", or an ISO date/time (taken as UTC).
+    m = re.fullmatch(r"(\d+)([dhm])", value.strip())
+    if m is not None:
+        unit = {"d": "days", "h": "hours", "m": "minutes"}[m.group(2)]
+        start = datetime.now(timezone.utc) - timedelta(**{unit: int(m.group(1))})
+    else:
+        start = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+    return start.astimezone(timezone.utc).strftime(TS_FORMAT)
+
+
+def series(
+    conn: sqlite3.Connection,
+    name: str,
+    since: str,
+    host: Optional[str] = None,
+    subject: Optional[str] = None,
+) -> List[Tuple[str, str, str, float]]:
+    # (started_at, host, subject, value)
+    filters = ("AND r.host = :host " if host is not None else "") + ("AND m.subject = :subject" if subject is not None else "")
+    params = {"name": name, "since": since, "host": host, "subject": subject}
+    return [tuple(r) for r in conn.execute(_SERIES_SQL.format(filters=filters), params)]  # type: ignore[misc]
+
+
+def new_subjects(conn: sqlite3.Connection, name: str, since: str, host: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    # (host, subject, first_seen)
+    filters = "AND r.host = :host" if host is not None else ""
+    params = {"name": name, "since": since, "host": host}
+    return [tuple(r) for r in conn.execute(_NEW_SQL.format(filters=filters), params)]  # type: ignore[misc]
+
+
+def metric_names(conn: sqlite3.Connection) -> Sequence[str]:
+    return [r[0] for r in conn.execute("SELECT DISTINCT name FROM metrics ORDER BY name")]
+
+
+def default_host(fixtures_root: str) -> str:
+    # Bundles are usually one directory (or archive) per host (bundles/web-1/..., web-1.tgz), so its
+    # name is the best default.
+    name = Path(fixtures_root).resolve().name
+    for suffix in ARCHIVE_SUFFIXES:
+        if name.lower().endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return name or "localhost"
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import pickle
+import signal
+import time
+from dataclasses import dataclass, replace
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from teardown_box.findings import Finding
+from teardown_box.fixtures import Fixtures
+from teardown_box.runner import CheckOutput, CheckStat, _check_failed, check_name, run_check
+from teardown_box.sampling import Sampling
+from teardown_box.sources import FixtureSource, open_source
+
+
+@dataclass(frozen=True)
+class Limits:
+    memory_mb: int = 2048  # RLIMIT_AS per worker
+    cpu_s: int = 60  # RLIMIT_CPU per worker; SIGXCPU at the soft limit, SIGKILL one second later
+    wall_s: float = 120.0  # hard deadline, enforced by the parent
+
+
+def _apply_limits(limits: Limits) -> None:
+    try:
+        import resource
+    except ImportError:  # not POSIX: the wall-clock deadline still applies
+        return
+    mem = limits.memory_mb * 1024 * 1024
+    for res, soft, hard in (
+        (resource.RLIMIT_AS, mem, mem),
+        (resource.RLIMIT_CPU, limits.cpu_s, limits.cpu_s + 1),
+    ):
+        try:
+            resource.setrlimit(res, (soft, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def _worker(chk: Any, source: FixtureSource, limits: Limits, sampling: Optional[Sampling], conn: Connection) -> None:
+    if hasattr(os, "setpgid"):
+        os.setpgid(0, 0)  # its own process group, so _kill also reaches pools the check starts
+    _apply_limits(limits)
+    # A MemoryError from RLIMIT_AS is an ordinary exception here and comes back as a normal check failure.
+    fx = Fixtures.from_source(source, sampling=sampling)
+    out = replace(run_check(chk, fx), reads=fx.reads)
+    try:
+        payload = pickle.dumps(out, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        stat = replace(out.stat, failed=True) if out.stat is not None else None
+        failed = CheckOutput(findings=[_check_failed(chk, e)], events=[], stat=stat, reads=fx.reads)
+        payload = pickle.dumps(failed, protocol=pickle.HIGHEST_PROTOCOL)
+    conn.send_bytes(payload)
+    conn.close()
+
+
+def _describe_exit(code: Optional[int], limits: Limits) -> str:
+    if code is None or code >= 0:
+        return f"exited with status {code} without returning results"
+    sig = -code
+    if sig == signal.SIGXCPU:
+        return f"exceeded its {limits.cpu_s}s CPU limit"
+    if sig == signal.SIGKILL:
+        return f"was killed (SIGKILL; likely out of memory or over the {limits.cpu_s}s CPU limit)"
+    try:
+        name = signal.Signals(sig).name
+    except ValueError:
+        name = f"signal {sig}"
+    return f"crashed ({name})"
+
+
+def isolation_failed(chk: Any, reason: str) -> Finding:
+    # Same title as an in-process failure, so baselines and history treat both alike.
+    name = check_name(chk)
+    return Finding(
+        category="Reliability",
+        severity="low",
+        title=f"Check failed: {name}",
+        impact=f"The check's isolated worker {reason}; its findings are missing from this report.",
+        confidence="Low",
+        effort="Low",
+        blast_radius="Low",
+        evidence=[],
+        fix_now=None,
+        plan_7d=["Find the fixture that triggers it (oversized field, pathological input) and trim or fix the parser."],
+        plan_30d=["Add the offending fixture shape to the check's parser hardening."],
+        questions=["Was this bundle collected from an unusually large or unusual host?"],
+    )
+
+
+def _kill(proc: Any) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (AttributeError, OSError):  # no process groups here, or the worker had not set its own yet
+        proc.kill()
+    proc.join()
+
+
+def _lost(chk: Any, reason: str, started: float) -> CheckOutput:
+    stat = CheckStat(check_name(chk), time.monotonic() - started, True)
+    return CheckOutput(findings=[isolation_failed(chk, reason)], events=[], stat=stat)
+
+
+def run_checks_isolated(
+    checks: List[Any],
+    fixtures_root: Union[str, FixtureSource],
+    limits: Limits = Limits(),
+    workers: Optional[int] = None,
+    sampling: Optional[Sampling] = None,
+) -> List[CheckOutput]:
+    # One short-lived worker per check, at most `workers` at a time. Workers are forked, so checks (and
+    # in-memory sources) need not be picklable, and each one reads fixtures itself (memoized parses are
+    # not shared).
+    source = open_source(fixtures_root)
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    n = max(1, workers or os.cpu_count() or 1)
+    pending = list(enumerate(checks))
+    pending.reverse()
+    running: Dict[Connection, Tuple[int, Any, Any, float]] = {}  # conn -> (index, check, process, started)
+    results: List[Optional[CheckOutput]] = [None] * len(checks)
+
+    try:
+        while pending or running:
+            while pending and len(running) < n:
+                i, chk = pending.pop()
+                recv, send = ctx.Pipe(duplex=False)
+                # Not daemonic: checks may start their own worker pools (parallel.map_chunks), which daemonic
+                # processes cannot. The deadline below and the finally clause still reap every worker.
+                proc = ctx.Process(target=_worker, args=(chk, source, limits, sampling, send))
+                proc.start()
+                send.close()
+                running[recv] = (i, chk, proc, time.monotonic())
+
+            timeout = max(0.0, min(started for *_, started in running.values()) + limits.wall_s - time.monotonic())
+            for conn in wait(list(running), timeout):
+                i, chk, proc, started = running.pop(conn)  # type: ignore[index]
+                try:
+                    data = conn.recv_bytes()
+                except (EOFError, OSError):
+                    data = b""
+                conn.close()
+                proc.join()
+                if data:
+                    results[i] = pickle.loads(data)
+                else:
+                    results[i] = _lost(chk, _describe_exit(proc.exitcode, limits), started)
+
+            now = time.monotonic()
+            for conn, (i, chk, proc, started) in list(running.items()):
+                if now >= started + limits.wall_s:
+                    _kill(proc)
+                    conn.close()
+                    del running[conn]
+                    reason = f"was killed at the {limits.wall_s:g}s deadline"
+                    results[i] = _lost(chk, reason, started)
+    finally:
+        # Interrupted (or an error): don't leave non-daemonic workers for interpreter exit to wait on.
+        for conn, (_, _, proc, _) in running.items():
+            _kill(proc)
+            conn.close()
+
+    return [r if r is not None else CheckOutput(findings=[], events=[]) for r in results]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Pattern, Tuple, TypeVar
+
+R = TypeVar("R")
+
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+def split_chunks(
+    path: Path,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    record_start: Optional[Pattern[bytes]] = None,
+) -> List[Tuple[int, int]]:
+    # Chunks are [start, end) byte ranges that begin on a record boundary. Without
+    # `record_start` every line is a record; with it, a chunk starts at the first
+    # line matching the pattern so multi-line records stay inside one chunk.
+    size = path.stat().st_size
+    if size == 0:
+        return []
+
+    offsets = [0]
+    with path.open("rb") as f:
+        target = chunk_bytes
+        while target < size:
+            f.seek(target)
+            f.readline()
+            pos = f.tell()
+            if record_start is not None:
+                while pos < size:
+                    line = f.readline()
+                    if record_start.match(line):
+                        break
+                    pos = f.tell()
+            if pos >= size:
+                break
+            offsets.append(pos)
+            target = pos + chunk_bytes
+    offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+
+def map_chunks(
+    fn: Callable[[str, int, int], R],
+    path: Path,
+    chunks: List[Tuple[int, int]],
+    workers: Optional[int] = None,
+) -> List[R]:
+    # `fn` must be a module-level function so it can be pickled into workers.
+    n = min(workers or os.cpu_count() or 1, len(chunks))
+    if n <= 1:
+        return [fn(str(path), start, end) for start, end in chunks]
+    with ProcessPoolExecutor(max_workers=n) as ex:
+        return list(ex.map(fn, [str(path)] * len(chunks), [c[0] for c in chunks], [c[1] for c in chunks]))
+
+
+def read_range(path: str, start: int, end: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import gzip
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from teardown_box.histogram import LatencyHistogram
+from teardown_box.parallel import DEFAULT_CHUNK_BYTES, map_chunks, read_range, split_chunks
+from teardown_box.sampling import SampleInfo, Sampling
+
+
+# Expects the combined format extended with timing fields, e.g.
+#   log_format timed '$remote_addr - $remote_user [$time_local] "$request" $status '
+#                    '$body_bytes_sent "$http_referer" "$http_user_agent" '
+#                    'rt=$request_time urt="$upstream_response_time"';
+# Lines that don't match are counted as unparsed rather than failing the run.
+_LINE_RE = re.compile(
+    rb'^\S+ \S+ \S+ \[(?P<time>[^\]\n]+)\] "(?P<method>[A-Z]+) (?P<uri>[^ "?\n]+)[^"\n]*" (?P<status>\d{3}) '
+    rb'[^\n]*?\brt=(?P<rt>[\d.]+)'
+    rb'(?:[^\n]*?\burt=(?:"(?P<urtq>[^"\n]*)"|(?P<urt>[^\s"]+)))?',
+    re.MULTILINE,
+)
+_UPSTREAM_SPLIT = re.compile(rb"\s*[,:]\s*")
+_ID_SEGMENT = re.compile(rb"^(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{16,}|[A-Za-z0-9_-]{24,})$")
+
+# Bounds route cardinality per chunk (and after merging) so unnormalized URIs can't blow up memory.
+MAX_ROUTES = 2000
+OTHER_ROUTE = "(other)"
+
+# Sampling mode reads one window per stratum. Logs are time-ordered, so strata spread the sample over
+# the whole period instead of its head; windows are kept large enough that per-read overhead stays small.
+SAMPLE_STRATA = 256
+MIN_WINDOW_BYTES = 64 * 1024
+GZIP_SAMPLE_BLOCK = 1024 * 1024
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    status_5xx: int = 0
+    status_504: int = 0
+    request_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+    upstream_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def merge(self, other: "RouteStats") -> None:
+        self.requests += other.requests
+        self.status_5xx += other.status_5xx
+        self.status_504 += other.status_504
+        self.request_ms.merge(other.request_ms)
+        self.upstream_ms.merge(other.upstream_ms)
+
+
+@dataclass
+class AccessLogSummary:
+    routes: Dict[str, RouteStats] = field(default_factory=dict)
+    lines: int = 0
+    unparsed: int = 0
+    bytes_read: int = 0
+    # Size of the input the summary stands for; larger than bytes_read when only a sample was parsed.
+    bytes_total: int = 0
+    sampled: bool = False
+    # Epoch minute -> request / 5xx counts, for lining the log up with other artifacts.
+    requests_by_minute: Dict[int, int] = field(default_factory=dict)
+    errors_by_minute: Dict[int, int] = field(default_factory=dict)
+
+    def merge(self, other: "AccessLogSummary") -> None:
+        self.lines += other.lines
+        self.unparsed += other.unparsed
+        self.bytes_read += other.bytes_read
+        self.bytes_total += other.bytes_total
+        self.sampled = self.sampled or other.sampled
+        for route, st in other.routes.items():
+            _route_slot(self.routes, route).merge(st)
+        for mine, theirs in ((self.requests_by_minute, other.requests_by_minute), (self.errors_by_minute, other.errors_by_minute)):
+            for minute, n in theirs.items():
+                mine[minute] = mine.get(minute, 0) + n
+
+    @property
+    def requests(self) -> int:
+        return sum(st.requests for st in self.routes.values())
+
+    @property
+    def scale(self) -> float:
+        # Multiply sampled counts by this to estimate counts for the whole input.
+        if not self.sampled or not self.bytes_read:
+            return 1.0
+        return self.bytes_total / self.bytes_read
+
+    def sample_info(self) -> Optional[SampleInfo]:
+        if not self.sampled:
+            return None
+        return SampleInfo(sampled=self.lines, population=int(self.lines * self.scale), method="stratified")
+
+
+def _route_slot(routes: Dict[str, RouteStats], route: str) -> RouteStats:
+    st = routes.get(route)
+    if st is None:
+        if len(routes) >= MAX_ROUTES:
+            route = OTHER_ROUTE
+            st = routes.get(route)
+        if st is None:
+            st = routes[route] = RouteStats()
+    return st
+
+
+def normalize_route(uri: bytes) -> str:
+    segs = [b":id" if _ID_SEGMENT.match(s) else s for s in uri.split(b"/")]
+    return b"/".join(segs).decode("latin-1") or "/"
+
+
+def _upstream_ms(raw: Optional[bytes]) -> Optional[float]:
+    # Multiple upstreams (retries/internal redirects) are logged as "0.5, 0.7" or "0.5 : 0.7".
+    if not raw:
+        return None
+    total = 0.0
+    seen = False
+    for part in _UPSTREAM_SPLIT.split(raw.strip()):
+        if part and part != b"-":
+            try:
+                total += float(part)
+            except ValueError:
+                continue
+            seen = True
+    return total * 1000.0 if seen else None
+
+
+def _minute_of(time_local: bytes) -> Optional[int]:
+    # "05/Jan/2026:07:30:00 -0800" -> epoch seconds of the minute, UTC.
+    try:
+        dt = datetime.strptime(time_local[:17].decode("ascii") + time_local[20:].decode("ascii"), "%d/%b/%Y:%H:%M %z")
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return int(dt.timestamp())
+
+
+def parse_chunk(path: str, start: int, end: int) -> AccessLogSummary:
+    return parse_bytes(read_range(path, start, end))
+
+
+def parse_bytes(data: bytes) -> AccessLogSummary:
+    out = AccessLogSummary(bytes_read=len(data), bytes_total=len(data))
+    routes = out.routes
+    route_cache: Dict[bytes, str] = {}
+    # Keyed by the "dd/Mon/yyyy:HH:MM" prefix plus zone, so strptime runs once per minute, not per line.
+    minute_cache: Dict[bytes, Optional[int]] = {}
+    requests_by_minute = out.requests_by_minute
+    errors_by_minute = out.errors_by_minute
+    parsed = 0
+
+    for m in _LINE_RE.finditer(data):
+        try:
+            request_ms = float(m.group("rt")) * 1000.0
+        except ValueError:  # "rt=1.2.3": the pattern only pins the characters; left in out.unparsed
+            continue
+        parsed += 1
+        uri = m.group("uri")
+        route = route_cache.get(uri)
+        if route is None:
+            route = normalize_route(uri)
+            if len(route_cache) < 4 * MAX_ROUTES:
+                route_cache[uri] = route
+        st = _route_slot(routes, route)
+
+        ts = m.group("time")
+        minute_key = ts[:17] + ts[20:]
+        if minute_key in minute_cache:
+            minute = minute_cache[minute_key]
+        else:
+            minute = minute_cache[minute_key] = _minute_of(ts)
+        if minute is not None:
+            requests_by_minute[minute] = requests_by_minute.get(minute, 0) + 1
+
+        st.requests += 1
+        status = m.group("status")
+        if status[0:1] == b"5":
+            st.status_5xx += 1
+            if minute is not None:
+                errors_by_minute[minute] = errors_by_minute.get(minute, 0) + 1
+            if status == b"504":
+                st.status_504 += 1
+        st.request_ms.add(request_ms)
+        up = _upstream_ms(m.group("urtq") or m.group("urt"))
+        if up is not None:
+            st.upstream_ms.add(up)
+
+    out.lines = data.count(b"\n") + (0 if data.endswith(b"\n") or not data else 1)
+    out.unparsed = max(out.lines - parsed, 0)
+    return out
+
+
+def parse_window(path: str, start: int, end: int) -> AccessLogSummary:
+    # A sampling window snapped to whole lines: a partial first line is skipped, the last one completed.
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            if f.read(1) != b"\n":
+                f.readline()
+        begin = f.tell()
+        data = f.read(max(end - begin, 0))
+        if data and not data.endswith(b"\n"):
+            data += f.readline()
+    return parse_bytes(data)
+
+
+def _windows(size: int, fraction: float, seed: int) -> List[Tuple[int, int]]:
+    rng = random.Random(seed)
+    strata = max(1, min(SAMPLE_STRATA, int(size * fraction // MIN_WINDOW_BYTES)))
+    out: List[Tuple[int, int]] = []
+    for i in range(strata):
+        lo, hi = i * size // strata, (i + 1) * size // strata
+        width = max(1, int((hi - lo) * fraction))
+        start = lo + rng.randrange(0, hi - lo - width + 1)
+        out.append((start, start + width))
+    return out
+
+
+def _estimate_rows(path: Path, size: int) -> float:
+    with path.open("rb") as f:
+        head = f.read(MIN_WINDOW_BYTES)
+    lines = head.count(b"\n")
+    return size * lines / len(head) if lines else 0.0
+
+
+def _analyze_sampled(path: Path, sampling: Sampling, workers: Optional[int]) -> Optional[AccessLogSummary]:
+    size = path.stat().st_size
+    fraction = sampling.fraction_for(_estimate_rows(path, size))
+    if fraction >= 1.0 or size == 0:
+        return None
+    summary = AccessLogSummary()
+    windows = _windows(size, fraction, sampling.seed)
+    for part in map_chunks(parse_window, path, windows, workers):
+        summary.merge(part)
+    summary.bytes_total = size
+    summary.sampled = True
+    return summary
+
+
+def analyze_stream(
+    raw: BinaryIO,
+    size: int,
+    compressed: bool,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    sampling: Optional[Sampling] = None,
+) -> AccessLogSummary:
+    # Sequential parse of whole-line blocks, for logs that can't be split by offset: gzipped ones, and
+    # ones that are not a local file (archive members, in-memory artifacts). `size` is the stored size;
+    # `raw` is closed on return.
+    # When sampling, everything is still read but only a random subset of blocks is parsed.
+    summary = AccessLogSummary()
+    rng = random.Random(sampling.seed) if sampling is not None else None
+    fraction = 1.0
+    first = True
+    if sampling is not None:
+        chunk_bytes = min(chunk_bytes, GZIP_SAMPLE_BLOCK)
+    carry = b""
+    f: BinaryIO = gzip.GzipFile(fileobj=raw, mode="rb") if compressed else raw  # type: ignore[assignment]
+    with raw, f:
+        while True:
+            block = f.read(chunk_bytes)
+            data = carry + block
+            if block:
+                cut = data.rfind(b"\n") + 1
+                data, carry = data[:cut], data[cut:]
+            if data:
+                if first or rng is None or rng.random() < fraction:
+                    summary.merge(parse_bytes(data))
+                else:
+                    summary.bytes_total += len(data)
+                    summary.sampled = True
+                if first and sampling is not None:
+                    # Size up the whole file from the first block's compression ratio and line length.
+                    ratio = summary.bytes_total / max(raw.tell(), 1)
+                    rows = summary.lines * (size * ratio) / max(summary.bytes_total, 1)
+                    fraction = sampling.fraction_for(rows)
+                first = False
+            if not block:
+                return summary
+
+
+def _analyze_gzip(path: Path, chunk_bytes: int, sampling: Optional[Sampling] = None) -> AccessLogSummary:
+    with path.open("rb") as raw:
+        return analyze_stream(raw, path.stat().st_size, True, chunk_bytes, sampling)
+
+
+def analyze(
+    path: Path,
+    workers: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    sampling: Optional[Sampling] = None,
+) -> AccessLogSummary:
+    if path.suffix == ".gz":
+        return _analyze_gzip(path, chunk_bytes, sampling)
+    if sampling is not None:
+        sampled = _analyze_sampled(path, sampling, workers)
+        if sampled is not None:
+            return sampled
+    summary = AccessLogSummary()
+    for part in map_chunks(parse_chunk, path, split_chunks(path, chunk_bytes), workers):
+        summary.merge(part)
+    return summary
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+# Only records carrying one of these markers are JSON-decoded. Markers are located
+# with bytes.find over large blocks, so the bulk of a `journalctl -o json` export
+# is never touched line by line.
+_MARKERS = (b"Scheduled restart job", b"Failed with result", b"Start request repeated too quickly")
+BLOCK_BYTES = 8 * 1024 * 1024
+
+_COUNTER_RE = re.compile(r"restart counter is at (\d+)", re.IGNORECASE)
+_UNIT_PREFIX_RE = re.compile(r"^([\w@.\\:-]+\.(?:service|socket|timer|mount|scope)): ")
+_SCHEDULED_RE = re.compile(r"([\w@.\\:-]+\.service): Scheduled restart job")
+
+UNKNOWN_UNIT = "<unit>"
+
+FLAP_WINDOW_S = 600.0      # sliding window for the restart-rate peak
+WINDOW_GAP_S = 300.0       # restarts further apart than this start a new flap window
+MAX_TRACKED_RESTARTS = 256  # per-unit bound on timestamps held for the sliding window
+MAX_WINDOWS_KEPT = 3
+
+
+@dataclass
+class FlapWindow:
+    start: float
+    end: float
+    restarts: int
+
+
+@dataclass
+class UnitRestarts:
+    unit: str
+    restarts: int = 0
+    failures: int = 0
+    start_limit_hit: bool = False
+    max_counter: int = 0
+    first_ts: Optional[float] = None
+    last_ts: Optional[float] = None
+    last_line: Optional[int] = None
+    last_failure: Optional[str] = None
+    peak_in_window: int = 0
+    peak_window_start: Optional[float] = None
+    windows: int = 0
+    top_windows: List[FlapWindow] = field(default_factory=list)
+    _recent: Deque[float] = field(default_factory=lambda: deque(maxlen=MAX_TRACKED_RESTARTS), repr=False)
+    _current: Optional[FlapWindow] = field(default=None, repr=False)
+
+    def add_restart(self, ts: float, counter: Optional[int], line_no: int) -> None:
+        self.restarts += 1
+        self.last_line = line_no
+        if counter is not None and counter > self.max_counter:
+            self.max_counter = counter
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+
+        # Sliding-window peak (journal exports are time ordered).
+        recent = self._recent
+        recent.append(ts)
+        while recent and ts - recent[0] > FLAP_WINDOW_S:
+            recent.popleft()
+        if len(recent) > self.peak_in_window:
+            self.peak_in_window = len(recent)
+            self.peak_window_start = recent[0]
+
+        cur = self._current
+        if cur is not None and ts - cur.end <= WINDOW_GAP_S:
+            cur.end = ts
+            cur.restarts += 1
+        else:
+            self._close_window()
+            self._current = FlapWindow(start=ts, end=ts, restarts=1)
+            self.windows += 1
+
+    def _close_window(self) -> None:
+        cur = self._current
+        if cur is None:
+            return
+        self.top_windows.append(cur)
+        self.top_windows.sort(key=lambda w: w.restarts, reverse=True)
+        del self.top_windows[MAX_WINDOWS_KEPT:]
+        self._current = None
+
+    def finish(self) -> None:
+        self._close_window()
+
+
+def _unit_of(rec: Dict[str, object], message: str) -> Optional[str]:
+    for key in ("UNIT", "USER_UNIT", "_SYSTEMD_UNIT"):
+        v = rec.get(key)
+        if isinstance(v, str) and v and v != "init.scope":
+            return v
+    m = _UNIT_PREFIX_RE.match(message)
+    return m.group(1) if m else None
+
+
+def _message(rec: Dict[str, object]) -> str:
+    msg = rec.get("MESSAGE")
+    if isinstance(msg, list):
+        # Non-UTF-8 messages are exported as byte arrays.
+        return bytes(int(b) for b in msg if isinstance(b, int)).decode("utf-8", "replace")
+    return msg if isinstance(msg, str) else ""
+
+
+def _marked_lines(f: BinaryIO, block_bytes: int) -> Iterator[Tuple[int, bytes]]:
+    line_no = 1  # line number of data[0]
+    carry = b""
+    while True:
+        block = f.read(block_bytes)
+        data = carry + block
+        if block:
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data
+                continue
+            data, carry = data[:cut], data[cut:]
+
+        starts = set()
+        for marker in _MARKERS:
+            p = data.find(marker)
+            while p != -1:
+                starts.add(data.rfind(b"\n", 0, p) + 1)
+                p = data.find(marker, p + len(marker))
+
+        pos = 0
+        for start in sorted(starts):
+            line_no += data.count(b"\n", pos, start)
+            pos = start
+            end = data.find(b"\n", start)
+            yield line_no, data[start : end if end != -1 else len(data)]
+        line_no += data.count(b"\n", pos)
+
+        if not block:
+            return
+
+
+def analyze(f: BinaryIO, block_bytes: int = BLOCK_BYTES) -> Dict[str, UnitRestarts]:
+    units: Dict[str, UnitRestarts] = {}
+    for line_no, raw in _marked_lines(f, block_bytes):
+        try:
+            rec = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(rec, dict):
+            continue
+
+        msg = _message(rec)
+        unit = _unit_of(rec, msg)
+        if unit is None:
+            continue
+        try:
+            ts = int(rec.get("__REALTIME_TIMESTAMP", 0)) / 1_000_000.0
+        except (TypeError, ValueError):
+            ts = 0.0
+
+        st = units.get(unit)
+        if st is None:
+            st = units[unit] = UnitRestarts(unit=unit)
+
+        if "Scheduled restart job" in msg:
+            m = _COUNTER_RE.search(msg)
+            st.add_restart(ts, int(m.group(1)) if m else None, line_no)
+        elif "Start request repeated too quickly" in msg:
+            st.start_limit_hit = True
+            st.last_line = line_no
+        else:
+            st.failures += 1
+            st.last_failure = msg.split(": ", 1)[-1].strip()
+
+    for st in units.values():
+        st.finish()
+    return units
+
+
+@dataclass
+class StatusUnit:
+    unit: str
+    counter: Optional[int] = None
+    counter_line: Optional[int] = None
+    auto_restart: bool = False
+
+
+class StatusUnitsVisitor:
+    # `systemctl status` output may cover several units; each starts with a "● name - description" header.
+    # Fed line by line (see teardown_box.scan), so the status dump is never held in memory.
+
+    def __init__(self) -> None:
+        self.units: Dict[str, StatusUnit] = {}
+        self.current: Optional[str] = None
+
+    def feed(self, idx: int, line: str) -> None:
+        out = self.units
+        stripped = line.strip()
+        if stripped[:1] in ("●", "×", "○", "↻") and " " in stripped:
+            self.current = stripped[1:].strip().split(" ", 1)[0]
+            out.setdefault(self.current, StatusUnit(unit=self.current))
+            return
+
+        m = _COUNTER_RE.search(line)
+        if m is not None:
+            um = _SCHEDULED_RE.search(line)
+            unit = um.group(1) if um else (self.current or UNKNOWN_UNIT)
+            st = out.setdefault(unit, StatusUnit(unit=unit))
+            n = int(m.group(1))
+            if st.counter is None or n >= st.counter:
+                st.counter = n
+                st.counter_line = idx
+            return
+
+        if "auto-restart" in line.lower():
+            unit = self.current or UNKNOWN_UNIT
+            out.setdefault(unit, StatusUnit(unit=unit)).auto_restart = True
+
+    def result(self) -> Dict[str, StatusUnit]:
+        return self.units
+
+
+def status_units(text: str) -> Dict[str, StatusUnit]:
+    v = StatusUnitsVisitor()
+    for idx, line in enumerate(text.splitlines(), start=1):
+        v.feed(idx, line)
+    return v.result()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator
+
+BLOCK_BYTES = 1024 * 1024
+
+_STRUCT_RE = re.compile(r'["{}\[\],]')
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SKIP_RE = re.compile(r"[\s,]*")
+_COLON_RE = re.compile(r"\s*:\s*")
+
+
+class _Buffer:
+    def __init__(self, f: BinaryIO, block_bytes: int) -> None:
+        self.f = f
+        self.block_bytes = block_bytes
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.eof = False
+
+    def fill(self, consumed: int) -> bool:
+        # Drops everything before `consumed` and appends the next block; positions restart at 0.
+        if self.eof:
+            return False
+        chunk = self.f.read(self.block_bytes)
+        self.buf = self.buf[consumed:] + self.decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self.eof = True
+        return True
+
+
+def iter_top_level_array(f: BinaryIO, key: str, block_bytes: int = BLOCK_BYTES) -> Iterator[Any]:
+    # Yields the items of the array stored under `key` in the top-level object,
+    # holding at most one block plus the current item in memory.
+    try:
+        import ijson  # type: ignore
+
+        yield from ijson.items(f, f"{key}.item", use_float=True)
+        return
+    except ImportError:
+        pass
+
+    b = _Buffer(f, block_bytes)
+    pos = 0
+    depth = 0
+    key_next = False
+    found = False
+
+    # Phase 1: skip to the `[` opening the target array.
+    while not found:
+        m = _STRUCT_RE.search(b.buf, pos)
+        if m is None:
+            if not b.fill(len(b.buf)):
+                return
+            pos = 0
+            continue
+        c = m.group()
+        p = m.start()
+        if c == '"':
+            sm = _STRING_RE.match(b.buf, p)
+            if sm is None or sm.end() == len(b.buf):
+                if not b.fill(p):
+                    return
+                pos = 0
+                continue
+            if depth == 1 and key_next:
+                key_next = False
+                if json.loads(sm.group()) == key:
+                    found = True
+            pos = sm.end()
+            continue
+        if c in "{[":
+            depth += 1
+            key_next = depth == 1 and c == "{"
+        elif c in "}]":
+            depth -= 1
+        elif c == "," and depth == 1:
+            key_next = True
+        pos = p + 1
+
+    # The value after the key: only an array yields anything.
+    while True:
+        m = _COLON_RE.match(b.buf, pos)
+        if m is not None and m.end() < len(b.buf):
+            if b.buf[m.end()] != "[":
+                return
+            pos = m.end() + 1
+            break
+        if not b.fill(pos):
+            return
+        pos = 0
+
+    # Phase 2: decode one item at a time.
+    decoder = json.JSONDecoder()
+    while True:
+        pos = _SKIP_RE.match(b.buf, pos).end()  # type: ignore[union-attr]
+        if pos >= len(b.buf):
+            if not b.fill(pos):
+                raise ValueError(f"unterminated {key!r} array")
+            pos = 0
+            continue
+        if b.buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(b.buf, pos)
+        except json.JSONDecodeError:
+            # Item spans past the buffer: grow geometrically so huge items aren't re-decoded per block.
+            target = 2 * (len(b.buf) - pos)
+            grew = False
+            while len(b.buf) - pos < target and b.fill(pos):
+                pos = 0
+                grew = True
+            if not grew:
+                raise
+            continue
+        yield item
+        pos = end
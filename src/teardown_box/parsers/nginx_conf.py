@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from hashlib import sha256
+from posixpath import dirname, join, normpath
+from typing import Dict, List, Optional, Tuple
+
+from teardown_box.fixtures import Fixtures
+
+
+TIMEOUT_DIRECTIVES = ("proxy_connect_timeout", "proxy_send_timeout", "proxy_read_timeout")
+DEFAULT_PROXY_TIMEOUT = "60s"
+
+# Blocks whose directives are inherited by nested proxied locations.
+_INHERITING_BLOCKS = {"http", "server", "location"}
+
+_MAX_INCLUDE_DEPTH = 16
+_AST_CACHE_MAX = 4096
+
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<ws>\s+)
+    | (?P<comment>\#[^\n]*)
+    | (?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    | (?P<punct>[;{}])
+    | (?P<word>(?:\$\{[^}\s]*\}|\\.|[^\s;{}"'\\\#])(?:\$\{[^}\s]*\}|\\.|[^\s;{}\\])*)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class NginxParseError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Directive:
+    name: str
+    args: Tuple[str, ...]
+    path: str
+    line: int
+    end_line: int
+    block: Optional[Tuple["Directive", ...]] = None
+
+
+@dataclass(frozen=True)
+class Setting:
+    value: str
+    source: str  # location / server / http / default
+    path: Optional[str] = None
+    line: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ProxyLocation:
+    path: str
+    line: int
+    end_line: int
+    server_name: str
+    location: str
+    proxy_pass: str
+    settings: Dict[str, Setting] = field(default_factory=dict)
+
+
+_ast_cache: Dict[Tuple[str, str], Tuple[Directive, ...]] = {}
+
+
+def tokenize(text: str, path: str = "<string>") -> List[Tuple[str, str, int]]:
+    tokens: List[Tuple[str, str, int]] = []
+    line = 1
+    pos = 0
+    end = len(text)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(text, pos)
+        if m is None:
+            raise NginxParseError(f"{path}:L{line}: unexpected character {text[pos]!r}")
+        kind = m.lastgroup or ""
+        value = m.group()
+        if kind == "quoted":
+            tokens.append(("word", value[1:-1], line))
+        elif kind == "word":
+            tokens.append(("word", value, line))
+        elif kind == "punct":
+            tokens.append((value, value, line))
+        line += value.count("\n")
+        pos = m.end()
+    return tokens
+
+
+def parse(text: str, path: str = "<string>") -> Tuple[Directive, ...]:
+    key = (path, sha256(text.encode("utf-8")).hexdigest())
+    cached = _ast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Each frame: (directives collected so far, opening directive name/args/line or None for top level).
+    stack: List[Tuple[List[Directive], Optional[Tuple[str, Tuple[str, ...], int]]]] = [([], None)]
+    words: List[str] = []
+    first_line = 0
+
+    for kind, value, line in tokenize(text, path):
+        if kind == "word":
+            if not words:
+                first_line = line
+            words.append(value)
+            continue
+        if kind == ";":
+            if not words:
+                continue
+            stack[-1][0].append(Directive(words[0], tuple(words[1:]), path, first_line, line))
+            words = []
+        elif kind == "{":
+            if not words:
+                raise NginxParseError(f"{path}:L{line}: block without a directive name")
+            stack.append(([], (words[0], tuple(words[1:]), first_line)))
+            words = []
+        else:  # "}"
+            if words or len(stack) == 1:
+                raise NginxParseError(f"{path}:L{line}: unexpected '}}'")
+            children, opener = stack.pop()
+            assert opener is not None
+            name, args, start = opener
+            stack[-1][0].append(Directive(name, args, path, start, line, tuple(children)))
+
+    if words:
+        raise NginxParseError(f"{path}: unterminated directive {words[0]!r}")
+    if len(stack) != 1:
+        opener = stack[-1][1]
+        raise NginxParseError(f"{path}:L{opener[2] if opener else 0}: unclosed block {opener[0] if opener else ''!r}")
+
+    ast = tuple(stack[0][0])
+    if len(_ast_cache) >= _AST_CACHE_MAX:
+        _ast_cache.pop(next(iter(_ast_cache)))
+    _ast_cache[key] = ast
+    return ast
+
+
+def _include_pattern(base_dir: str, arg: str) -> str:
+    # Bundles mirror the config tree under the main file's directory, so absolute
+    # /etc/nginx/... paths are mapped onto it.
+    p = arg.strip()
+    if p.startswith("/"):
+        p = p.lstrip("/")
+        if p.startswith("etc/nginx/"):
+            p = p[len("etc/nginx/") :]
+    return normpath(join(base_dir, p))
+
+
+def load(fx: Fixtures, rel: str) -> Optional[Tuple[Directive, ...]]:
+    txt = fx.read_text(rel)
+    if txt is None:
+        return None
+    return _resolve(fx, parse(txt, rel), dirname(rel), (rel,))
+
+
+def _resolve(
+    fx: Fixtures, ast: Tuple[Directive, ...], base_dir: str, chain: Tuple[str, ...]
+) -> Tuple[Directive, ...]:
+    out: List[Directive] = []
+    for d in ast:
+        if d.name == "include" and d.block is None and d.args:
+            if len(chain) > _MAX_INCLUDE_DEPTH:
+                raise NginxParseError(f"{d.path}:L{d.line}: include depth exceeds {_MAX_INCLUDE_DEPTH}")
+            for rel in fx.glob(_include_pattern(base_dir, d.args[0])):
+                if rel in chain:
+                    raise NginxParseError(f"{d.path}:L{d.line}: include cycle via {rel}")
+                txt = fx.read_text(rel)
+                if txt is None:
+                    continue
+                out.extend(_resolve(fx, parse(txt, rel), base_dir, chain + (rel,)))
+            continue
+        if d.block is not None:
+            d = Directive(d.name, d.args, d.path, d.line, d.end_line, _resolve(fx, d.block, base_dir, chain))
+        out.append(d)
+    return tuple(out)
+
+
+def proxy_locations(ast: Tuple[Directive, ...]) -> List[ProxyLocation]:
+    defaults = {name: Setting(value=DEFAULT_PROXY_TIMEOUT, source="default") for name in TIMEOUT_DIRECTIVES}
+    found: List[ProxyLocation] = []
+
+    # Iterative walk so deeply nested configs don't hit the recursion limit.
+    stack: List[Tuple[Tuple[Directive, ...], Dict[str, Setting], str, Optional[Directive]]] = [
+        (ast, defaults, "", None)
+    ]
+    while stack:
+        directives, inherited, server_name, block = stack.pop()
+
+        settings = dict(inherited)
+        proxy_pass: Optional[str] = None
+        for d in directives:
+            if d.block is not None:
+                continue
+            if d.name in TIMEOUT_DIRECTIVES and d.args:
+                source = block.name if block is not None else "main"
+                settings[d.name] = Setting(value=d.args[0], source=source, path=d.path, line=d.line)
+            elif d.name == "proxy_pass" and d.args:
+                proxy_pass = d.args[0]
+            elif d.name == "server_name" and d.args and block is not None and block.name == "server":
+                server_name = d.args[0]
+
+        if block is not None and block.name == "location" and proxy_pass is not None:
+            found.append(
+                ProxyLocation(
+                    path=block.path,
+                    line=block.line,
+                    end_line=block.end_line,
+                    server_name=server_name or "_",
+                    location=" ".join(block.args),
+                    proxy_pass=proxy_pass,
+                    settings=settings,
+                )
+            )
+
+        for d in reversed(directives):
+            if d.block is not None and d.name in _INHERITING_BLOCKS:
+                stack.append((d.block, settings, server_name, d))
+
+    return found
+
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h|d|w|M|y)?")
+_DURATION_UNITS = {
+    "ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0, "w": 604800.0, "M": 2592000.0, "y": 31536000.0,
+}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    # nginx time values: "60", "60s", "500ms", "1m30s".
+    total = 0.0
+    pos = 0
+    v = value.strip()
+    while pos < len(v):
+        m = _DURATION_RE.match(v, pos)
+        if m is None:
+            return None
+        total += float(m.group(1)) * _DURATION_UNITS[m.group(2) or "s"]
+        pos = m.end()
+    return total if pos else None
+
+
+def _split_location(location: str) -> Tuple[str, str]:
+    head, _, rest = location.partition(" ")
+    if rest and head in ("=", "^~", "~", "~*"):
+        return head, rest
+    return "", location
+
+
+def match_location(locations: List[ProxyLocation], uri: str) -> Optional[ProxyLocation]:
+    # nginx selection order: exact (=), longest prefix (stop if ^~), first matching regex, longest prefix.
+    # Access logs don't carry the server block, so all servers are considered together.
+    best: Optional[ProxyLocation] = None
+    best_len = -1
+    best_stops = False
+    for loc in locations:
+        modifier, pattern = _split_location(loc.location)
+        if modifier == "=":
+            if pattern == uri:
+                return loc
+        elif modifier in ("", "^~"):
+            if uri.startswith(pattern) and len(pattern) > best_len:
+                best, best_len, best_stops = loc, len(pattern), modifier == "^~"
+    if best_stops:
+        return best
+    for loc in locations:
+        modifier, pattern = _split_location(loc.location)
+        if modifier in ("~", "~*"):
+            try:
+                if re.search(pattern, uri, re.IGNORECASE if modifier == "~*" else 0):
+                    return loc
+            except re.error:
+                continue
+    return best
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import heapq
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+LARGE_SCAN_ROWS = 100_000
+MISESTIMATE_FACTOR = 10.0
+MISESTIMATE_MIN_ROWS = 1_000
+NESTED_LOOP_MIN_LOOPS = 1_000
+
+
+@dataclass(frozen=True)
+class NodeStat:
+    node_type: str
+    relation: Optional[str]
+    exclusive_ms: float
+    exclusive_blocks: int
+    depth: int
+
+    def label(self) -> str:
+        return f"{self.node_type} on {self.relation}" if self.relation else self.node_type
+
+
+@dataclass
+class PlanAnalysis:
+    execution_ms: float = 0.0
+    planning_ms: float = 0.0
+    nodes: int = 0
+    max_depth: int = 0
+    top_time: List[NodeStat] = field(default_factory=list)
+    top_buffers: List[NodeStat] = field(default_factory=list)
+    issues: List[str] = field(default_factory=list)
+
+
+def _num(node: Dict[str, Any], key: str) -> float:
+    v = node.get(key)
+    return float(v) if isinstance(v, (int, float)) else 0.0
+
+
+def _blocks(node: Dict[str, Any]) -> int:
+    return int(
+        _num(node, "Shared Hit Blocks")
+        + _num(node, "Shared Read Blocks")
+        + _num(node, "Local Hit Blocks")
+        + _num(node, "Local Read Blocks")
+        + _num(node, "Temp Read Blocks")
+        + _num(node, "Temp Written Blocks")
+    )
+
+
+def _relation(node: Dict[str, Any]) -> Optional[str]:
+    rel = node.get("Relation Name")
+    if not isinstance(rel, str):
+        return node.get("Index Name") if isinstance(node.get("Index Name"), str) else None
+    schema = node.get("Schema")
+    return f"{schema}.{rel}" if isinstance(schema, str) else rel
+
+
+def _node_issues(node: Dict[str, Any], children: List[Dict[str, Any]]) -> List[str]:
+    issues: List[str] = []
+    ntype = str(node.get("Node Type", "?"))
+    loops = max(_num(node, "Actual Loops"), 1.0)
+    actual = _num(node, "Actual Rows")
+    planned = _num(node, "Plan Rows")
+    rel = _relation(node)
+
+    if ntype == "Seq Scan":
+        scanned = (actual + _num(node, "Rows Removed by Filter")) * loops
+        if scanned >= LARGE_SCAN_ROWS:
+            removed = _num(node, "Rows Removed by Filter") * loops
+            issues.append(
+                f"Seq Scan on {rel or '?'} reads {int(scanned):,} rows"
+                + (f" and discards {int(removed):,} by filter" if removed else "")
+            )
+
+    # Only under-estimates: over-estimates are mostly nodes cut short by a Limit above them, and
+    # under-estimates are what push the planner into nested loops and in-memory sorts that spill.
+    if "Actual Rows" in node and actual >= MISESTIMATE_MIN_ROWS and actual >= MISESTIMATE_FACTOR * max(planned, 1.0):
+        issues.append(
+            f"{ntype}{' on ' + rel if rel else ''} row estimate is {actual / max(planned, 1.0):.0f}x too low: "
+            f"planned {int(planned):,}, actual {int(actual):,} per loop"
+        )
+
+    if node.get("Sort Space Type") == "Disk":
+        issues.append(
+            f"Sort spills to disk ({int(_num(node, 'Sort Space Used')):,} kB, {node.get('Sort Method', 'external')}); "
+            "consider work_mem or an index that provides the order"
+        )
+    if ntype == "Hash" and _num(node, "Hash Batches") > 1:
+        issues.append(f"Hash spills into {int(_num(node, 'Hash Batches'))} batches (work_mem too small for the build side)")
+
+    if ntype == "Nested Loop" and len(children) >= 2:
+        inner_loops = _num(children[1], "Actual Loops")
+        if inner_loops >= NESTED_LOOP_MIN_LOOPS:
+            inner = children[1]
+            issues.append(
+                f"Nested Loop runs its inner {inner.get('Node Type', '?')}"
+                f"{' on ' + str(_relation(inner)) if _relation(inner) else ''} {int(inner_loops):,} times"
+            )
+    return issues
+
+
+def analyze_plan(doc: Any, top_n: int = 3) -> PlanAnalysis:
+    # Accepts EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output: [{"Plan": {...}, "Execution Time": ...}].
+    root = doc[0] if isinstance(doc, list) and doc else doc
+    if not isinstance(root, dict) or not isinstance(root.get("Plan"), dict):
+        raise ValueError("not an EXPLAIN (FORMAT JSON) document")
+
+    out = PlanAnalysis(
+        execution_ms=_num(root, "Execution Time"),
+        planning_ms=_num(root, "Planning Time"),
+    )
+
+    # Iterative post-order walk: exclusive time/buffers need the children's inclusive totals,
+    # and reporting-query plans can be deep enough to hit the recursion limit.
+    stats: List[NodeStat] = []
+    stack: List[Tuple[Dict[str, Any], int, bool]] = [(root["Plan"], 0, False)]
+    inclusive: Dict[int, Tuple[float, int]] = {}
+    while stack:
+        node, depth, visited = stack.pop()
+        children = [c for c in node.get("Plans", []) or [] if isinstance(c, dict)]
+        if not visited:
+            stack.append((node, depth, True))
+            for c in children:
+                stack.append((c, depth + 1, False))
+            continue
+
+        loops = max(_num(node, "Actual Loops"), 1.0)
+        incl_ms = _num(node, "Actual Total Time") * loops
+        incl_blocks = _blocks(node)
+        child_ms = 0.0
+        child_blocks = 0
+        for c in children:
+            c_ms, c_blocks = inclusive.pop(id(c), (0.0, 0))
+            child_ms += c_ms
+            child_blocks += c_blocks
+        inclusive[id(node)] = (incl_ms, incl_blocks)
+
+        stats.append(
+            NodeStat(
+                node_type=str(node.get("Node Type", "?")),
+                relation=_relation(node),
+                exclusive_ms=max(incl_ms - child_ms, 0.0),
+                exclusive_blocks=max(incl_blocks - child_blocks, 0),
+                depth=depth,
+            )
+        )
+        out.issues.extend(_node_issues(node, children))
+        out.max_depth = max(out.max_depth, depth)
+
+    out.nodes = len(stats)
+    out.top_time = heapq.nlargest(top_n, stats, key=lambda s: s.exclusive_ms)
+    out.top_buffers = [s for s in heapq.nlargest(top_n, stats, key=lambda s: s.exclusive_blocks) if s.exclusive_blocks]
+    return out
+
+
+def load_plan(text: str) -> PlanAnalysis:
+    return analyze_plan(json.loads(text))
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import mmap
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from teardown_box.fixtures import Fixtures
+from teardown_box.histogram import LatencyHistogram
+from teardown_box.parallel import DEFAULT_CHUNK_BYTES, map_chunks, split_chunks
+from teardown_box.parsers.pg_statements import relation_key
+
+# Server logs written with log_destination = 'csvlog', saved as postgres/log/*.csv (or .csv.gz). Only
+# records produced by these settings are parsed; everything else is skipped without being decoded:
+#   log_min_duration_statement   duration: 1234.5 ms  statement: SELECT ...   (or "execute <name>: ...")
+#   auto_explain                 duration: 1234.5 ms  plan: Query Text: SELECT ...
+#   log_lock_waits               process 42 still waiting for ShareLock on transaction 7 after 1000.1 ms
+#   (always logged)              deadlock detected
+#   log_temp_files               temporary file: path "base/pgsql_tmp/pgsql_tmp42.0", size 104857600
+#   log_autovacuum_min_duration  automatic vacuum of table "app.public.sessions": ... elapsed: 3.20 s
+LOG_GLOB = "postgres/log/*.csv"
+
+Buffer = Union[bytes, mmap.mmap]
+
+# A record starts with its log_time at the beginning of a line. Statements and plans in quoted fields
+# span lines, so a newline alone is not a boundary.
+RECORD_START = re.compile(rb"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)? [^,\n]*,")
+_NEXT_RECORD = re.compile(rb"\n(?=" + RECORD_START.pattern + rb")")
+# Substrings of every message this module tracks; the scan jumps between these, not between records.
+_TRACKED = re.compile(
+    rb"duration: |still waiting for |acquired \w+ on |deadlock detected|temporary file: "
+    rb"|automatic (?:aggressive )?(?:vacuum|analyze) of table|canceling autovacuum task"
+)
+
+# csvlog columns (PostgreSQL 9.0+; later versions only append columns).
+_SQLSTATE, _MESSAGE, _DETAIL, _CONTEXT, _QUERY = 12, 13, 14, 18, 19
+
+_DURATION_RE = re.compile(r"duration: ([\d.]+) ms\s+(statement|plan|(?:execute|bind|parse) [^:]*):\s*(.*)", re.S)
+_PLAN_JSON_QUERY_RE = re.compile(r'"Query Text": "((?:[^"\\]|\\.)*)"')
+_PLAN_TEXT_QUERY_RE = re.compile(r"Query Text: (.*)", re.S)
+_WAITING_RE = re.compile(r"process \d+ still waiting for (\w+) on .*? after ([\d.]+) ms")
+_ACQUIRED_RE = re.compile(r"process \d+ acquired (\w+) on .*? after ([\d.]+) ms")
+_TEMP_RE = re.compile(r'temporary file: path ".*?", size (\d+)')
+_AUTOVACUUM_RE = re.compile(r'automatic (aggressive )?(vacuum|analyze) of table "([^"]+)"')
+_ELAPSED_RE = re.compile(r"elapsed: ([\d.]+) s")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?![\w.])")
+_PARAM = re.compile(r"\$\d+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+# Bounds statement cardinality per chunk (and after merging), as access_log does for routes.
+MAX_STATEMENTS = 2000
+OTHER_STATEMENT = "(other)"
+
+
+def normalize_statement(query: str) -> str:
+    # Literals and bind parameters become "?", so logged statements and pg_stat_statements' "$1" form
+    # of the same query share a key.
+    q = _STRING_LITERAL.sub("?", query)
+    q = _PARAM.sub("?", q)
+    q = _NUMBER_LITERAL.sub("?", q)
+    q = _IN_LIST.sub("(...)", q)
+    return _SPACE.sub(" ", q).strip().rstrip(";").rstrip().lower()
+
+
+@dataclass
+class StatementLog:
+    ms: LatencyHistogram = field(default_factory=LatencyHistogram)  # log_min_duration_statement
+    plan_ms: LatencyHistogram = field(default_factory=LatencyHistogram)  # auto_explain
+    temp_files: int = 0
+    temp_bytes: int = 0
+    deadlocks: int = 0
+
+    def merge(self, other: "StatementLog") -> None:
+        self.ms.merge(other.ms)
+        self.plan_ms.merge(other.plan_ms)
+        self.temp_files += other.temp_files
+        self.temp_bytes += other.temp_bytes
+        self.deadlocks += other.deadlocks
+
+    @property
+    def durations(self) -> LatencyHistogram:
+        # Both settings may log the same execution; count it once, preferring the statement-level timing.
+        return self.ms if self.ms.total else self.plan_ms
+
+
+@dataclass
+class TableVacuum:
+    runs: int = 0
+    aggressive: int = 0
+    analyzes: int = 0
+    cancelled: int = 0
+    max_elapsed_s: float = 0.0
+
+    def merge(self, other: "TableVacuum") -> None:
+        self.runs += other.runs
+        self.aggressive += other.aggressive
+        self.analyzes += other.analyzes
+        self.cancelled += other.cancelled
+        self.max_elapsed_s = max(self.max_elapsed_s, other.max_elapsed_s)
+
+
+@dataclass
+class PgLogSummary:
+    statements: Dict[str, StatementLog] = field(default_factory=dict)
+    tables: Dict[str, TableVacuum] = field(default_factory=dict)  # relation_key() -> autovacuum activity
+    slow_statements: int = 0
+    lock_waits: int = 0  # waits that outlasted deadlock_timeout
+    lock_modes: Dict[str, int] = field(default_factory=dict)
+    lock_wait_ms: LatencyHistogram = field(default_factory=LatencyHistogram)  # of waits that ended in the lock
+    deadlocks: int = 0
+    temp_files: int = 0
+    temp_bytes: int = 0
+    records: int = 0  # records parsed (those mentioning something tracked)
+    bytes_read: int = 0
+
+    def merge(self, other: "PgLogSummary") -> None:
+        for key, st in other.statements.items():
+            _statement_slot(self.statements, key).merge(st)
+        for key, tv in other.tables.items():
+            self.tables.setdefault(key, TableVacuum()).merge(tv)
+        for mode, n in other.lock_modes.items():
+            self.lock_modes[mode] = self.lock_modes.get(mode, 0) + n
+        self.lock_wait_ms.merge(other.lock_wait_ms)
+        self.slow_statements += other.slow_statements
+        self.lock_waits += other.lock_waits
+        self.deadlocks += other.deadlocks
+        self.temp_files += other.temp_files
+        self.temp_bytes += other.temp_bytes
+        self.records += other.records
+        self.bytes_read += other.bytes_read
+
+    def statement(self, query: str) -> Optional[StatementLog]:
+        return self.statements.get(normalize_statement(query))
+
+    def table(self, schema: Optional[str], relname: str) -> Optional[TableVacuum]:
+        return self.tables.get(relation_key(schema, relname))
+
+    def add_record(self, row: List[str]) -> None:
+        message = row[_MESSAGE]
+        query = row[_QUERY] if len(row) > _QUERY else ""
+        self.records += 1
+
+        m = _DURATION_RE.match(message)
+        if m is not None:
+            text = _plan_query(m.group(3)) if m.group(2) == "plan" else m.group(3)
+            if text:
+                st = _statement_slot(self.statements, normalize_statement(text))
+                (st.plan_ms if m.group(2) == "plan" else st.ms).add(float(m.group(1)))
+                self.slow_statements += 1
+            return
+
+        m = _WAITING_RE.match(message)
+        if m is not None:
+            self.lock_waits += 1
+            self.lock_modes[m.group(1)] = self.lock_modes.get(m.group(1), 0) + 1
+            return
+        m = _ACQUIRED_RE.match(message)
+        if m is not None:
+            self.lock_wait_ms.add(float(m.group(2)))
+            return
+
+        if row[_SQLSTATE] == "40P01" or message.startswith("deadlock detected"):
+            self.deadlocks += 1
+            if query:
+                _statement_slot(self.statements, normalize_statement(query)).deadlocks += 1
+            return
+
+        m = _TEMP_RE.match(message)
+        if m is not None:
+            size = int(m.group(1))
+            self.temp_files += 1
+            self.temp_bytes += size
+            if query:
+                st = _statement_slot(self.statements, normalize_statement(query))
+                st.temp_files += 1
+                st.temp_bytes += size
+            return
+
+        m = _AUTOVACUUM_RE.match(message)
+        if m is not None:
+            tv = self.tables.setdefault(_table_key(m.group(3)), TableVacuum())
+            if m.group(2) == "analyze":
+                tv.analyzes += 1
+            else:
+                tv.runs += 1
+                tv.aggressive += 1 if m.group(1) else 0
+            elapsed = _ELAPSED_RE.search(message) or _ELAPSED_RE.search(row[_DETAIL])
+            if elapsed is not None:
+                tv.max_elapsed_s = max(tv.max_elapsed_s, float(elapsed.group(1)))
+            return
+
+        if message.startswith("canceling autovacuum task") and len(row) > _CONTEXT:
+            m = _AUTOVACUUM_RE.search(row[_CONTEXT])
+            if m is not None:
+                self.tables.setdefault(_table_key(m.group(3)), TableVacuum()).cancelled += 1
+
+
+def _statement_slot(statements: Dict[str, StatementLog], key: str) -> StatementLog:
+    st = statements.get(key)
+    if st is None:
+        if len(statements) >= MAX_STATEMENTS:
+            key = OTHER_STATEMENT
+            st = statements.get(key)
+        if st is None:
+            st = statements[key] = StatementLog()
+    return st
+
+
+def _table_key(qualified: str) -> str:
+    # Autovacuum names tables "database.schema.table".
+    parts = qualified.split(".")
+    return relation_key(parts[-2] if len(parts) > 1 else None, parts[-1])
+
+
+def _plan_query(plan: str) -> Optional[str]:
+    m = _PLAN_JSON_QUERY_RE.search(plan)
+    if m is not None:
+        return json.loads(f'"{m.group(1)}"')
+    m = _PLAN_TEXT_QUERY_RE.search(plan)
+    if m is None:
+        return None
+    # Text/YAML format: the query runs until the first plan node line.
+    lines: List[str] = []
+    for line in m.group(1).split("\n"):
+        if "(cost=" in line or "(actual " in line:
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _record_start(buf: Buffer, lo: int, pos: int) -> int:
+    # Start of the record containing `pos`; `lo` is a known record start at or before it.
+    while pos > lo:
+        nl = buf.rfind(b"\n", lo, pos)
+        if nl < 0:
+            break
+        if RECORD_START.match(buf, nl + 1):
+            return nl + 1
+        pos = nl
+    return lo
+
+
+def parse_buffer(buf: Buffer, start: int, end: int) -> PgLogSummary:
+    # [start, end) must begin on a record boundary. Bytes between tracked messages are only searched
+    # (in C, straight out of the page cache when `buf` is an mmap); just the matching records are copied
+    # and csv-parsed.
+    out = PgLogSummary(bytes_read=end - start)
+    pos = start
+    while pos < end:
+        m = _TRACKED.search(buf, pos, end)
+        if m is None:
+            break
+        rec_start = _record_start(buf, pos, m.start())
+        nxt = _NEXT_RECORD.search(buf, m.end(), end)
+        rec_end = nxt.end() if nxt is not None else end
+        text = buf[rec_start:rec_end].decode("utf-8", "replace")
+        row = next(csv.reader(io.StringIO(text, newline="")), None)
+        if row is not None and len(row) > _MESSAGE:
+            out.add_record(row)
+        pos = rec_end
+    return out
+
+
+def parse_chunk(path: str, start: int, end: int) -> PgLogSummary:
+    # Map only this chunk (from the allocation boundary at or below `start`): a worker that mapped the
+    # whole file would need address space for all of it, which an RLIMIT_AS'd --isolate run doesn't have.
+    if start >= end:
+        return PgLogSummary()
+    aligned = start - start % mmap.ALLOCATIONGRANULARITY
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), end - aligned, access=mmap.ACCESS_READ, offset=aligned) as mm:
+        return parse_buffer(mm, start - aligned, end - aligned)
+
+
+def _last_record_start(data: bytes) -> int:
+    pos = len(data)
+    while True:
+        pos = data.rfind(b"\n", 0, pos)
+        if pos < 0:
+            return 0
+        if RECORD_START.match(data, pos + 1):
+            return pos + 1
+
+
+def analyze_stream(raw: BinaryIO, compressed: bool, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> PgLogSummary:
+    # Sequential parse for logs that can't be mapped: gzipped ones, archive members, in-memory artifacts.
+    # Blocks are cut at the last record start so no record is split; `raw` is closed on return.
+    summary = PgLogSummary()
+    carry = b""
+    f: BinaryIO = gzip.GzipFile(fileobj=raw, mode="rb") if compressed else raw  # type: ignore[assignment]
+    with raw, f:
+        while True:
+            block = f.read(chunk_bytes)
+            data = carry + block
+            if block:
+                cut = _last_record_start(data)
+                data, carry = data[:cut], data[cut:]
+            if data:
+                summary.merge(parse_buffer(data, 0, len(data)))
+            if not block:
+                return summary
+
+
+def analyze(path: Path, workers: Optional[int] = None, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> PgLogSummary:
+    if path.suffix == ".gz":
+        with path.open("rb") as raw:
+            return analyze_stream(raw, True, chunk_bytes)
+    summary = PgLogSummary()
+    chunks = split_chunks(path, chunk_bytes, record_start=RECORD_START)
+    for part in map_chunks(parse_chunk, path, chunks, workers):
+        summary.merge(part)
+    return summary
+
+
+def evidence_path(fx: Fixtures) -> str:
+    logs = fx.glob(LOG_GLOB)
+    return f"fixtures/{logs[0]}" if len(logs) == 1 else "fixtures/postgres/log/"
+
+
+def load(fx: Fixtures) -> PgLogSummary:
+    # Every log in the bundle, merged; shared by the server-log, slow-query and autovacuum checks.
+    def build() -> PgLogSummary:
+        summary = PgLogSummary()
+        for rel in fx.glob(LOG_GLOB):
+            local = fx.local_path(rel)
+            if local is not None:
+                part = analyze(local)
+                fx.reads.add(rel, nbytes=local.stat().st_size, rows=part.records)
+            else:
+                # Archive member or in-memory artifact: one sequential pass (open_raw counts the bytes).
+                raw, compressed, _ = fx.open_raw(rel)  # type: ignore[misc]
+                part = analyze_stream(raw, compressed)
+                fx.reads.add(rel, rows=part.records)
+            summary.merge(part)
+        return summary
+
+    return fx.memo("postgres.server_log", build)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from teardown_box.fixtures import CsvRow, Fixtures, RowSpan
+
+
+STATEMENTS_PATH = "postgres/pg_stat_statements.csv"
+
+_IDENT = r'(?:"[^"]+"|[A-Za-z_][\w$]*)'
+_QUALIFIED = rf"{_IDENT}(?:\s*\.\s*{_IDENT})?"
+# Relation after FROM/JOIN/UPDATE/INTO. A following "(" means a function call (`FROM generate_series(...)`),
+# except after INTO where it opens the column list.
+_REL_RE = re.compile(rf"\b(from|join|update|into)\s+(?:only\s+)?({_QUALIFIED})(?![\w$.])(\s*\()?", re.IGNORECASE)
+# Further relations in a comma-separated FROM list: `FROM a x, b y`.
+_NEXT_REL_RE = re.compile(rf"\s*(?:(?:as\s+)?{_IDENT}\s*)?,\s*(?:only\s+)?({_QUALIFIED})(?![\w$.])(?!\s*\()", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class StatementRef:
+    queryid: str
+    calls: int
+    total_ms: float
+    query: str
+    span: Optional[RowSpan] = None  # its row in pg_stat_statements.csv
+
+
+@dataclass
+class StatementIndex:
+    statements: List[StatementRef] = field(default_factory=list)
+    # "schema.relname" -> positions in `statements`.
+    by_relation: Dict[str, List[int]] = field(default_factory=dict)
+
+    def top_for(self, schema: Optional[str], relname: str, n: int = 3) -> List[StatementRef]:
+        positions = self.by_relation.get(relation_key(schema, relname), [])
+        stmts = self.statements
+        return heapq.nlargest(n, (stmts[i] for i in positions), key=lambda s: s.total_ms)
+
+
+def relation_key(schema: Optional[str], relname: str) -> str:
+    return f"{(schema or 'public').lower()}.{relname.lower()}"
+
+
+def _normalize(raw: str) -> str:
+    # Keys go through relation_key like the pg_stat_user_tables side, so "Sales"."Orders" and sales.orders
+    # (one- and two-part names alike) meet on the same lowercased key.
+    parts = [p.strip() for p in raw.split(".")]
+    parts = [p[1:-1] if p.startswith('"') and p.endswith('"') else p for p in parts]
+    if len(parts) == 1:
+        return relation_key(None, parts[0])
+    return relation_key(parts[0], parts[1])
+
+
+def relations_in(query: str) -> Set[str]:
+    found: Set[str] = set()
+    for m in _REL_RE.finditer(query):
+        if m.group(3) is not None and m.group(1).lower() != "into":
+            continue
+        found.add(_normalize(m.group(2)))
+        pos = m.end(2)
+        while True:
+            nxt = _NEXT_REL_RE.match(query, pos)
+            if nxt is None:
+                break
+            found.add(_normalize(nxt.group(1)))
+            pos = nxt.end()
+    return found
+
+
+def build_index(rows: Iterable[CsvRow]) -> StatementIndex:
+    index = StatementIndex()
+    by_relation = index.by_relation
+    for r in rows:
+        query = r.get("query") or ""
+        try:
+            calls = int(float(r.get("calls", "0") or "0"))
+            total_ms = float(r.get("total_time_ms", "0") or "0")
+        except ValueError:
+            continue
+        pos = len(index.statements)
+        index.statements.append(
+            StatementRef(queryid=(r.get("queryid") or "?").strip(), calls=calls, total_ms=total_ms, query=query, span=r.span)
+        )
+        for rel in relations_in(query):
+            by_relation.setdefault(rel, []).append(pos)
+    return index
+
+
+def statement_index(fx: Fixtures) -> StatementIndex:
+    # Built once per run and shared by every check that wants table -> statement lookups.
+    def build() -> StatementIndex:
+        rows = fx.read_csv_dicts(STATEMENTS_PATH)
+        return build_index(rows or [])
+
+    return fx.memo("postgres.statement_index", build)
+
+
+def offender_summary(top: List[StatementRef]) -> str:
+    return ", ".join(f"queryid {s.queryid} ({s.calls:,} calls, {s.total_ms:,.0f} ms total)" for s in top)
+
+
+def offending_statements(
+    fx: Fixtures, tables: Iterable[Dict[str, str]], n: int = 3
+) -> List[Tuple[str, str, List[Optional[RowSpan]]]]:
+    # (schema.relname, summary of its heaviest statements, their rows) for pg_stat_user_tables rows.
+    if not fx.exists(STATEMENTS_PATH):
+        return []
+    index = statement_index(fx)
+    out: List[Tuple[str, str, List[Optional[RowSpan]]]] = []
+    for r in tables:
+        schema = r.get("schemaname")
+        relname = r.get("relname") or ""
+        top = index.top_for(schema, relname, n)
+        if top:
+            out.append((f"{schema}.{relname}", offender_summary(top), [s.span for s in top]))
+    return out
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import csv
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from teardown_box.fixtures import Fixtures
+
+# Raw admin-console dumps, one directory per pooler:
+#   postgres/pgbouncer/<pooler>/show_pools.txt      SHOW POOLS;      (required)
+#   postgres/pgbouncer/<pooler>/show_clients.txt    SHOW CLIENTS;
+#   postgres/pgbouncer/<pooler>/show_config.txt     SHOW CONFIG;
+#   postgres/pgbouncer/<pooler>/show_databases.txt  SHOW DATABASES;  (per-database pool_size overrides)
+# as psql prints them by default (aligned), with -A (unaligned, "|"), or with --csv.
+POOLS_GLOB = "postgres/pgbouncer/*/show_pools.txt"
+
+_RULE_RE = re.compile(r"^[-+\s]+$")
+_FOOTER_RE = re.compile(r"^\(\d+ rows?\)$")
+
+PoolKey = Tuple[str, str, str]  # (pooler, database, user)
+
+
+def parse_show(lines: Iterable[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    # (1-based line number, row) for each data row; separators, footers and blank lines are skipped.
+    header: Optional[List[str]] = None
+    delim = "|"
+    for idx, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped or _FOOTER_RE.match(stripped) or (header is not None and _RULE_RE.match(stripped)):
+            continue
+        if header is None:
+            delim = "|" if "|" in line else ","
+        if delim == "|":
+            cells = [c.strip() for c in line.split("|")]
+        else:
+            cells = [c.strip() for c in next(csv.reader([line]))]
+        if header is None:
+            header = [c.lower() for c in cells]
+            continue
+        yield idx, dict(zip(header, cells))
+
+
+def _int(value: Optional[str]) -> int:
+    try:
+        return int(float(value or 0))
+    except ValueError:
+        return 0
+
+
+def _wait_ms(row: Dict[str, str], s_col: str, us_col: str) -> float:
+    return _int(row.get(s_col)) * 1000.0 + _int(row.get(us_col)) / 1000.0
+
+
+@dataclass
+class PoolStat:
+    pooler: str
+    database: str
+    user: str
+    line: Optional[int] = None  # row in show_pools.txt
+    pool_mode: str = ""
+    cl_active: int = 0
+    cl_waiting: int = 0
+    sv_active: int = 0
+    sv_idle: int = 0
+    sv_used: int = 0
+    maxwait_ms: float = 0.0
+    # From SHOW CLIENTS, when dumped.
+    clients: int = 0
+    clients_waiting: int = 0
+    client_max_wait_ms: float = 0.0
+    pool_size: Optional[int] = None
+
+    @property
+    def waiting(self) -> int:
+        return max(self.cl_waiting, self.clients_waiting)
+
+    @property
+    def wait_ms(self) -> float:
+        return max(self.maxwait_ms, self.client_max_wait_ms)
+
+    @property
+    def server_usage(self) -> Optional[float]:
+        return self.sv_active / self.pool_size if self.pool_size else None
+
+
+@dataclass
+class Pooler:
+    name: str
+    pools_path: str
+    config: Dict[str, str] = field(default_factory=dict)
+    clients: int = 0  # SHOW CLIENTS rows, or the pools' cl_active + cl_waiting without that dump
+
+    @property
+    def max_client_conn(self) -> Optional[int]:
+        n = _int(self.config.get("max_client_conn"))
+        return n or None
+
+
+@dataclass
+class Fleet:
+    pools: Dict[PoolKey, PoolStat] = field(default_factory=dict)
+    poolers: Dict[str, Pooler] = field(default_factory=dict)
+
+
+def _rows(fx: Fixtures, rel: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    f = fx.open_text(rel)
+    if f is None:
+        return
+    with f:
+        yield from parse_show(f)
+
+
+def _load_pooler(fx: Fixtures, pools_rel: str, fleet: Fleet) -> None:
+    base = pools_rel.rsplit("/", 1)[0]
+    name = base.rsplit("/", 1)[-1]
+    pooler = fleet.poolers[name] = Pooler(name=name, pools_path=pools_rel)
+    pools = fleet.pools
+
+    for _, row in _rows(fx, f"{base}/show_config.txt"):
+        if "key" in row:
+            pooler.config[row["key"]] = row.get("value", "")
+    default_size = _int(pooler.config.get("default_pool_size")) or None
+    db_sizes: Dict[str, int] = {}
+    for _, row in _rows(fx, f"{base}/show_databases.txt"):
+        size = _int(row.get("pool_size"))
+        if row.get("name") and size:
+            db_sizes[row["name"]] = size
+
+    # Every dump is one linear pass; rows land in their (pooler, db, user) slot by dict lookup.
+    pooled_clients = 0
+    for idx, row in _rows(fx, pools_rel):
+        key = (name, row.get("database", ""), row.get("user", ""))
+        if key[1] == "pgbouncer":
+            continue  # the admin console's own pseudo-database
+        st = pools.get(key)
+        if st is None:
+            st = pools[key] = PoolStat(pooler=name, database=key[1], user=key[2])
+        active, waiting = _int(row.get("cl_active")), _int(row.get("cl_waiting"))
+        st.line = idx
+        st.pool_mode = row.get("pool_mode", "")
+        st.cl_active += active
+        st.cl_waiting += waiting
+        st.sv_active += _int(row.get("sv_active"))
+        st.sv_idle += _int(row.get("sv_idle"))
+        st.sv_used += _int(row.get("sv_used"))
+        st.maxwait_ms = max(st.maxwait_ms, _wait_ms(row, "maxwait", "maxwait_us"))
+        st.pool_size = db_sizes.get(key[1], default_size)
+        pooled_clients += active + waiting
+
+    have_clients = False
+    for _, row in _rows(fx, f"{base}/show_clients.txt"):
+        have_clients = True
+        pooler.clients += 1
+        key = (name, row.get("database", ""), row.get("user", ""))
+        st = pools.get(key)
+        if st is None:
+            continue
+        st.clients += 1
+        if row.get("state", "").startswith("waiting"):
+            st.clients_waiting += 1
+            st.client_max_wait_ms = max(st.client_max_wait_ms, _wait_ms(row, "wait", "wait_us"))
+    if not have_clients:
+        pooler.clients = pooled_clients
+
+
+def load(fx: Fixtures) -> Fleet:
+    def build() -> Fleet:
+        fleet = Fleet()
+        for rel in fx.glob(POOLS_GLOB):
+            _load_pooler(fx, rel, fleet)
+        return fleet
+
+    return fx.memo("postgres.pgbouncer", build)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import fnmatch
+import ipaddress
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from teardown_box.fixtures import Fixtures
+
+# `ss -lntp` output, one host per bundle (linux/ss_lntp.txt) or a whole fleet in one bundle, one file
+# per host named after it: linux/ss/<host>.txt. Both ss's own output and collect's /proc fallback parse.
+FLEET_GLOB = "linux/ss/*.txt"
+
+_WILDCARDS = {"0.0.0.0", "*", "::"}
+# Hosts per port kept as (host, line) evidence samples; the bitmaps carry the full membership.
+SAMPLES_PER_PORT = 3
+
+
+class Listener(NamedTuple):
+    line_no: int
+    addr: str  # without brackets or %interface: "0.0.0.0", "::", "10.0.0.5", "fe80::1"
+    port: int
+    exposed: bool
+
+
+def split_local(local: str) -> Optional[Tuple[str, int]]:
+    # "0.0.0.0:22", "*:22", "[::]:22", ":::22" (older ss), "[fe80::1%eth0]:123", "10.0.0.5%eth0:53".
+    addr, sep, port = local.rpartition(":")
+    if not sep or not port.isdigit():
+        return None
+    if addr.startswith("[") and addr.endswith("]"):
+        addr = addr[1:-1]
+    return addr.split("%", 1)[0], int(port)
+
+
+def is_exposed(addr: str) -> bool:
+    # Reachable from outside the host: bound to every interface, or to a globally routable address.
+    if addr in _WILDCARDS:
+        return True
+    try:
+        return ipaddress.ip_address(addr).is_global
+    except ValueError:
+        return False
+
+
+def parse_listeners(lines: Iterable[str]) -> Iterator[Listener]:
+    for line_no, line in enumerate(lines, start=1):
+        if "LISTEN" not in line:
+            continue
+        parts = line.split()
+        try:
+            # State, Recv-Q, Send-Q, Local Address:Port, ...
+            local = parts[parts.index("LISTEN") + 3]
+        except (ValueError, IndexError):
+            continue
+        found = split_local(local)
+        if found is not None:
+            yield Listener(line_no, found[0], found[1], is_exposed(found[0]))
+
+
+def bits(mask: int) -> Iterator[int]:
+    # Set bit positions, lowest first.
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass
+class PortIndex:
+    # Host membership per port as int bitmaps (bit i = hosts[i]), so fleet questions ("which hosts
+    # expose 5432 or 6379", "exposed but not allowed") are a few bitwise operations on ~N/8 bytes each.
+    hosts: List[str] = field(default_factory=list)
+    paths: List[str] = field(default_factory=list)  # artifact per host, for evidence
+    exposed: Dict[int, int] = field(default_factory=dict)  # port -> hosts listening on a public address
+    samples: Dict[int, List[Tuple[int, int]]] = field(default_factory=dict)  # port -> [(host id, line)]
+
+    @property
+    def all_hosts(self) -> int:
+        return (1 << len(self.hosts)) - 1
+
+    def add_host(self, host: str, path: str, listeners: Iterable[Listener]) -> None:
+        hid = len(self.hosts)
+        self.hosts.append(host)
+        self.paths.append(path)
+        bit = 1 << hid
+        for lst in listeners:
+            if not lst.exposed:
+                continue
+            mask = self.exposed.get(lst.port, 0)
+            if not mask & bit:
+                self.exposed[lst.port] = mask | bit
+                samples = self.samples.setdefault(lst.port, [])
+                if len(samples) < SAMPLES_PER_PORT:
+                    samples.append((hid, lst.line_no))
+
+    def group(self, patterns: Iterable[str]) -> int:
+        # Hosts whose name matches any fnmatch pattern ("db-*").
+        mask = 0
+        for pattern in patterns:
+            for hid, host in enumerate(self.hosts):
+                if fnmatch.fnmatchcase(host, pattern):
+                    mask |= 1 << hid
+        return mask
+
+    def exposing(self, ports: Iterable[int]) -> int:
+        mask = 0
+        for port in ports:
+            mask |= self.exposed.get(port, 0)
+        return mask
+
+    def names(self, mask: int, limit: Optional[int] = None) -> List[str]:
+        out: List[str] = []
+        for hid in bits(mask):
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(self.hosts[hid])
+        return out
+
+    def violations(self, allowed_ports: Set[int], allowed_by_host: Mapping[str, Set[int]]) -> Dict[int, int]:
+        # Port -> hosts exposing it without an allowlist entry. `allowed_by_host` maps host patterns to
+        # extra ports those hosts may expose (e.g. {"lb-*": {8443}}).
+        allowed: Dict[int, int] = {}
+        for pattern, ports in allowed_by_host.items():
+            group = self.group([pattern])
+            for port in ports:
+                allowed[port] = allowed.get(port, 0) | group
+        out: Dict[int, int] = {}
+        everyone = self.all_hosts
+        for port, mask in self.exposed.items():
+            bad = mask & ~(everyone if port in allowed_ports else allowed.get(port, 0))
+            if bad:
+                out[port] = bad
+        return out
+
+
+def load_fleet(fx: Fixtures) -> PortIndex:
+    def build() -> PortIndex:
+        index = PortIndex()
+        for rel in fx.glob(FLEET_GLOB):
+            f = fx.open_text(rel)
+            if f is None:
+                continue
+            host = rel.rsplit("/", 1)[-1][: -len(".txt")]
+            with f:
+                index.add_host(host, rel, parse_listeners(f))
+        return index
+
+    return fx.memo("linux.ss_fleet", build)
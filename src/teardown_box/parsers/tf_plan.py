@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from teardown_box.parsers.json_stream import iter_top_level_array
+
+
+OPEN_CIDRS = {"0.0.0.0/0", "::/0"}
+
+# Resources whose replacement/destruction loses data or state.
+STATEFUL_TYPES = {
+    "aws_db_instance",
+    "aws_rds_cluster",
+    "aws_rds_cluster_instance",
+    "aws_ebs_volume",
+    "aws_efs_file_system",
+    "aws_elasticache_cluster",
+    "aws_elasticache_replication_group",
+    "aws_dynamodb_table",
+    "aws_s3_bucket",
+    "aws_opensearch_domain",
+    "aws_elasticsearch_domain",
+    "aws_msk_cluster",
+    "aws_docdb_cluster",
+    "aws_redshift_cluster",
+    "google_sql_database_instance",
+    "google_compute_disk",
+    "google_storage_bucket",
+    "azurerm_postgresql_flexible_server",
+    "azurerm_mssql_database",
+    "azurerm_managed_disk",
+    "azurerm_storage_account",
+}
+
+
+@dataclass(frozen=True)
+class Risk:
+    kind: str  # open_ingress / stateful_replace / stateful_destroy / gp2_create
+    address: str
+    detail: str
+    port: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ResourceChange:
+    address: str
+    type: str
+    actions: Tuple[str, ...]
+
+
+@dataclass
+class PlanIndex:
+    by_address: Dict[str, ResourceChange] = field(default_factory=dict)
+    by_type: Dict[str, List[str]] = field(default_factory=dict)
+    action_counts: Counter = field(default_factory=Counter)
+    risks: List[Risk] = field(default_factory=list)
+
+    def add(self, rc: ResourceChange) -> None:
+        self.by_address[rc.address] = rc
+        self.by_type.setdefault(rc.type, []).append(rc.address)
+        self.action_counts[_action_label(rc.actions)] += 1
+
+
+def _action_label(actions: Tuple[str, ...]) -> str:
+    if "delete" in actions and "create" in actions:
+        return "replace"
+    return "+".join(actions) if actions else "no-op"
+
+
+def _as_list(v: Any) -> List[Any]:
+    if v is None:
+        return []
+    return v if isinstance(v, list) else [v]
+
+
+def _port(v: Any) -> Optional[int]:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _open_ingress(rtype: str, after: Dict[str, Any]) -> List[Tuple[Optional[int], Optional[int], str]]:
+    # (from_port, to_port, cidr) for every ingress rule open to the internet.
+    out: List[Tuple[Optional[int], Optional[int], str]] = []
+    if rtype == "aws_security_group":
+        for rule in _as_list(after.get("ingress")):
+            if not isinstance(rule, dict):
+                continue
+            for cidr in _as_list(rule.get("cidr_blocks")) + _as_list(rule.get("ipv6_cidr_blocks")):
+                if cidr in OPEN_CIDRS:
+                    out.append((_port(rule.get("from_port")), _port(rule.get("to_port")), cidr))
+    elif rtype == "aws_security_group_rule":
+        if after.get("type") == "ingress":
+            for cidr in _as_list(after.get("cidr_blocks")) + _as_list(after.get("ipv6_cidr_blocks")):
+                if cidr in OPEN_CIDRS:
+                    out.append((_port(after.get("from_port")), _port(after.get("to_port")), cidr))
+    elif rtype == "aws_vpc_security_group_ingress_rule":
+        for cidr in (after.get("cidr_ipv4"), after.get("cidr_ipv6")):
+            if cidr in OPEN_CIDRS:
+                out.append((_port(after.get("from_port")), _port(after.get("to_port")), str(cidr)))
+    elif rtype == "google_compute_firewall":
+        if str(after.get("direction") or "INGRESS").upper() == "INGRESS":
+            for cidr in _as_list(after.get("source_ranges")):
+                if cidr in OPEN_CIDRS:
+                    ports = [p for allow in _as_list(after.get("allow")) if isinstance(allow, dict) for p in _as_list(allow.get("ports"))]
+                    first = _port(str(ports[0]).split("-")[0]) if ports else None
+                    out.append((first, first, cidr))
+    elif rtype == "azurerm_network_security_rule":
+        if str(after.get("direction") or "").lower() == "inbound" and after.get("access", "Allow") == "Allow":
+            src = after.get("source_address_prefix")
+            if src in OPEN_CIDRS or src in ("*", "Internet"):
+                port = _port(after.get("destination_port_range"))
+                out.append((port, port, str(src)))
+    return out
+
+
+def _gp2_devices(rtype: str, after: Dict[str, Any]) -> List[str]:
+    if rtype == "aws_ebs_volume":
+        return ["volume"] if after.get("type") == "gp2" else []
+    if rtype == "aws_instance":
+        found: List[str] = []
+        for attr in ("root_block_device", "ebs_block_device"):
+            for dev in _as_list(after.get(attr)):
+                if isinstance(dev, dict) and dev.get("volume_type") == "gp2":
+                    found.append(str(dev.get("device_name") or attr))
+        return found
+    return []
+
+
+def _risks(rc: ResourceChange, change: Dict[str, Any]) -> List[Risk]:
+    risks: List[Risk] = []
+    actions = rc.actions
+    after = change.get("after") if isinstance(change.get("after"), dict) else {}
+    before = change.get("before") if isinstance(change.get("before"), dict) else {}
+
+    if "create" in actions or "update" in actions:
+        already_open = set(_open_ingress(rc.type, before)) if before else set()
+        for from_port, to_port, cidr in _open_ingress(rc.type, after):
+            if (from_port, to_port, cidr) in already_open:
+                continue
+            ports = str(from_port) if from_port == to_port else f"{from_port}-{to_port}"
+            risks.append(Risk("open_ingress", rc.address, f"ingress {ports} from {cidr}", port=from_port))
+
+    if rc.type in STATEFUL_TYPES and "delete" in actions:
+        kind = "stateful_replace" if "create" in actions else "stateful_destroy"
+        reasons = [
+            ".".join(str(p) for p in path)
+            for path in _as_list(change.get("replace_paths"))
+            if isinstance(path, list)
+        ]
+        detail = "replace" if kind == "stateful_replace" else "destroy"
+        if reasons:
+            detail += f" (forced by {', '.join(reasons[:3])})"
+        risks.append(Risk(kind, rc.address, detail))
+
+    if "create" in actions:
+        for dev in _gp2_devices(rc.type, after):
+            risks.append(Risk("gp2_create", rc.address, f"gp2 {dev}"))
+
+    return risks
+
+
+def index_plan(f: BinaryIO) -> PlanIndex:
+    # Reads `terraform show -json` output; only one resource change is materialized at a time.
+    index = PlanIndex()
+    for item in iter_top_level_array(f, "resource_changes"):
+        if not isinstance(item, dict):
+            continue
+        change = item.get("change") if isinstance(item.get("change"), dict) else {}
+        actions = tuple(str(a) for a in _as_list(change.get("actions")))
+        if actions in (("no-op",), ("read",)):
+            continue
+        rc = ResourceChange(
+            address=str(item.get("address") or "?"),
+            type=str(item.get("type") or "?"),
+            actions=actions,
+        )
+        index.add(rc)
+        index.risks.extend(_risks(rc, change))
+    return index
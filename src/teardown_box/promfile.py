@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from teardown_box.runner import RunResult
+
+# Run metrics in the Prometheus text exposition format, for node_exporter's textfile collector
+# (`--collector.textfile.directory`). Everything is a gauge describing the last run; node_exporter
+# adds the instance label, so alerts like "no run for 2 days" or "check failing" work fleet-wide.
+
+PREFIX = "teardown_box"
+SEVERITIES = ("critical", "high", "medium", "low")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Family:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = f"{PREFIX}_{name}"
+        self.help_text = help_text
+        self.samples: List[Tuple[Dict[str, str], float]] = []
+
+    def add(self, value: float, **labels: str) -> "_Family":
+        self.samples.append((labels, value))
+        return self
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for labels, value in self.samples:
+            lbl = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+            out.append(f"{self.name}{{{lbl}}} {_fmt(value)}" if lbl else f"{self.name} {_fmt(value)}")
+        return out
+
+
+def render_textfile(res: RunResult, finished_at: Optional[float] = None) -> str:
+    families: List[_Family] = []
+
+    def family(name: str, help_text: str) -> _Family:
+        f = _Family(name, help_text)
+        families.append(f)
+        return f
+
+    stats = res.stats
+    family("last_run_timestamp_seconds", "Unix time the last run finished.").add(
+        finished_at if finished_at is not None else time.time()
+    )
+    if stats is not None:
+        family("run_duration_seconds", "Wall time of the last run.").add(stats.duration_s)
+    family("inputs", "Fixture files in the bundle.").add(len(res.inputs_reviewed))
+
+    by_sev = Counter((f.category, f.severity) for f in res.findings)
+    findings = family("findings", "Findings in the last run by category and severity.")
+    for category in sorted({c for c, _ in by_sev}):
+        # Every severity per category, so a count dropping to zero is a sample, not a missing series.
+        for sev in SEVERITIES + tuple(sorted({s for c, s in by_sev if c == category} - set(SEVERITIES))):
+            findings.add(by_sev.get((category, sev), 0), category=category, severity=sev)
+
+    if stats is None:
+        return _render(families)
+
+    failed = [c for c in stats.checks if c.failed]
+    family("checks_run", "Checks that ran (applicable to the bundle or not).").add(len(stats.checks))
+    family("check_failures", "Checks that raised, crashed or hit an --isolate limit.").add(len(failed))
+    durations = family("check_duration_seconds", "Wall time per check in the last run.")
+    failures = family("check_failed", "1 if the check failed in the last run.")
+    for c in stats.checks:
+        durations.add(c.duration_s, check=c.name)
+        failures.add(1 if c.failed else 0, check=c.name)
+
+    read_bytes = family("artifact_read_bytes", "Bytes read per fixture artifact (on-disk, compressed size for .gz).")
+    for rel, n in sorted(stats.reads.bytes_read.items()):
+        read_bytes.add(n, artifact=rel)
+    read_rows = family("artifact_read_rows", "Rows/lines parsed per fixture artifact.")
+    for rel, n in sorted(stats.reads.rows_read.items()):
+        read_rows.add(n, artifact=rel)
+
+    hits, misses = stats.reads.memo_hits, stats.reads.memo_misses
+    lookups = family("cache_lookups", "Shared parse cache lookups by cache and result.")
+    ratio = family("cache_hit_ratio", "Shared parse cache hit ratio by cache.")
+    for cache in sorted(set(hits) | set(misses)):
+        h, m = hits.get(cache, 0), misses.get(cache, 0)
+        lookups.add(h, cache=cache, result="hit").add(m, cache=cache, result="miss")
+        ratio.add(h / (h + m), cache=cache)
+    total = sum(hits.values()) + sum(misses.values())
+    if total:
+        ratio.add(sum(hits.values()) / total, cache="all")
+
+    return _render(families)
+
+
+def _render(families: List[_Family]) -> str:
+    return "\n".join(line for f in families if f.samples for line in f.render()) + "\n"
+
+
+def write_textfile(text: str, path: Path) -> None:
+    # The collector may scrape at any moment: write beside the target and rename into place. The temp
+    # name does not end in .prom, so a half-written file is never picked up.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
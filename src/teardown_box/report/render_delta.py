@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import heapq
+import json
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from teardown_box.baseline import Delta
+from teardown_box.severity import SEVERITIES
+
+# Delta reports list the most severe changes per section; the summary table still counts all of them.
+DEFAULT_LIMIT = 50
+
+_LABEL_BY_RANK = {sev.sort: sev.label for sev in SEVERITIES.values()}
+
+
+def _label(rank: int, doc: Dict) -> str:
+    return _LABEL_BY_RANK.get(rank, str(doc.get("severity", "?")))
+
+
+def _cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+def _evidence(doc: Dict) -> str:
+    paths: List[str] = doc.get("evidence") or []
+    if not paths:
+        return "—"
+    more = f" (+{len(paths) - 1} more)" if len(paths) > 1 else ""
+    return f"`{paths[0]}`{more}"
+
+
+def _summary_row(name: str, ranks: Counter, total: int) -> str:
+    cells = [str(ranks.get(sev.sort, 0)) for sev in SEVERITIES.values()]
+    return f"| {name} | " + " | ".join(cells) + f" | {total} |"
+
+
+def _section(lines: List[str], heading: str, rows: List[Tuple[int, str]], total: int, limit: int) -> None:
+    lines.append(f"## {heading} ({total})")
+    lines.append("")
+    if not rows:
+        lines.append("_None._")
+        lines.append("")
+        return
+    lines.append("| Sev | Area | Finding | Evidence |")
+    lines.append("|---|---|---|---|")
+    for rank, line in rows:
+        doc = json.loads(line)
+        lines.append(f"| {_label(rank, doc)} | {_cell(doc.get('category', ''))} | {_cell(doc.get('title', ''))} | {_evidence(doc)} |")
+    if total > limit:
+        lines.append("")
+        lines.append(f"_… and {total - limit} more._")
+    lines.append("")
+
+
+def render_delta_markdown(
+    delta: Delta,
+    title: str,
+    generated_at_iso: str,
+    baseline_label: str,
+    limit: int = DEFAULT_LIMIT,
+) -> str:
+    new_ranks = Counter([r for r, _ in delta.new])
+    worse_ranks = Counter([r for r, _, _ in delta.worsened])
+    resolved_ranks = Counter([r for r, _ in delta.resolved])
+
+    lines: List[str] = []
+    lines.append(f"# {title}")
+    lines.append("")
+    lines.append(f"_Generated: {generated_at_iso}_")
+    lines.append("")
+    lines.append(
+        f"Compared {delta.current_total} current finding(s) against {delta.baseline_total} in `{baseline_label}`."
+    )
+    lines.append("")
+
+    lines.append("## Summary")
+    lines.append("")
+    lines.append("| Change | " + " | ".join(sev.label for sev in SEVERITIES.values()) + " | Total |")
+    lines.append("|---|" + "---|" * len(SEVERITIES) + "---|")
+    lines.append(_summary_row("New", new_ranks, len(delta.new)))
+    lines.append(_summary_row("Worsened", worse_ranks, len(delta.worsened)))
+    lines.append(_summary_row("Resolved", resolved_ranks, len(delta.resolved)))
+    lines.append("| Unchanged | " + " | ".join("" for _ in SEVERITIES) + f" | {delta.unchanged} |")
+    lines.append("")
+
+    # nsmallest keeps this O(n log limit), so a fleet diff doesn't sort millions of rows to show fifty.
+    _section(lines, "New", heapq.nsmallest(limit, delta.new), len(delta.new), limit)
+
+    lines.append(f"## Worsened ({len(delta.worsened)})")
+    lines.append("")
+    if delta.worsened:
+        lines.append("| Sev | Was | Area | Finding | Evidence |")
+        lines.append("|---|---|---|---|---|")
+        for rank, base, line in heapq.nsmallest(limit, delta.worsened):
+            doc = json.loads(line)
+            lines.append(
+                f"| {_label(rank, doc)} | {_LABEL_BY_RANK.get(base, '?')} | {_cell(doc.get('category', ''))} "
+                f"| {_cell(doc.get('title', ''))} | {_evidence(doc)} |"
+            )
+        if len(delta.worsened) > limit:
+            lines.append("")
+            lines.append(f"_… and {len(delta.worsened) - limit} more._")
+    else:
+        lines.append("_None._")
+    lines.append("")
+
+    _section(lines, "Resolved", heapq.nsmallest(limit, delta.resolved), len(delta.resolved), limit)
+    return "\n".join(lines)
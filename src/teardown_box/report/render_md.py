@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+import gzip
 from collections import defaultdict
 from dataclasses import dataclass
 from hashlib import sha1
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 from teardown_box.findings import EvidenceRef, Finding, finding_sort_key
 from teardown_box.report.boilerplate import ACCESS_MD, ASSUMPTIONS_MD, VERIFY_PLAN_MD
 from teardown_box.severity import SEVERITIES
+from teardown_box.sources import FixtureSource, open_source
 
 
 @dataclass(frozen=True)
@@ -51,40 +52,53 @@ def _evidence_id(ref: EvidenceRef) -> str:
     return f"ev-{h}"
 
 
-def _read_evidence_snippet(fixtures_root: str, ref: EvidenceRef, max_lines_no_range: int = 40) -> Optional[str]:
-    root = Path(fixtures_root)
+def _read_evidence_snippet(source: FixtureSource, ref: EvidenceRef, max_lines_no_range: int = 40) -> Optional[str]:
     rel = ref.path.replace("\\", "/")
     if rel.startswith("fixtures/"):
         rel = rel[len("fixtures/") :]
-    p = root / rel
-    if not p.exists() or not p.is_file():
-        return None
+    compressed = False
+    if not source.exists(rel):
+        # Bundles from `collect --gzip` keep artifacts compressed.
+        rel += ".gz"
+        compressed = True
+        if not source.exists(rel):
+            return None
 
+    if ref.line_start is not None and ref.line_end is not None:
+        # Evidence line numbers in this repo are 1-based.
+        start = max(ref.line_start, 1)
+        end = max(ref.line_end, start)
+    else:
+        # No line range: show a small header excerpt.
+        start, end = 1, max_lines_no_range
+
+    # Streamed, and only up to the last line shown: evidence in a multi-GB log costs a prefix read. With a
+    # byte offset (rows cited from a CSV read) the prefix is skipped by seeking; CSV evidence also shows
+    # the header line so the cited values are labelled.
+    out: List[str] = []
     try:
-        raw = p.read_text(encoding="utf-8", errors="replace")
+        raw = source.open(rel)
+        stream = gzip.GzipFile(fileobj=raw, mode="rb") if compressed else raw
+        with raw, stream:
+            first = 1
+            if start > 1 and rel.endswith((".csv", ".csv.gz")):
+                out.append(f"{1:>5}: {_decode_line(stream.readline())}")
+                first = 2
+            if ref.byte_offset is not None and start > first and stream.seekable():
+                stream.seek(ref.byte_offset)
+                first = start
+            for i, line in enumerate(stream, start=first):
+                if i > end:
+                    break
+                if i >= start:
+                    out.append(f"{i:>5}: {_decode_line(line)}")
     except Exception:
         return None
+    return "\n".join(out)
 
-    lines = raw.splitlines()
-    if not lines:
-        return ""
-
-    if ref.line_start is not None and ref.line_end is not None:
-        start = max(ref.line_start, 1)
-        end = max(ref.line_end, start)
-        # Evidence line numbers in this repo are 1-based.
-        slice_lines = lines[start - 1 : min(end, len(lines))]
-        out: List[str] = []
-        for i, l in enumerate(slice_lines, start=start):
-            out.append(f"{i:>5}: {l}")
-        return "\n".join(out)
 
-    # No line range: show a small header excerpt.
-    slice_lines = lines[: min(max_lines_no_range, len(lines))]
-    out2: List[str] = []
-    for i, l in enumerate(slice_lines, start=1):
-        out2.append(f"{i:>5}: {l}")
-    return "\n".join(out2)
+def _decode_line(line: bytes) -> str:
+    return line.decode("utf-8", errors="replace").rstrip("\r\n")
 
 
 def _as_mailto(s: str) -> str:
@@ -99,7 +113,7 @@ def render_markdown(
     title: str,
     generated_at_iso: str,
     inputs_reviewed: List[str],
-    fixtures_root: Optional[str] = None,
+    fixtures_root: Optional[Union[str, FixtureSource]] = None,
     cta_label: str = "Book 15 minutes",
     cta_url: str = "#",
     contact_label: str = "Request a QuickScan",
@@ -130,12 +144,13 @@ def render_markdown(
     # Collect evidence blocks (dedupe by evidence id)
     evidence_blocks: Dict[str, EvidenceBlock] = {}
     if fixtures_root is not None:
+        source = open_source(fixtures_root)
         for _, f in by_cat.items():
             for idx, finding in f:
                 for ev in finding.evidence:
                     ev_id = _evidence_id(ev)
                     if ev_id not in evidence_blocks:
-                        snippet = _read_evidence_snippet(fixtures_root, ev)
+                        snippet = _read_evidence_snippet(source, ev)
                         evidence_blocks[ev_id] = EvidenceBlock(evidence_id=ev_id, ref=ev, snippet=snippet)
 
     lines: List[str] = []
@@ -1,57 +1,264 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from pathlib import Path
-from typing import List
+import asyncio
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from teardown_box.checks import all_checks
-from teardown_box.fixtures import Fixtures
-from teardown_box.findings import Finding
+from teardown_box.checks import load_checks
+from teardown_box.correlate import Event, correlate
+from teardown_box.fixtures import Fixtures, ReadStats
+from teardown_box.findings import Finding, Metric
+from teardown_box.sampling import Sampling
+from teardown_box.sources import FixtureSource, open_source
+
+
+@dataclass(frozen=True)
+class CheckStat:
+    name: str
+    duration_s: float
+    failed: bool
+
+
+@dataclass(frozen=True)
+class RunStats:
+    # How the run itself went (timings, failures, I/O); exported with `run --metrics-file`.
+    duration_s: float
+    checks: List[CheckStat]
+    reads: ReadStats
 
 
 @dataclass(frozen=True)
 class RunResult:
     findings: List[Finding]
     inputs_reviewed: List[str]
+    metrics: List[Metric] = field(default_factory=list)
+    stats: Optional[RunStats] = None
+
+
+def check_name(chk: object) -> str:
+    return getattr(chk, "name", chk.__class__.__name__)
+
 
+def _check_failed(chk: object, e: Exception) -> Finding:
+    return Finding(
+        category="Reliability",
+        severity="low",
+        title=f"Check failed: {check_name(chk)}",
+        impact=f"A check raised an exception and was skipped: {e or type(e).__name__}",
+        confidence="Low",
+        effort="Low",
+        blast_radius="Low",
+        evidence=[],
+        fix_now=None,
+        plan_7d=["Review fixture format and check implementation for robustness."],
+        plan_30d=["Add tests/fixtures variants to harden parsers against real-world noise."],
+        questions=["Are fixture formats consistent with your target environments?"],
+    )
 
-def _list_fixture_files(fixtures_root: Path) -> List[str]:
-    if not fixtures_root.exists():
-        return []
-    paths: List[str] = []
-    for p in fixtures_root.rglob("*"):
-        if p.is_file():
-            paths.append(str(p.relative_to(fixtures_root)).replace("\\", "/"))
-    return sorted(paths)
 
+def _check_timed_out(chk: object, timeout_s: float) -> Finding:
+    return Finding(
+        category="Reliability",
+        severity="low",
+        title=f"Check failed: {check_name(chk)}",
+        impact=f"The check produced no result within {timeout_s:g}s; its findings are missing from this report.",
+        confidence="Low",
+        effort="Low",
+        blast_radius="Low",
+        evidence=[],
+        fix_now=None,
+        plan_7d=["Find the fixture that makes it slow (oversized log, pathological input), or raise the timeout."],
+        plan_30d=["Use sampling (--sample-rate/--max-rows) for inputs this large."],
+        questions=["Was this bundle collected from an unusually large or unusual host?"],
+    )
 
-def run_all_checks(fixtures_root: str) -> RunResult:
-    root = Path(fixtures_root)
-    fx = Fixtures(root=root)
 
-    inputs = _list_fixture_files(root)
+@dataclass(frozen=True)
+class CheckOutput:
+    findings: List[Finding]
+    events: List[Event]
+    metrics: List[Metric] = field(default_factory=list)
+    stat: Optional[CheckStat] = None
+    # Set by isolated workers, whose fixture reads happen outside the parent's Fixtures.
+    reads: Optional[ReadStats] = None
+
 
+def run_check(chk: Any, fx: Fixtures) -> CheckOutput:
     findings: List[Finding] = []
-    for chk in all_checks():
+    events: List[Event] = []
+    metrics: List[Metric] = []
+    failed = False
+    start = time.perf_counter()
+    try:
+        if not chk.applies(fx):
+            return CheckOutput(findings=[], events=[], stat=CheckStat(check_name(chk), time.perf_counter() - start, False))
+        findings.extend(chk.run(fx))
+        # Checks that can place their signals in time contribute events for the correlation stage.
+        if hasattr(chk, "events"):
+            events.extend(chk.events(fx))
+        # Checks that measure something trendable (disk %, pool wait) contribute metrics for --history.
+        if hasattr(chk, "metrics"):
+            metrics.extend(chk.metrics(fx))
+    except Exception as e:
+        findings.append(_check_failed(chk, e))
+        failed = True
+    stat = CheckStat(check_name(chk), time.perf_counter() - start, failed)
+    return CheckOutput(findings=findings, events=events, metrics=metrics, stat=stat)
+
+
+def assemble(outputs: Iterable[CheckOutput]) -> List[Finding]:
+    # Per-check findings in check order, then composite findings joined across artifacts.
+    findings: List[Finding] = []
+    events: List[Event] = []
+    for out in outputs:
+        findings.extend(out.findings)
+        events.extend(out.events)
+    findings.extend(correlate(events))
+    return findings
+
+
+def gather_metrics(outputs: Iterable[CheckOutput]) -> List[Metric]:
+    return [m for out in outputs for m in out.metrics]
+
+
+def run_all_checks(
+    fixtures_root: Union[str, FixtureSource],
+    only: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    isolate: Optional[Any] = None,
+    sampling: Optional[Sampling] = None,
+) -> RunResult:
+    # `isolate` (an isolate.Limits) runs each check in its own rlimited worker process, so a check that
+    # hangs or blows up on a pathological fixture costs one failure finding instead of the whole run.
+    # `fixtures_root` is a directory, an archive, or any FixtureSource (e.g. a sources.MemorySource).
+    start = time.perf_counter()
+    fx = Fixtures.from_source(open_source(fixtures_root), sampling=sampling)
+
+    inputs = fx.names()
+    checks = load_checks(fx, only=only, skip=skip)
+    if isolate is not None:
+        from teardown_box.isolate import run_checks_isolated
+
+        outputs = run_checks_isolated(checks, fx.source, isolate, sampling=sampling)
+    else:
+        outputs = [run_check(chk, fx) for chk in checks]
+
+    findings = assemble(outputs)
+    reads = ReadStats()
+    reads.merge(fx.reads)
+    for out in outputs:
+        if out.reads is not None:
+            reads.merge(out.reads)
+    stats = RunStats(
+        duration_s=time.perf_counter() - start,
+        checks=[out.stat for out in outputs if out.stat is not None],
+        reads=reads,
+    )
+    return RunResult(findings=findings, inputs_reviewed=inputs, metrics=gather_metrics(outputs), stats=stats)
+
+
+async def _prepare(
+    fixtures_root: Union[str, FixtureSource],
+    only: Optional[Sequence[str]],
+    skip: Optional[Sequence[str]],
+    sampling: Optional[Sampling],
+    executor: Optional[Executor],
+) -> Tuple[Fixtures, List[str], List[Any]]:
+    loop = asyncio.get_running_loop()
+    source = await loop.run_in_executor(executor, open_source, fixtures_root)
+    fx = Fixtures.from_source(source, sampling=sampling)
+    inputs = await loop.run_in_executor(executor, fx.names)
+    checks = await loop.run_in_executor(executor, lambda: load_checks(fx, only=only, skip=skip))
+    return fx, inputs, checks
+
+
+async def _outputs_async(
+    fx: Fixtures,
+    checks: List[Any],
+    timeout_s: Optional[float],
+    executor: Optional[Executor],
+) -> AsyncIterator[Tuple[int, CheckOutput]]:
+    # Everything that touches the disk or parses runs on `executor` (the loop's default thread pool when
+    # None); checks share one Fixtures, so a parse one check memoizes is reused by the others. A timed-out
+    # check is reported as failed, but Python threads cannot be killed: it keeps its worker thread until
+    # it returns. Use run_all_checks(isolate=...) when a check must be stopped hard.
+    loop = asyncio.get_running_loop()
+
+    async def one(i: int, chk: Any) -> Tuple[int, CheckOutput]:
+        # The timeout covers the check's own run, not time spent queued behind other checks for a worker:
+        # the worker signals when it picks the check up, and only then does the clock start.
+        started = loop.create_future()
+
+        def work() -> CheckOutput:
+            loop.call_soon_threadsafe(lambda: started.done() or started.set_result(None))
+            return run_check(chk, fx)
+
+        fut = loop.run_in_executor(executor, work)
         try:
-            if chk.applies(fx):
-                findings.extend(chk.run(fx))
-        except Exception as e:
-            findings.append(
-                Finding(
-                    category="Reliability",
-                    severity="low",
-                    title=f"Check failed: {getattr(chk, 'name', chk.__class__.__name__)}",
-                    impact=f"A check raised an exception and was skipped: {e}",
-                    confidence="Low",
-                    effort="Low",
-                    blast_radius="Low",
-                    evidence=[],
-                    fix_now=None,
-                    plan_7d=["Review fixture format and check implementation for robustness."],
-                    plan_30d=["Add tests/fixtures variants to harden parsers against real-world noise."],
-                    questions=["Are fixture formats consistent with your target environments?"],
-                )
-            )
-
-    return RunResult(findings=findings, inputs_reviewed=inputs)
+            await asyncio.wait([started, fut], return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            fut.cancel()  # still queued: never start it
+            raise
+        start = time.perf_counter()
+        try:
+            return i, await asyncio.wait_for(fut, timeout_s)
+        except asyncio.TimeoutError:
+            stat = CheckStat(check_name(chk), time.perf_counter() - start, True)
+            return i, CheckOutput(findings=[_check_timed_out(chk, timeout_s or 0.0)], events=[], stat=stat)
+
+    tasks = [asyncio.ensure_future(one(i, chk)) for i, chk in enumerate(checks)]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        # Cancelled, or the consumer stopped early: checks not yet started never start.
+        for t in tasks:
+            t.cancel()
+
+
+async def iter_findings_async(
+    fixtures_root: Union[str, FixtureSource],
+    only: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    sampling: Optional[Sampling] = None,
+    timeout_s: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Finding]:
+    # Each check's findings as soon as it finishes (completion order), then the composite findings,
+    # which need every check's events.
+    fx, _, checks = await _prepare(fixtures_root, only, skip, sampling, executor)
+    events: List[Event] = []
+    async for _, out in _outputs_async(fx, checks, timeout_s, executor):
+        events.extend(out.events)
+        for f in out.findings:
+            yield f
+    for f in correlate(events):
+        yield f
+
+
+async def run_all_checks_async(
+    fixtures_root: Union[str, FixtureSource],
+    only: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    sampling: Optional[Sampling] = None,
+    timeout_s: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> RunResult:
+    # Same result as run_all_checks (findings in check order), without blocking the event loop; many
+    # bundles can be awaited concurrently, e.g. with asyncio.gather.
+    start = time.perf_counter()
+    fx, inputs, checks = await _prepare(fixtures_root, only, skip, sampling, executor)
+    outputs: Dict[int, CheckOutput] = {}
+    async for i, out in _outputs_async(fx, checks, timeout_s, executor):
+        outputs[i] = out
+    ordered = [outputs[i] for i in sorted(outputs)]
+    reads = ReadStats()
+    reads.merge(fx.reads)
+    stats = RunStats(
+        duration_s=time.perf_counter() - start,
+        checks=[out.stat for out in ordered if out.stat is not None],
+        reads=reads,
+    )
+    return RunResult(findings=assemble(ordered), inputs_reviewed=inputs, metrics=gather_metrics(ordered), stats=stats)
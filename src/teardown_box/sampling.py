@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Z_95 = 1.96
+
+
+@dataclass(frozen=True)
+class Sampling:
+    # Set from `run --sample-rate/--max-rows`; readers that support sampling consult it via Fixtures.
+    rate: Optional[float] = None  # fraction of each input to read, 0 < rate <= 1
+    max_rows: Optional[int] = None  # row/line budget per input
+    seed: int = 0  # same seed + same input = same sample, so reruns agree
+
+    def fraction_for(self, rows_estimate: float) -> float:
+        # The smaller of the two budgets wins; 1.0 means "read everything".
+        fraction = 1.0
+        if self.rate is not None:
+            fraction = min(fraction, self.rate)
+        if self.max_rows is not None and rows_estimate > 0:
+            fraction = min(fraction, self.max_rows / rows_estimate)
+        return max(fraction, 0.0)
+
+
+@dataclass(frozen=True)
+class SampleInfo:
+    sampled: int  # rows/lines actually parsed
+    population: int  # rows/lines in the input (estimated when only part of it was read)
+    method: str  # "stratified", "weighted reservoir", ...
+
+    @property
+    def fraction(self) -> float:
+        return self.sampled / self.population if self.population else 1.0
+
+    def describe(self) -> str:
+        approx = "~" if self.method == "stratified" else ""
+        return f"{self.method} sample of {self.sampled:,} of {approx}{self.population:,} rows ({self.fraction:.1%})"
+
+
+def wilson_interval(k: float, n: float, z: float = Z_95) -> Tuple[float, float]:
+    # 95% interval for a proportion k/n observed in a sample; well-behaved for small k.
+    if n <= 0:
+        return 0.0, 1.0
+    p = k / n
+    denom = 1.0 + z * z / n
+    centre = (p + z * z / (2.0 * n)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / n + z * z / (4.0 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def quantile_bounds(q: float, n: int, z: float = Z_95) -> Tuple[float, float]:
+    # Ranks (as quantiles) whose sample values bracket the population q-quantile with ~95% confidence.
+    if n <= 0:
+        return 0.0, 1.0
+    half = z * math.sqrt(q * (1.0 - q) / n)
+    return max(0.0, q - half), min(1.0, q + half)
+
+
+def count_bounds(k: int, scale: float, z: float = Z_95) -> Tuple[int, int]:
+    # A count scaled up from a sample; Poisson error on the sampled count, scaled the same way.
+    if scale <= 1.0:
+        return k, k
+    half = z * math.sqrt(max(k, 1))
+    return max(0, int((k - half) * scale)), int(math.ceil((k + half) * scale))
+
+
+class WeightedReservoir(Generic[T]):
+    # Efraimidis-Spirakis A-Res: keeps `size` items with inclusion probability growing with weight, in one
+    # pass and O(size) memory. Heavy rows (the slowest statements) are kept almost surely.
+
+    def __init__(self, size: int, seed: int = 0) -> None:
+        self.size = size
+        self.seen = 0
+        self._rng = random.Random(seed)
+        self._heap: List[Tuple[float, int, T]] = []
+
+    def add(self, item: T, weight: float) -> None:
+        self.seen += 1
+        u = self._rng.random() or 1e-300
+        key = math.log(u) / weight if weight > 0 else -math.inf
+        entry = (key, self.seen, item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[T]:
+        # In input order, so line-number evidence stays meaningful.
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[1])]
+
+
+def weighted_sample(items: Iterable[T], weight: Callable[[T], float], size: int, seed: int = 0) -> Tuple[List[T], int]:
+    res: WeightedReservoir[T] = WeightedReservoir(size, seed)
+    for item in items:
+        res.add(item, weight(item))
+    return res.items(), res.seen
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import fnmatch
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Protocol, Union
+
+from teardown_box.fixtures import Fixtures
+
+# Shared single-pass scanner for line-oriented text fixtures (df -h, ss -lntp, systemctl status, TLS
+# summaries). Check modules register precompiled line rules or stateful visitors per file pattern at
+# import time; the first check that asks for a result streams the file once and feeds every line to
+# every registered consumer, so more checks on the same file do not mean more passes over it.
+
+
+class Hit(NamedTuple):
+    line_no: int  # 1-based, as in the file
+    line: str  # without the line ending
+    groups: tuple
+
+
+@dataclass(frozen=True)
+class LineRule:
+    pattern: Pattern[str]
+    # Literal that must occur in the line before the regex is tried; cheap rejection of most lines.
+    needle: Optional[str] = None
+    first_only: bool = False  # stop matching after the first hit
+
+
+class Visitor(Protocol):
+    def feed(self, line_no: int, line: str) -> None: ...
+
+    def result(self) -> Any: ...
+
+
+Consumer = Union[LineRule, Callable[[], Visitor]]
+
+# file glob -> key -> rule or visitor factory
+_REGISTRY: Dict[str, Dict[str, Consumer]] = {}
+
+
+def rule(files: str, key: str, pattern: Pattern[str], needle: Optional[str] = None, first_only: bool = False) -> None:
+    _REGISTRY.setdefault(files, {})[key] = LineRule(pattern=pattern, needle=needle, first_only=first_only)
+
+
+def visitor(files: str, key: str, factory: Callable[[], Visitor]) -> None:
+    _REGISTRY.setdefault(files, {})[key] = factory
+
+
+def _consumers(rel: str) -> Dict[str, Consumer]:
+    out: Dict[str, Consumer] = {}
+    for files, entries in _REGISTRY.items():
+        if files == rel or fnmatch.fnmatchcase(rel, files):
+            out.update(entries)
+    return out
+
+
+def _scan(fx: Fixtures, rel: str, consumers: Dict[str, Consumer]) -> Optional[Dict[str, Any]]:
+    f = fx.open_text(rel)
+    if f is None:
+        return None
+    rules = [(key, c) for key, c in consumers.items() if isinstance(c, LineRule)]
+    visitors = [(key, c()) for key, c in consumers.items() if not isinstance(c, LineRule)]
+    hits: Dict[str, List[Hit]] = {key: [] for key, _ in rules}
+    line_no = 0
+    with f:
+        for line_no, raw in enumerate(f, start=1):
+            line = raw.rstrip("\r\n")
+            for key, r in rules:
+                if r.needle is not None and r.needle not in line:
+                    continue
+                if r.first_only and hits[key]:
+                    continue
+                m = r.pattern.search(line)
+                if m is not None:
+                    hits[key].append(Hit(line_no, line, m.groups()))
+            for _, v in visitors:
+                v.feed(line_no, line)
+    fx.reads.add(rel, rows=line_no)
+    out: Dict[str, Any] = dict(hits)
+    out.update((key, v.result()) for key, v in visitors)
+    return out
+
+
+def result(fx: Fixtures, rel: str, key: str) -> Any:
+    # Hits (List[Hit]) for a rule key, the visitor's result() for a visitor key; None when the file is
+    # absent. Results are cached per run; a key registered after its file was scanned (a check loaded
+    # late) costs one extra pass covering just the keys that missed the first one.
+    state: Dict[str, Any] = fx.memo(("scan", rel), dict)
+    if key not in state:
+        consumers = {k: c for k, c in _consumers(rel).items() if k not in state}
+        if key not in consumers:
+            raise KeyError(f"no scan rule or visitor {key!r} registered for {rel}")
+        scanned = _scan(fx, rel, consumers)
+        state.update(scanned if scanned is not None else dict.fromkeys(consumers))
+    return state[key]
+
+
+def hits(fx: Fixtures, rel: str, key: str) -> Optional[List[Hit]]:
+    return result(fx, rel, key)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import gzip
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from hashlib import sha1
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from teardown_box.findings import Finding
+from teardown_box.report.render_html import render_html_from_markdown
+from teardown_box.report.render_md import render_markdown
+from teardown_box.watch import DEBOUNCE_S, POLL_INTERVAL_S, Watcher, affected, snapshot
+
+CATEGORIES = ("Security", "Reliability", "Performance", "Cost")
+# Bodies smaller than this are sent uncompressed; gzip framing would outweigh the savings.
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class Page:
+    key: str  # hash of everything the page is rendered from
+    etag: str
+    body: bytes
+    body_gz: bytes
+    content_type: str
+
+
+class ReportState:
+    # Findings stay in memory; pages are rendered on first request and re-rendered only when their inputs change.
+
+    def __init__(self, fixtures_root: str, render_options: Dict[str, Any], checks: Optional[List[Any]] = None) -> None:
+        self.fixtures_root = fixtures_root
+        self.render_options = render_options
+        root = Path(fixtures_root)
+        self.watcher = Watcher(root=root) if checks is None else Watcher(root=root, checks=checks)
+        self.lock = threading.Lock()
+        self.pages: Dict[str, Page] = {}
+        self.watcher.last = snapshot(self.watcher.root)
+        self.result = self.watcher.run()
+
+    def reload_forever(self, interval_s: float, debounce_s: float) -> None:
+        while True:
+            changed = self.watcher.wait_for_change(interval_s, debounce_s)
+            res = self.watcher.run(affected(self.watcher.checks, changed))
+            with self.lock:
+                self.result = res
+
+    def _findings_for(self, route: str) -> Optional[Tuple[List[Finding], str]]:
+        findings = self.result.findings
+        if route in ("/", "/index.html", "/sample-report.md"):
+            return findings, ""
+        if route.startswith("/category/"):
+            name = route[len("/category/") :].strip("/").lower()
+            for cat in CATEGORIES:
+                if cat.lower() == name:
+                    return [f for f in findings if f.category == cat], cat
+        return None
+
+    def _content_key(self, route: str, findings: List[Finding], inputs: List[str]) -> str:
+        # Findings are frozen dataclasses, so repr() is a stable description of their content. Evidence
+        # snippets are read from fixtures at render time, so the referenced files' signatures count too.
+        h = sha1(route.encode("utf-8"))
+        h.update(repr(sorted(self.render_options.items())).encode("utf-8"))
+        h.update("\n".join(inputs).encode("utf-8"))
+        last = self.watcher.last
+        for f in findings:
+            h.update(repr(f).encode("utf-8"))
+            for ev in f.evidence:
+                rel = ev.path[len("fixtures/") :] if ev.path.startswith("fixtures/") else ev.path
+                h.update(repr(last.get(rel)).encode("utf-8"))
+        return h.hexdigest()
+
+    def page(self, route: str) -> Optional[Page]:
+        with self.lock:
+            res = self.result
+            selected = self._findings_for(route)
+            if selected is None:
+                return None
+            findings, category = selected
+            key = self._content_key(route, findings, res.inputs_reviewed)
+            cached = self.pages.get(route)
+            if cached is not None and cached.key == key:
+                return cached
+
+        # Rendering happens outside the lock so one slow page doesn't block the rest.
+        opts = dict(self.render_options)
+        if category:
+            opts["title"] = f"{opts.get('title', 'Teardown Report')}: {category}"
+        md = render_markdown(
+            findings,
+            generated_at_iso=datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds"),
+            inputs_reviewed=res.inputs_reviewed,
+            fixtures_root=self.fixtures_root,
+            **opts,
+        )
+        if route.endswith(".md"):
+            body = md.encode("utf-8")
+            ctype = "text/markdown; charset=utf-8"
+        else:
+            body = render_html_from_markdown(md, title=opts.get("title", "")).encode("utf-8")
+            ctype = "text/html; charset=utf-8"
+        page = Page(
+            key=key,
+            etag=f'"{key[:20]}"',
+            body=body,
+            body_gz=gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else b"",
+            content_type=ctype,
+        )
+        with self.lock:
+            self.pages[route] = page
+        return page
+
+
+def _handler(state: ReportState) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "teardown-box"
+
+        def do_GET(self) -> None:
+            route = self.path.split("?", 1)[0]
+            page = state.page(route)
+            if page is None:
+                self.send_error(HTTPStatus.NOT_FOUND, "Unknown report page")
+                return
+
+            use_gz = bool(page.body_gz) and "gzip" in self.headers.get("Accept-Encoding", "")
+            # Each encoding is a distinct representation, so it gets its own ETag.
+            etag = page.etag[:-1] + '-gz"' if use_gz else page.etag
+            tags = {t.strip() for t in self.headers.get("If-None-Match", "").split(",")}
+            if etag in tags or "*" in tags:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return
+
+            body = page.body_gz if use_gz else page.body
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", page.content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            if use_gz:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def serve(
+    fixtures_root: str,
+    render_options: Dict[str, Any],
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    interval_s: float = POLL_INTERVAL_S,
+    debounce_s: float = DEBOUNCE_S,
+    checks: Optional[List[Any]] = None,
+) -> ThreadingHTTPServer:
+    # Returns the bound server; the caller runs serve_forever(). Fixture reloads run on a daemon thread.
+    state = ReportState(fixtures_root, render_options, checks)
+    threading.Thread(target=state.reload_forever, args=(interval_s, debounce_s), daemon=True).start()
+    httpd = ThreadingHTTPServer((host, port), _handler(state))
+    httpd.daemon_threads = True
+    return httpd
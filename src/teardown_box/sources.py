@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import fnmatch
+import io
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Mapping, Optional, Protocol, Union
+
+# Where a bundle's artifacts live. Fixtures reads everything through one of these, so checks and the
+# evidence renderer work the same on a directory, an archive, or artifacts a pipeline already holds in
+# memory. Names are stored names, posix-style and relative ("linux/journal.json.gz"); transparent .gz
+# handling stays in Fixtures.
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar", ".zip")
+
+
+class FixtureSource(Protocol):
+    label: str  # shown in reports and errors: a directory, an archive path, "<memory>"
+
+    def names(self) -> List[str]: ...
+
+    def exists(self, name: str) -> bool: ...
+
+    def size(self, name: str) -> int: ...
+
+    def open(self, name: str) -> BinaryIO: ...
+
+    def view(self, name: str) -> Optional[memoryview]:
+        # The stored bytes without copying, when the source holds them in memory; None otherwise.
+        ...
+
+    def local_path(self, name: str) -> Optional[Path]:
+        # A real file, for readers that split or seek by offset in worker processes; None otherwise.
+        ...
+
+    def glob(self, pattern: str) -> List[str]: ...
+
+
+def _safe_pattern(pattern: str) -> bool:
+    return not pattern.startswith("/") and ".." not in pattern.split("/")
+
+
+def match(name: str, pattern: str) -> bool:
+    # Path.glob semantics on stored names: "*" stays within one segment, "**" spans any number of them.
+    def walk(parts: List[str], pats: List[str]) -> bool:
+        if not pats:
+            return not parts
+        if pats[0] == "**":
+            return any(walk(parts[i:], pats[1:]) for i in range(len(parts) + 1))
+        return bool(parts) and fnmatch.fnmatchcase(parts[0], pats[0]) and walk(parts[1:], pats[1:])
+
+    return walk(name.split("/"), pattern.split("/"))
+
+
+class DirectorySource:
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self.label = str(root)
+
+    def names(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.relative_to(self.root).as_posix() for p in self.root.rglob("*") if p.is_file())
+
+    def exists(self, name: str) -> bool:
+        return (self.root / name).is_file()
+
+    def size(self, name: str) -> int:
+        return (self.root / name).stat().st_size
+
+    def open(self, name: str) -> BinaryIO:
+        return (self.root / name).open("rb")
+
+    def view(self, name: str) -> Optional[memoryview]:
+        return None
+
+    def local_path(self, name: str) -> Optional[Path]:
+        return self.root / name
+
+    def glob(self, pattern: str) -> List[str]:
+        if not self.root.exists() or not _safe_pattern(pattern):
+            return []
+        return sorted(p.relative_to(self.root).as_posix() for p in self.root.glob(pattern) if p.is_file())
+
+
+class _ViewReader(io.RawIOBase):
+    # Seekable binary stream over a memoryview; reads copy only into the caller's buffer.
+
+    def __init__(self, buf: memoryview) -> None:
+        self._buf = buf
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[no-untyped-def]
+        n = min(len(b), len(self._buf) - self._pos)
+        if n <= 0:
+            return 0
+        b[:n] = self._buf[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._buf)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class MemorySource:
+    # Artifacts already in memory (e.g. from a message queue), keyed by stored name. bytes, bytearray and
+    # memoryview values are kept by reference, never copied.
+
+    def __init__(self, files: Mapping[str, Buffer], label: str = "<memory>") -> None:
+        self.files: Dict[str, memoryview] = {name.lstrip("/"): memoryview(data).cast("B") for name, data in files.items()}
+        self.label = label
+
+    def names(self) -> List[str]:
+        return sorted(self.files)
+
+    def exists(self, name: str) -> bool:
+        return name in self.files
+
+    def size(self, name: str) -> int:
+        return self.files[name].nbytes
+
+    def open(self, name: str) -> BinaryIO:
+        return io.BufferedReader(_ViewReader(self.files[name]))  # type: ignore[return-value]
+
+    def view(self, name: str) -> Optional[memoryview]:
+        return self.files.get(name)
+
+    def local_path(self, name: str) -> Optional[Path]:
+        return None
+
+    def glob(self, pattern: str) -> List[str]:
+        if not _safe_pattern(pattern):
+            return []
+        return sorted(n for n in self.files if match(n, pattern))
+
+
+def _strip_top(names: List[str], archive: Path) -> str:
+    # `tar czf web-1.tgz web-1/` is the usual way to ship a bundle: drop that single top-level directory
+    # when it is named after the archive (or "fixtures"), so names match a directory bundle's.
+    tops = {n.split("/", 1)[0] for n in names}
+    if len(tops) != 1:
+        return ""
+    top = tops.pop()
+    stem = archive.name
+    for suffix in ARCHIVE_SUFFIXES:
+        if stem.endswith(suffix):
+            stem = stem[: -len(suffix)]
+            break
+    return top + "/" if top in (stem, "fixtures") and all("/" in n for n in names) else ""
+
+
+class ZipSource:
+    # Members are streamed from the archive on demand. zipfile serializes readers with a thread lock, which
+    # says nothing about processes: forked workers (run --isolate) would share the handle's file offset and
+    # read each other's bytes. So each process opens its own handle, on first use.
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.label = str(path)
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._pid = 0
+        infos = [i for i in self._archive().infolist() if not i.is_dir()]
+        prefix = _strip_top([i.filename for i in infos], self.path)
+        self._members = {i.filename[len(prefix) :]: i for i in infos}
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Picklable for spawn-started workers; the handle is reopened on the other side.
+        state = dict(self.__dict__)
+        state["_zip"], state["_pid"] = None, 0
+        return state
+
+    def _archive(self) -> zipfile.ZipFile:
+        pid = os.getpid()
+        if self._zip is None or self._pid != pid:
+            self._zip, self._pid = zipfile.ZipFile(self.path), pid
+        return self._zip
+
+    def names(self) -> List[str]:
+        return sorted(self._members)
+
+    def exists(self, name: str) -> bool:
+        return name in self._members
+
+    def size(self, name: str) -> int:
+        return self._members[name].file_size
+
+    def open(self, name: str) -> BinaryIO:
+        return self._archive().open(self._members[name])  # type: ignore[return-value]
+
+    def view(self, name: str) -> Optional[memoryview]:
+        return None
+
+    def local_path(self, name: str) -> Optional[Path]:
+        return None
+
+    def glob(self, pattern: str) -> List[str]:
+        if not _safe_pattern(pattern):
+            return []
+        return sorted(n for n in self._members if match(n, pattern))
+
+
+class TarSource(MemorySource):
+    # Tarballs (usually gzipped) have no random access, so members are read once, up front, into memory.
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        files: Dict[str, Buffer] = {}
+        with tarfile.open(self.path, "r:*") as tf:
+            members = [m for m in tf.getmembers() if m.isfile()]
+            names = [m.name[2:] if m.name.startswith("./") else m.name for m in members]
+            prefix = _strip_top(names, self.path)
+            for m, name in zip(members, names):
+                f = tf.extractfile(m)
+                if f is not None:
+                    files[name[len(prefix) :]] = f.read()
+        super().__init__(files, label=str(path))
+
+
+def open_source(spec: Union[str, Path, FixtureSource]) -> FixtureSource:
+    # `--fixtures` may name a directory or an archive (.zip, .tar, .tar.gz, .tgz).
+    if not isinstance(spec, (str, Path)):
+        return spec
+    path = Path(spec)
+    name = path.name.lower()
+    if path.is_file() and name.endswith(ARCHIVE_SUFFIXES):
+        return ZipSource(path) if name.endswith(".zip") else TarSource(path)
+    return DirectorySource(path)
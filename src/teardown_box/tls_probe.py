@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import ssl
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_TIMEOUT_S = 5.0
+MAX_HEADER_BYTES = 16 * 1024
+
+# Label written to the fixture -> pinned protocol version.
+VERSIONS: Tuple[Tuple[str, ssl.TLSVersion], ...] = (
+    ("TLSv1.0", ssl.TLSVersion.TLSv1),
+    ("TLSv1.1", ssl.TLSVersion.TLSv1_1),
+    ("TLSv1.2", ssl.TLSVersion.TLSv1_2),
+    ("TLSv1.3", ssl.TLSVersion.TLSv1_3),
+)
+
+_HSTS_RE = re.compile(rb"^strict-transport-security:\s*([^\r\n]*)", re.IGNORECASE | re.MULTILINE)
+
+
+@dataclass
+class ProbeResult:
+    host: str
+    port: int
+    versions: Dict[str, str] = field(default_factory=dict)  # label -> enabled / disabled / untested (...)
+    negotiated: Optional[str] = None
+    hsts_checked: bool = False  # got an HTTP response to look for the header in
+    hsts: Optional[str] = None  # Strict-Transport-Security value, None when missing
+    not_after: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def rel(self) -> str:
+        safe = re.sub(r"[^\w.-]+", "_", self.host)
+        return f"edge/tls/{safe}_{self.port}.txt"
+
+    def render(self, now: datetime) -> str:
+        lines = [f"# TLS probe: {self.host}:{self.port} at {now.strftime('%Y-%m-%dT%H:%M:%SZ')}"]
+        if self.error:
+            lines.append(f"Error: {self.error}")
+        for label, _ in VERSIONS:
+            lines.append(f"{label}: {self.versions.get(label, 'untested')}")
+        if self.negotiated:
+            lines.append(f"Negotiated: {self.negotiated}")
+        if not self.hsts_checked:
+            lines.append("HSTS: unknown")
+        elif self.hsts is None:
+            lines.append("HSTS: missing")
+        else:
+            lines.append(f"HSTS: present ({self.hsts})")
+        if self.not_after is not None:
+            days = (self.not_after - now).total_seconds() / 86400.0
+            lines.append(f"Certificate notAfter: {self.not_after.strftime('%Y-%m-%dT%H:%M:%SZ')} ({days:.0f} days)")
+        return "\n".join(lines) + "\n"
+
+
+def _der_tlv(data: bytes, pos: int) -> Tuple[int, int, int]:
+    # (tag, content start, content end) of the DER element at `pos`.
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        n = length & 0x7F
+        length = int.from_bytes(data[pos : pos + n], "big")
+        pos += n
+    return tag, pos, pos + length
+
+
+def cert_not_after(der: bytes) -> Optional[datetime]:
+    # Certificate ::= SEQUENCE { tbsCertificate SEQUENCE { [0] version?, serial, signature, issuer, validity, ... } }
+    # With verification off, getpeercert() returns an empty dict, so the expiry is read from the DER directly.
+    try:
+        _, pos, _ = _der_tlv(der, 0)
+        _, pos, _ = _der_tlv(der, pos)
+        tag, start, end = _der_tlv(der, pos)
+        if tag == 0xA0:  # explicit version
+            pos = end
+        for _ in range(3):  # serialNumber, signature, issuer
+            _, _, end = _der_tlv(der, pos)
+            pos = end
+        _, pos, _ = _der_tlv(der, pos)  # validity
+        _, _, end = _der_tlv(der, pos)  # notBefore
+        tag, start, end = _der_tlv(der, end)  # notAfter
+        text = der[start:end].decode("ascii")
+    except (IndexError, UnicodeDecodeError):
+        return None
+    fmt = "%y%m%d%H%M%SZ" if tag == 0x17 else "%Y%m%d%H%M%SZ"  # UTCTime / GeneralizedTime
+    try:
+        return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _context(version: Optional[ssl.TLSVersion]) -> ssl.SSLContext:
+    # Posture probing, not trust: accept any certificate, and allow legacy suites so old versions can be detected.
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    if version is not None:
+        ctx.minimum_version = version
+        ctx.maximum_version = version
+        if version < ssl.TLSVersion.TLSv1_2:
+            try:
+                ctx.set_ciphers("ALL:@SECLEVEL=0")
+            except ssl.SSLError:
+                pass
+    return ctx
+
+
+async def _handshake(host: str, port: int, ctx: ssl.SSLContext, timeout_s: float) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    return await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=ctx, server_hostname=host, ssl_handshake_timeout=timeout_s),
+        timeout_s,
+    )
+
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await asyncio.wait_for(writer.wait_closed(), 1.0)
+    except (asyncio.TimeoutError, OSError, ssl.SSLError):
+        pass
+
+
+async def _probe_version(host: str, port: int, version: ssl.TLSVersion, timeout_s: float) -> str:
+    try:
+        ctx = _context(version)
+    except (ValueError, ssl.SSLError) as e:
+        return f"untested (client: {e})"
+    try:
+        _, writer = await _handshake(host, port, ctx, timeout_s)
+    except ssl.SSLError as e:
+        # The local OpenSSL may refuse to offer old versions at all; that says nothing about the server.
+        if "NO_PROTOCOLS_AVAILABLE" in str(e) or "no protocols available" in str(e).lower():
+            return "untested (not supported by local OpenSSL)"
+        return "disabled"
+    except (ConnectionError, asyncio.IncompleteReadError):
+        return "disabled"
+    except (asyncio.TimeoutError, OSError) as e:
+        return f"untested ({type(e).__name__})"
+    await _close(writer)
+    return "enabled"
+
+
+async def _probe_default(result: ProbeResult, timeout_s: float) -> None:
+    # One negotiated connection gives the certificate, the best protocol and the HSTS header.
+    try:
+        reader, writer = await _handshake(result.host, result.port, _context(None), timeout_s)
+    except (OSError, ssl.SSLError, asyncio.TimeoutError) as e:
+        result.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        return
+    try:
+        sslobj = writer.get_extra_info("ssl_object")
+        if sslobj is not None:
+            result.negotiated = sslobj.version()
+            der = sslobj.getpeercert(binary_form=True)
+            if der:
+                result.not_after = cert_not_after(der)
+        writer.write(f"HEAD / HTTP/1.1\r\nHost: {result.host}\r\nUser-Agent: teardown-box\r\nConnection: close\r\n\r\n".encode())
+        head = b""
+        while b"\r\n\r\n" not in head and len(head) < MAX_HEADER_BYTES:
+            chunk = await asyncio.wait_for(reader.read(4096), timeout_s)
+            if not chunk:
+                break
+            head += chunk
+        if head.startswith(b"HTTP/"):
+            result.hsts_checked = True
+            m = _HSTS_RE.search(head.split(b"\r\n\r\n", 1)[0])
+            result.hsts = m.group(1).decode("latin-1").strip() if m else None
+    except (OSError, ssl.SSLError, asyncio.TimeoutError):
+        pass
+    finally:
+        await _close(writer)
+
+
+async def probe(host: str, port: int, limit: asyncio.Semaphore, timeout_s: float = DEFAULT_TIMEOUT_S) -> ProbeResult:
+    result = ProbeResult(host=host, port=port)
+
+    async def bounded(coro):  # type: ignore[no-untyped-def]
+        async with limit:
+            return await coro
+
+    default = asyncio.ensure_future(bounded(_probe_default(result, timeout_s)))
+    labels = [label for label, _ in VERSIONS]
+    states = await asyncio.gather(*(bounded(_probe_version(host, port, v, timeout_s)) for _, v in VERSIONS))
+    await default
+    if result.error is None or any(s == "enabled" for s in states):
+        result.versions = dict(zip(labels, states))
+    return result
+
+
+def parse_target(spec: str) -> Tuple[str, int]:
+    # host, host:port, [v6]:port
+    spec = spec.strip()
+    m = re.match(r"^\[([^\]]+)\](?::(\d+))?$", spec)
+    if m is not None:
+        return m.group(1), int(m.group(2) or 443)
+    host, sep, port = spec.rpartition(":")
+    if sep and port.isdigit() and ":" not in host:
+        return host, int(port)
+    return spec, 443
+
+
+async def probe_all_async(
+    targets: Sequence[Tuple[str, int]],
+    out_dir: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+) -> List[ProbeResult]:
+    # Every handshake of every target shares one semaphore, so wall time tracks the slowest endpoint
+    # (plus queueing beyond `concurrency` connections), not the sum of all of them.
+    limit = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(probe(h, p, limit, timeout_s) for h, p in targets))
+    now = datetime.now(timezone.utc)
+    for r in results:
+        final = out_dir / r.rel
+        final.parent.mkdir(parents=True, exist_ok=True)
+        tmp = final.with_name(f".{final.name}.tmp")
+        tmp.write_text(r.render(now), encoding="utf-8")
+        os.replace(tmp, final)
+    return list(results)
+
+
+def probe_all(
+    specs: Sequence[str],
+    out_dir: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+) -> List[ProbeResult]:
+    targets = list(dict.fromkeys(parse_target(s) for s in specs))
+    return asyncio.run(probe_all_async(targets, Path(out_dir), concurrency, timeout_s))
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import fnmatch
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from teardown_box.checks import all_checks
+from teardown_box.fixtures import GZ_SUFFIX, Fixtures
+from teardown_box.runner import CheckOutput, RunResult, assemble, gather_metrics, run_check
+
+# rel path -> (mtime_ns, size). Cheap to take every cycle: one stat per fixture file.
+Snapshot = Dict[str, Tuple[int, int]]
+
+POLL_INTERVAL_S = 2.0
+# A burst of writes (collectors rewriting several files) is handled as one change once the tree has been
+# quiet for this long.
+DEBOUNCE_S = 1.0
+
+
+def snapshot(root: Path) -> Snapshot:
+    if not root.exists():
+        return {}
+    out: Snapshot = {}
+    for p in root.rglob("*"):
+        try:
+            if not p.is_file():
+                continue
+            st = p.stat()
+        except OSError:
+            continue  # removed between listing and stat
+        out[p.relative_to(root).as_posix()] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+def changed_paths(before: Snapshot, after: Snapshot) -> Set[str]:
+    changed = {rel for rel, sig in after.items() if before.get(rel) != sig}
+    changed.update(rel for rel in before if rel not in after)
+    return changed
+
+
+def affected(checks: Iterable[Any], changed: Set[str]) -> List[Any]:
+    # Checks carry the fixture paths/globs they read in `inputs` (from their CheckSpec); a check without
+    # any re-runs on every change. Inputs name the uncompressed file; a gzipped bundle changes "x.json.gz",
+    # which the check reads as "x.json" (Fixtures.glob does the same mapping).
+    names = set(changed)
+    names.update(rel[: -len(GZ_SUFFIX)] for rel in changed if rel.endswith(GZ_SUFFIX))
+    out: List[Any] = []
+    for chk in checks:
+        patterns = getattr(chk, "inputs", None)
+        if not patterns or any(fnmatch.fnmatchcase(rel, pat) for rel in names for pat in patterns):
+            out.append(chk)
+    return out
+
+
+@dataclass
+class Watcher:
+    root: Path
+    checks: List[Any] = field(default_factory=all_checks)
+    # Last output per check, keyed by position in `checks`, so findings keep the full run's order.
+    outputs: Dict[int, CheckOutput] = field(default_factory=dict)
+    last: Snapshot = field(default_factory=dict)
+
+    def run(self, only: Optional[List[Any]] = None) -> RunResult:
+        # A fresh Fixtures per cycle drops memoized parses of files that may have changed.
+        fx = Fixtures(root=self.root)
+        targets = {id(chk) for chk in (self.checks if only is None else only)}
+        for i, chk in enumerate(self.checks):
+            if id(chk) in targets:
+                self.outputs[i] = run_check(chk, fx)
+        outputs = [self.outputs[i] for i in sorted(self.outputs)]
+        return RunResult(findings=assemble(outputs), inputs_reviewed=sorted(self.last), metrics=gather_metrics(outputs))
+
+    def wait_for_change(self, interval_s: float, debounce_s: float) -> Set[str]:
+        while True:
+            time.sleep(interval_s)
+            current = snapshot(self.root)
+            if current == self.last:
+                continue
+            # Debounce: keep re-sampling until the tree stops moving.
+            while True:
+                time.sleep(debounce_s)
+                settled = snapshot(self.root)
+                if settled == current:
+                    break
+                current = settled
+            changed = changed_paths(self.last, current)
+            self.last = current
+            return changed
+
+
+def watch(
+    fixtures_root: str,
+    on_result: Callable[[RunResult, Set[str], int], None],
+    interval_s: float = POLL_INTERVAL_S,
+    debounce_s: float = DEBOUNCE_S,
+    max_cycles: Optional[int] = None,
+    checks: Optional[List[Any]] = None,
+) -> None:
+    # Polls rather than using inotify: stdlib-only, and works on network mounts and in containers.
+    w = Watcher(root=Path(fixtures_root)) if checks is None else Watcher(root=Path(fixtures_root), checks=checks)
+    w.last = snapshot(w.root)
+    on_result(w.run(), set(w.last), len(w.checks))
+
+    cycles = 0
+    while max_cycles is None or cycles < max_cycles:
+        changed = w.wait_for_change(interval_s, debounce_s)
+        targets = affected(w.checks, changed)
+        cycles += 1
+        # Re-rendered even when no check is affected: the inputs list may have gained or lost files.
+        on_result(w.run(targets), changed, len(targets))
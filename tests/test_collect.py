@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+from teardown_box.collect import Artifact, _run_command
+
+
+def test_command_that_closes_stdout_and_keeps_running_times_out(tmp_path: Path) -> None:
+    art = Artifact("linux/x.txt", ("sh", "-c", "echo head; exec >&-; sleep 30"))
+    started = time.monotonic()
+    ok, written, detail = asyncio.run(_run_command(art, tmp_path / "x.tmp", False, 0.5))
+    assert time.monotonic() - started < 5
+    assert (ok, written, detail) == (True, 5, "timed out after 0.5s")
+    assert (tmp_path / "x.tmp").read_bytes() == b"head\n"
+
+
+def test_exit_code_checked_after_eof(tmp_path: Path) -> None:
+    ok, _, detail = asyncio.run(_run_command(Artifact("x", ("sh", "-c", "exit 3")), tmp_path / "x.tmp", False, 5.0))
+    assert (ok, detail) == (False, "exit code 3")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+from teardown_box.collect_postgres import _copy_to_file, _pool_stats, statements_sql
+
+
+class _Copy:
+    def __init__(self, chunks: List[bytes], fail_after: Optional[int]) -> None:
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    async def __aenter__(self) -> "_Copy":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def __aiter__(self):
+        for i, chunk in enumerate(self.chunks):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise RuntimeError("canceling statement due to statement timeout\nCONTEXT: COPY")
+            yield chunk
+
+
+class _Cursor:
+    def __init__(self, conn: "FakeConnection") -> None:
+        self.conn = conn
+
+    async def __aenter__(self) -> "_Cursor":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def copy(self, sql: str) -> _Copy:
+        self.conn.sql.append(sql)
+        return _Copy(self.conn.chunks, self.conn.fail_after)
+
+    async def execute(self, sql: str) -> None:
+        self.conn.sql.append(sql)
+
+    async def fetchone(self) -> tuple:
+        return self.conn.row
+
+
+class FakeConnection:
+    # Just the psycopg AsyncConnection surface collect_postgres uses: cursor(), cursor.copy(), execute/fetchone.
+    def __init__(self, chunks: List[bytes] = (), fail_after: Optional[int] = None, row: tuple = ()) -> None:
+        self.chunks = list(chunks)
+        self.fail_after = fail_after
+        self.row = row
+        self.sql: List[str] = []
+        self.info = SimpleNamespace(server_version=160002)
+
+    def cursor(self) -> _Cursor:
+        return _Cursor(self)
+
+
+CHUNKS = [b"queryid,calls,total_time_ms,mean_time_ms,rows,query\n", b'1,2,3.0,1.5,2,"SELECT 1"\n', b'2,4,8.0,2.0,4,"SELECT 2"\n']
+
+
+def test_copy_streams_chunks_and_renames_into_place(tmp_path: Path) -> None:
+    conn = FakeConnection(CHUNKS)
+    out = asyncio.run(_copy_to_file(conn, "COPY x TO STDOUT", tmp_path, "postgres/pg_stat_statements.csv", False))
+    final = tmp_path / "postgres/pg_stat_statements.csv"
+    assert out.source == "copy"
+    assert out.bytes_written == sum(len(c) for c in CHUNKS)
+    assert final.read_bytes() == b"".join(CHUNKS)
+    assert [p.name for p in final.parent.iterdir()] == [final.name]
+
+
+def test_copy_compressed(tmp_path: Path) -> None:
+    out = asyncio.run(_copy_to_file(FakeConnection(CHUNKS), "COPY x", tmp_path, "postgres/s.csv", True))
+    assert out.rel == "postgres/s.csv"
+    assert gzip.decompress((tmp_path / "postgres/s.csv.gz").read_bytes()) == b"".join(CHUNKS)
+
+
+def test_failed_copy_keeps_previous_file_and_removes_tmp(tmp_path: Path) -> None:
+    final = tmp_path / "postgres/pg_stat_statements.csv"
+    final.parent.mkdir(parents=True)
+    final.write_bytes(b"previous run\n")
+    conn = FakeConnection(CHUNKS, fail_after=2)
+    out = asyncio.run(_copy_to_file(conn, "COPY x", tmp_path, "postgres/pg_stat_statements.csv", False))
+    assert out.source == "failed"
+    assert out.detail == "canceling statement due to statement timeout"
+    assert final.read_bytes() == b"previous run\n"
+    assert [p.name for p in final.parent.iterdir()] == [final.name]
+
+
+def test_statements_sql_switches_columns_before_pg13() -> None:
+    assert "total_exec_time" in statements_sql(130000) and "mean_exec_time" in statements_sql(160002)
+    old = statements_sql(120015)
+    assert "total_time" in old and "mean_time" in old and "_exec_time" not in old
+
+
+def test_pool_stats_leaves_pooler_queue_unknown(tmp_path: Path) -> None:
+    conn = FakeConnection(row=("app", 200, 188, 3))
+    out = asyncio.run(_pool_stats(conn, tmp_path, "postgres/pg_pool_stats.json", False))
+    assert out.source == "query"
+    doc = json.loads((tmp_path / "postgres/pg_pool_stats.json").read_text())
+    assert doc["max_connections"] == 200 and "max_client_conn" not in doc
+    assert doc["current_clients"] == 188
+    assert doc["current_waiting"] is None and doc["avg_wait_ms"] is None